@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - search latency of the BM25 index
+
+Compares MaxScore top-k (BM25.top_k) with exhaustive scoring (BM25.score + sort)
+on corpora of growing size, built by replicating the shipped guideline rows with
+numbered variants, and checks that both return identical results.
+
+Usage:
+    python benchmark.py                          # 1x, 10x, 100x the shipped rows
+    python benchmark.py --scales 1,10 -k 3 --queries 50
+"""
+
+import argparse
+import random
+import time
+
+from core import BM25, _load_csv, iter_sources
+
+
+# ============ CORPUS ============
+def load_documents() -> list:
+    """One document per row of every shipped CSV, built from its search columns"""
+    documents = []
+    for _, filepath, search_cols, _ in iter_sources():
+        if filepath.exists():
+            documents.extend(" ".join(str(row.get(col, "")) for col in search_cols) for row in _load_csv(filepath))
+    return documents
+
+
+def scaled_corpus(documents: list, scale: int) -> list:
+    """Replicate the corpus; each copy gets a marker token so documents are not exact duplicates"""
+    return [doc if copy == 0 else f"{doc} variant{copy}" for copy in range(scale) for doc in documents]
+
+
+def sample_queries(documents: list, count: int, seed: int = 7) -> list:
+    """Long, agent-style queries: words from two random documents plus a style priority"""
+    rng = random.Random(seed)
+    tokenizer = BM25()
+    queries = []
+    for _ in range(count):
+        words = tokenizer.tokenize(rng.choice(documents)) + tokenizer.tokenize(rng.choice(documents))
+        queries.append(" ".join(rng.sample(words, min(len(words), 12))) + " minimalism glassmorphism")
+    return queries
+
+
+# ============ BENCHMARK ============
+def run(scale: int, documents: list, queries: list, k: int) -> dict:
+    bm25 = BM25()
+    bm25.fit(scaled_corpus(documents, scale))
+
+    start = time.perf_counter()
+    exhaustive = [[(idx, score) for idx, score in bm25.score(query)[:k] if score > 0] for query in queries]
+    exhaustive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pruned = [bm25.top_k(query, k) for query in queries]
+    pruned_seconds = time.perf_counter() - start
+
+    return {
+        "docs": bm25.N,
+        "exhaustive_ms": exhaustive_seconds / len(queries) * 1000,
+        "top_k_ms": pruned_seconds / len(queries) * 1000,
+        "identical": sum(a == b for a, b in zip(exhaustive, pruned)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MaxScore top-k against exhaustive BM25 scoring")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated corpus multipliers")
+    parser.add_argument("-k", type=int, default=3, help="Results per query")
+    parser.add_argument("--queries", type=int, default=30, help="Number of sample queries")
+    args = parser.parse_args()
+
+    documents = load_documents()
+    queries = sample_queries(documents, args.queries)
+    print(f"{'docs':>8} | {'exhaustive':>12} | {'top-k':>10} | {'speedup':>7} | identical")
+    for scale in (int(s) for s in args.scales.split(",")):
+        result = run(scale, documents, queries, args.k)
+        print(f"{result['docs']:>8} | {result['exhaustive_ms']:>9.2f} ms | {result['top_k_ms']:>7.2f} ms | "
+              f"{result['exhaustive_ms'] / result['top_k_ms']:>6.1f}x | {result['identical']}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Contrast - WCAG contrast audit of every palette
+
+Relative luminance and WCAG 2.x contrast ratios are computed for the foreground /
+background pairs a palette is used for (body text, CTA and primary accent on the
+page background) across the whole colors.csv table in one batch pass: with
+numpy as array operations over all rows, otherwise with a pure-Python loop that
+converts each distinct color once. The ratios are stored next to the disk index
+(data/index/contrast.json), keyed by the colors.csv and overlay fingerprint, so a new
+process (e.g. every search.py --design-system run) loads them instead of auditing the
+table again; ranking palettes by contrast then costs one dict lookup per result.
+
+Usage:
+    python contrast.py                           # pass counts per pair + failing palettes
+    python contrast.py --json                    # ratios for every palette
+    python contrast.py --benchmark 50000         # audit time on a synthetic table
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+
+from core import CSV_CONFIG, DATA_DIR, _file_stamp, get_index, overlay_path
+from disk_index import INDEX_DIR
+from palette import parse_hex, srgb_to_linear
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ============ CONFIGURATION ============
+# (foreground role, background role, minimum ratio)
+CONTRAST_PAIRS = [
+    ("Text", "Background", 4.5),        # body text, WCAG 1.4.3 (AA)
+    ("CTA", "Background", 3.0),         # buttons and other UI components, WCAG 1.4.11
+    ("Primary", "Background", 3.0),
+]
+AAA_TEXT_RATIO = 7.0                    # WCAG 1.4.6 (AAA) for body text
+LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+AUDIT_FILE = INDEX_DIR / "contrast.json"
+
+
+def role_col(role):
+    return f"{role} (Hex)"
+
+
+def pair_name(fg, bg):
+    return f"{fg}/{bg}"
+
+
+# ============ LUMINANCE ============
+def relative_luminance(rgb):
+    """WCAG relative luminance of an sRGB (0..1) color"""
+    return sum(w * srgb_to_linear(c) for w, c in zip(LUMINANCE_WEIGHTS, rgb))
+
+
+def contrast_ratio(l1, l2):
+    lighter, darker = (l1, l2) if l1 >= l2 else (l2, l1)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _audit_python(colors):
+    """colors: {role: [hex or None per row]} -> {pair name: [ratio or None per row]}"""
+    luminance = {}
+    for values in colors.values():
+        for value in values:
+            if value not in luminance:
+                rgb = parse_hex(value) if value else None
+                luminance[value] = relative_luminance(rgb) if rgb else None
+
+    ratios = {}
+    for fg, bg, _ in CONTRAST_PAIRS:
+        ratios[pair_name(fg, bg)] = [
+            contrast_ratio(luminance[f], luminance[b])
+            if luminance[f] is not None and luminance[b] is not None else None
+            for f, b in zip(colors[fg], colors[bg])]
+    return ratios
+
+
+def _audit_numpy(colors):
+    """Same as _audit_python, one array expression per step over all rows"""
+    luminance = {}
+    for role, values in colors.items():
+        rgb = np.array([parse_hex(v) or (np.nan,) * 3 for v in values], dtype=float).reshape(-1, 3)
+        linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        luminance[role] = linear @ np.array(LUMINANCE_WEIGHTS)
+
+    ratios = {}
+    for fg, bg, _ in CONTRAST_PAIRS:
+        lighter = np.maximum(luminance[fg], luminance[bg])
+        darker = np.minimum(luminance[fg], luminance[bg])
+        ratio = (lighter + 0.05) / (darker + 0.05)
+        ratios[pair_name(fg, bg)] = [None if np.isnan(r) else float(r) for r in ratio]
+    return ratios
+
+
+# ============ AUDIT ============
+class ContrastAudit:
+    """Contrast ratios of every palette row, looked up by the palette's role colors"""
+
+    def __init__(self, rows, vectorized=None, ratios=None):
+        self.rows = rows
+        if ratios is None:
+            roles = sorted({role for pair in CONTRAST_PAIRS for role in pair[:2]})
+            colors = {role: [row.get(role_col(role)) if row else None for row in rows] for role in roles}
+            use_numpy = np is not None if vectorized is None else vectorized
+            ratios = _audit_numpy(colors) if use_numpy else _audit_python(colors)
+        self.ratios = ratios
+
+        # Search results carry the role colors but not the row number
+        self.by_colors = {}
+        for idx, row in enumerate(rows):
+            if row is not None:
+                self.by_colors.setdefault(self._key(row), idx)
+
+    @staticmethod
+    def _key(row):
+        return tuple((row.get(role_col(role)) or "").strip().upper()
+                     for role in ("Primary", "Secondary", "CTA", "Background", "Text", "Border"))
+
+    def report(self, idx):
+        """{pair name: {"ratio", "minimum", "pass"}} for one row"""
+        result = {}
+        for fg, bg, minimum in CONTRAST_PAIRS:
+            name = pair_name(fg, bg)
+            ratio = self.ratios[name][idx]
+            if ratio is not None:
+                result[name] = {"ratio": round(ratio, 2), "minimum": minimum, "pass": ratio >= minimum}
+        return result
+
+    def lookup(self, palette):
+        """Report for a colors.csv row or search result, {} if the palette is unknown"""
+        idx = self.by_colors.get(self._key(palette))
+        return self.report(idx) if idx is not None else {}
+
+    def failures(self, palette):
+        """Number of failing pairs; unknown palettes count as failing every pair"""
+        report = self.lookup(palette)
+        if not report:
+            return len(CONTRAST_PAIRS)
+        return sum(not check["pass"] for check in report.values())
+
+    def failing(self):
+        """[(row index, [failing pair names])] for rows with at least one failing pair"""
+        result = []
+        for idx, row in enumerate(self.rows):
+            if row is None:
+                continue
+            failed = [name for name, check in self.report(idx).items() if not check["pass"]]
+            if failed:
+                result.append((idx, failed))
+        return result
+
+
+def _fingerprint(filepath, rows):
+    """
+    colors.csv and overlay stamps, the audited pairs and a digest of the row colors in
+    index order (overlay edits in a long-running process may order rows differently)
+    """
+    overlay = overlay_path(filepath)
+    stamps = [_file_stamp(filepath), _file_stamp(overlay) if overlay else None]
+    keys = json.dumps([ContrastAudit._key(row) if row else None for row in rows])
+    return json.loads(json.dumps([stamps, CONTRAST_PAIRS, hashlib.sha256(keys.encode("utf-8")).hexdigest()]))
+
+
+def _load_audit(rows, fingerprint):
+    """Stored audit for these rows, None when missing or stale"""
+    try:
+        with open(AUDIT_FILE, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if stored.get("fingerprint") != fingerprint:
+        return None
+    return ContrastAudit(rows, ratios=stored["ratios"])
+
+
+def _save_audit(audit, fingerprint):
+    tmp_path = AUDIT_FILE.with_name(AUDIT_FILE.name + ".tmp")
+    try:
+        AUDIT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "ratios": audit.ratios}, f)
+        os.replace(tmp_path, AUDIT_FILE)
+    except OSError:
+        # Read-only data directory: the audit still works, it is just not shared between processes
+        pass
+
+
+_contrast_audit = None
+
+
+def get_contrast_audit():
+    """
+    ContrastAudit over colors.csv (overlay rows included): kept in memory, loaded from
+    AUDIT_FILE in a new process, and recomputed (and stored) only when the rows change
+    """
+    global _contrast_audit
+    config = CSV_CONFIG["color"]
+    filepath = DATA_DIR / config["file"]
+    index = get_index(filepath, config["search_cols"])
+    version = (id(index), index.overlay_stamp)
+    if _contrast_audit is None or _contrast_audit[0] != version:
+        fingerprint = _fingerprint(filepath, index.rows)
+        audit = _load_audit(index.rows, fingerprint)
+        if audit is None:
+            audit = ContrastAudit(index.rows)
+            _save_audit(audit, fingerprint)
+        _contrast_audit = (version, audit)
+    return _contrast_audit[1]
+
+
+def rank_palettes(results):
+    """Search results ordered by failing contrast pairs; search order is kept among equals"""
+    audit = get_contrast_audit()
+    return sorted(results, key=audit.failures)
+
+
+def format_contrast(report):
+    """One-line summary, e.g. "Text/Background 14.2:1 AAA, CTA/Background 2.8:1 FAIL" """
+    parts = []
+    for name, check in report.items():
+        if not check["pass"]:
+            level = "FAIL"
+        elif name == pair_name("Text", "Background") and check["ratio"] >= AAA_TEXT_RATIO:
+            level = "AAA"
+        else:
+            level = "AA"
+        parts.append(f"{name} {check['ratio']}:1 {level}")
+    return ", ".join(parts)
+
+
+# ============ BENCHMARK ============
+def benchmark(rows):
+    """Audit time for the available engines on a synthetic table, and whether they agree"""
+    rng = random.Random(5)
+    roles = ["Primary", "Secondary", "CTA", "Background", "Text", "Border"]
+    table = [{role_col(role): "#%06X" % rng.randrange(1 << 24) for role in roles} for _ in range(rows)]
+
+    results = {}
+    for label, vectorized in (("python", False), ("numpy", True)):
+        if vectorized and np is None:
+            print("numpy: not installed")
+            continue
+        start = time.perf_counter()
+        results[label] = ContrastAudit(table, vectorized=vectorized).ratios
+        print(f"{label}: {rows} palettes audited in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if len(results) == 2:
+        agree = all(abs(a - b) < 1e-9 for name in results["python"]
+                    for a, b in zip(results["python"][name], results["numpy"][name]))
+        print(f"engines agree: {agree}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WCAG contrast audit of colors.csv")
+    parser.add_argument("--json", action="store_true", help="Output ratios for every palette as JSON")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="Benchmark on a synthetic table of ROWS palettes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    audit = get_contrast_audit()
+    if args.json:
+        report = [{"Product Type": row.get("Product Type", ""), "contrast": audit.report(idx)}
+                  for idx, row in enumerate(audit.rows) if row is not None]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    total = sum(row is not None for row in audit.rows)
+    print(f"{total} palettes ({'numpy' if np is not None else 'pure Python'})")
+    for fg, bg, minimum in CONTRAST_PAIRS:
+        name = pair_name(fg, bg)
+        passed = sum(r is not None and r >= minimum for r in audit.ratios[name])
+        print(f"  {name:<22} >= {minimum}:1  {passed}/{total} pass")
+    print()
+    for idx, failed in audit.failing():
+        print(f"{audit.rows[idx].get('Product Type', '')}: {format_contrast(audit.report(idx))}")
+
+
+if __name__ == "__main__":
+    main()
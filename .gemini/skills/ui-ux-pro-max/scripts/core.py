@@ -5,14 +5,34 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import os
 import re
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
 MAX_RESULTS = 3
+# Proximity boosting: adjacent query terms found within PROXIMITY_WINDOW tokens of each other
+# add PROXIMITY_WEIGHT / distance^2 to a document's score
+PROXIMITY_WINDOW = 5
+PROXIMITY_WEIGHT = 1.0
+# Typo tolerance (opt-in): unknown query tokens of at least FUZZY_MIN_LENGTH characters are expanded
+# with the closest vocabulary words (edit distance 1, or 2 for tokens longer than 5 characters),
+# looked up in the shared on-disk lexicon (see lexicon.py)
+FUZZY_MIN_LENGTH = 4
+FUZZY_MAX_EXPANSIONS = 2
+# "bm25" (in-memory, default), "sqlite" (FTS5 database, see sqlite_backend.py)
+# or "disk" (streamed external-memory index for very large CSVs, see disk_index.py)
+SEARCH_BACKEND = os.environ.get("UIPRO_SEARCH_BACKEND", "bm25")
+SEARCH_BACKENDS = ["bm25", "sqlite", "disk"]
+# User CSVs merged into the shipped data, mirroring its layout (overlay/ux-guidelines.csv,
+# overlay/stacks/react.csv). A row whose key (first column) matches a shipped row replaces it,
+# "delete" in the _action column removes it, any other row is added.
+OVERLAY_DIR = Path(os.environ.get("UIPRO_OVERLAY_DIR", DATA_DIR.parent / "overlay"))
+OVERLAY_ACTION_COL = "_action"
 
 CSV_CONFIG = {
     "style": {
@@ -95,6 +115,14 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+def iter_sources():
+    """Yield (source, filepath, search_cols, output_cols) for every domain and stack CSV"""
+    for domain, config in CSV_CONFIG.items():
+        yield domain, DATA_DIR / config["file"], config["search_cols"], config["output_cols"]
+    for stack, config in STACK_CONFIG.items():
+        yield f"stack:{stack}", DATA_DIR / config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
@@ -102,12 +130,18 @@ class BM25:
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.corpus = []            # tokenized documents; None marks a removed slot
         self.doc_lengths = []
         self.avgdl = 0
-        self.idf = {}
+        self.idf = {}               # filled per term on demand, cleared after edits
+        self.upper_bounds = {}      # term -> highest score contribution of the term, same lifetime as idf
         self.doc_freqs = defaultdict(int)
+        self.postings = {}          # term -> {doc index: term frequency}
+        self.positions = None       # term -> {doc index: [token positions]}, built on first phrase/proximity query
+        self.deletes = None         # deletion variant -> vocabulary words, built on the first unknown query token
         self.N = 0
+        self.total_length = 0
+        self._stale = False
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
@@ -116,46 +150,326 @@ class BM25:
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
+        self.__init__(self.k1, self.b)
+        for doc in documents:
+            self.add(doc)
+        self._refresh()
+
+    # ---- incremental updates: cost is proportional to the edited document ----
+    def add(self, document, idx=None):
+        """Index a document at a new index (or a removed slot); returns its index"""
+        if idx is None or idx == len(self.corpus):
+            idx = len(self.corpus)
+            self.corpus.append(None)
+            self.doc_lengths.append(0)
+        elif self.corpus[idx] is not None:
+            raise ValueError(f"Document {idx} already indexed; use update()")
+
+        tokens = self.tokenize(document)
+        self.corpus[idx] = tokens
+        self.doc_lengths[idx] = len(tokens)
+        for word, tf in Counter(tokens).items():
+            if self.deletes is not None and word not in self.postings:
+                self._index_deletes(word)
+            self.postings.setdefault(word, {})[idx] = tf
+            self.doc_freqs[word] += 1
+        if self.positions is not None:
+            self._index_positions(idx, tokens)
+        self.N += 1
+        self.total_length += len(tokens)
+        self._stale = True
+        return idx
+
+    def remove(self, idx):
+        """Drop a document; its index stays reserved so other indices do not shift"""
+        tokens = self.corpus[idx]
+        if tokens is None:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
+        for word in set(tokens):
+            del self.postings[word][idx]
+            self.doc_freqs[word] -= 1
+            if not self.postings[word]:
+                del self.postings[word]
+                del self.doc_freqs[word]
+            if self.positions is not None:
+                del self.positions[word][idx]
+                if not self.positions[word]:
+                    del self.positions[word]
+        self.corpus[idx] = None
+        self.doc_lengths[idx] = 0
+        self.N -= 1
+        self.total_length -= len(tokens)
+        self._stale = True
+
+    def update(self, idx, document):
+        """Re-index a document in place"""
+        self.remove(idx)
+        self.add(document, idx)
+
+    def _refresh(self):
+        """Lazily recompute avgdl after edits; IDF values are recomputed per term as queries need them"""
+        if self._stale:
+            self.avgdl = self.total_length / self.N if self.N else 0
+            self.idf = {}
+            self.upper_bounds = {}
+            self._stale = False
+
+    def _idf(self, word):
+        if word not in self.idf:
+            freq = self.doc_freqs[word]
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        return self.idf[word]
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+    def _term_score(self, word, idx, tf):
+        numerator = tf * (self.k1 + 1)
+        denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+        return self._idf(word) * numerator / denominator
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+    def _upper_bound(self, word):
+        """Highest contribution the term makes to any document"""
+        if word not in self.upper_bounds:
+            self.upper_bounds[word] = max(self._term_score(word, idx, tf) for idx, tf in self.postings[word].items())
+        return self.upper_bounds[word]
 
     def score(self, query):
         """Score all documents against query"""
+        self._refresh()
         query_tokens = self.tokenize(query)
-        scores = []
+        totals = {}
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        # Only documents containing a query term can score above zero
+        for token in query_tokens:
+            if token in self.postings:
+                for idx, tf in self.postings[token].items():
+                    totals[idx] = totals.get(idx, 0) + self._term_score(token, idx, tf)
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+        scores = [(idx, totals.get(idx, 0)) for idx, doc in enumerate(self.corpus) if doc is not None]
+        return sorted(scores, key=lambda x: x[1], reverse=True)
 
-            scores.append((idx, score))
+    def top_k(self, query, k):
+        """
+        The k best (idx, score) pairs with score > 0, identical to the head of score()
+        (ties go to the lower index), with MaxScore early termination.
+
+        Terms are processed from the highest upper bound (rarest) down. Once the bounds
+        of the remaining terms add up to less than the k-th best partial score, no new
+        document can reach the top k: the remaining (long) posting lists are only probed
+        for existing candidates, and candidates that can no longer catch up are dropped.
+        """
+        self._refresh()
+        query_tokens = self.tokenize(query)
+        counts = Counter(token for token in query_tokens if token in self.postings)
+        if not counts or k <= 0:
+            return []
+
+        terms = sorted(counts, key=lambda word: self._upper_bound(word) * counts[word], reverse=True)
+        remaining = sum(self._upper_bound(word) * counts[word] for word in terms)
+        # Float sums of the bounds may differ from a document's score in the last bit
+        slack = 1 + 1e-9
+        partial = {}
+
+        for word in terms:
+            weight = counts[word]
+            remaining -= self._upper_bound(word) * weight
+            postings = self.postings[word]
+            threshold = heapq.nlargest(k, partial.values())[-1] if len(partial) >= k else 0
+
+            if len(partial) < k or (remaining + self._upper_bound(word) * weight) * slack >= threshold:
+                # New documents may still reach the top k
+                for idx, tf in postings.items():
+                    partial[idx] = partial.get(idx, 0) + self._term_score(word, idx, tf) * weight
+            else:
+                for idx in list(partial):
+                    tf = postings.get(idx)
+                    if tf:
+                        partial[idx] += self._term_score(word, idx, tf) * weight
+                    elif (partial[idx] + remaining) * slack < threshold:
+                        del partial[idx]
+
+        results = [(idx, self._exact_score(idx, query_tokens)) for idx in partial]
+        return heapq.nsmallest(k, results, key=lambda x: (-x[1], x[0]))
+
+    def _exact_score(self, idx, query_tokens):
+        """Score of one document, summed in query order exactly as score() does"""
+        total = 0
+        for token in query_tokens:
+            tf = self.postings.get(token, {}).get(idx)
+            if tf:
+                total += self._term_score(token, idx, tf)
+        return total
+
+    # ---- optional positional index: quoted phrases and proximity ----
+    def enable_positions(self):
+        """Build the positional index from the stored tokens; later edits keep it current"""
+        if self.positions is None:
+            self.positions = {}
+            for idx, tokens in enumerate(self.corpus):
+                if tokens is not None:
+                    self._index_positions(idx, tokens)
+
+    def _index_positions(self, idx, tokens):
+        for position, word in enumerate(tokens):
+            self.positions.setdefault(word, {}).setdefault(idx, []).append(position)
+
+    def phrase_matches(self, phrase):
+        """Documents containing the tokens of phrase consecutively, from the intersected postings"""
+        self.enable_positions()
+        lists = [self.positions.get(word) for word in phrase]
+        if not phrase or any(postings is None for postings in lists):
+            return set()
+        candidates = set(min(lists, key=len))
+        for postings in lists:
+            candidates.intersection_update(postings)
+
+        matches = set()
+        for idx in candidates:
+            starts = set(lists[0][idx])
+            for offset, postings in enumerate(lists[1:], start=1):
+                starts.intersection_update(position - offset for position in postings[idx])
+                if not starts:
+                    break
+            if starts:
+                matches.add(idx)
+        return matches
+
+    def proximity_boost(self, idx, query_tokens):
+        """
+        PROXIMITY_WEIGHT / d^2 for each pair of distinct query terms adjacent in the query (duplicates
+        removed) found at distance d <= PROXIMITY_WINDOW in the document; a pair with a term missing
+        from the document adds nothing, so "a b c" never pairs a with c
+        """
+        self.enable_positions()
+        terms = list(dict.fromkeys(query_tokens))
+        boost = 0
+        for first, second in zip(terms, terms[1:]):
+            a, b = self.positions.get(first, {}).get(idx), self.positions.get(second, {}).get(idx)
+            if not a or not b:
+                continue
+            i = j = 0
+            distance = PROXIMITY_WINDOW + 1
+            while i < len(a) and j < len(b):
+                distance = min(distance, abs(a[i] - b[j]))
+                if a[i] < b[j]:
+                    i += 1
+                else:
+                    j += 1
+            if distance <= PROXIMITY_WINDOW:
+                boost += PROXIMITY_WEIGHT / distance ** 2
+        return boost
+
+    # ---- typo tolerance: SymSpell-style deletion index over the vocabulary ----
+    @staticmethod
+    def _max_distance(word):
+        return 1 if len(word) <= 5 else 2
+
+    @staticmethod
+    def _variants(word, distance):
+        """word plus every string obtained by deleting up to distance characters"""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def _index_deletes(self, word):
+        for variant in self._variants(word, self._max_distance(word)):
+            self.deletes.setdefault(variant, []).append(word)
+
+    def enable_fuzzy(self):
+        """Build the deletion index; later additions extend it, removed words are skipped at lookup"""
+        if self.deletes is None:
+            self.deletes = {}
+            for word in self.postings:
+                self._index_deletes(word)
+
+    @staticmethod
+    def _edit_distance(a, b, limit):
+        """Optimal string alignment distance (Damerau-Levenshtein with adjacent transpositions), capped at limit + 1"""
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        previous2, previous = None, list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            current = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    current[j] = min(current[j], previous2[j - 2] + 1)
+            if min(current) > limit:
+                return limit + 1
+            previous2, previous = previous, current
+        return previous[-1]
+
+    def suggest(self, word, candidates=None):
+        """
+        Closest vocabulary words to an unknown word, most frequent first ([] when none is close enough).
+        candidates: words sharing a deletion variant with word from an external index (see lexicon.py);
+        default: this index's own deletion index
+        """
+        limit = self._max_distance(word)
+        if candidates is None:
+            self.enable_fuzzy()
+            candidates = set()
+            for variant in self._variants(word, limit):
+                candidates.update(self.deletes.get(variant, ()))
+
+        best, matches = limit + 1, []
+        for candidate in candidates:
+            if candidate not in self.postings:
+                continue
+            distance = self._edit_distance(word, candidate, limit)
+            if distance < best:
+                best, matches = distance, [candidate]
+            elif distance == best:
+                matches.append(candidate)
+        matches.sort(key=lambda w: (-self.doc_freqs[w], w))
+        return matches[:FUZZY_MAX_EXPANSIONS]
+
+    def correct_query(self, query, vocabulary=None, lexicon=None):
+        """
+        query followed by the closest vocabulary words of its unknown tokens; the typed words
+        are kept. A token is unknown when it is missing from vocabulary (default: this index);
+        lexicon, when given, supplies the deletion candidates (see lexicon.Lexicon)
+        """
+        vocabulary = self.postings if vocabulary is None else vocabulary
+        tokens = self.tokenize(query)
+        additions = []
+        for token in tokens:
+            if len(token) < FUZZY_MIN_LENGTH or token in vocabulary:
+                continue
+            candidates = lexicon.candidates(token) if lexicon is not None else None
+            additions.extend(word for word in self.suggest(token, candidates)
+                             if word not in tokens and word not in additions)
+        return " ".join([query] + additions) if additions else query
+
+    def search(self, query, k, phrases=(), proximity=False):
+        """
+        top_k with quoted-phrase filtering (every phrase must match) and optional proximity
+        boosting; both are evaluated on the positional postings, never on row text
+        """
+        if not phrases and not proximity:
+            return self.top_k(query, k)
+        self._refresh()
+        query_tokens = self.tokenize(query)
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        candidates = None
+        for phrase in phrases:
+            matches = self.phrase_matches(phrase)
+            candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            candidates = set()
+            for token in set(query_tokens):
+                candidates.update(self.postings.get(token, ()))
+
+        results = []
+        for idx in candidates:
+            total = self._exact_score(idx, query_tokens)
+            if proximity:
+                total += self.proximity_boost(idx, query_tokens)
+            if total > 0:
+                results.append((idx, total))
+        return heapq.nsmallest(k, results, key=lambda x: (-x[1], x[0]))
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -165,27 +479,331 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
+def parse_query(query):
+    """Quoted phrases in a query as token lists: 'dark mode "server component"' -> [["server", "component"]]"""
+    tokenizer = BM25()
+    return [tokens for tokens in (tokenizer.tokenize(phrase) for phrase in re.findall(r'"([^"]+)"', query)) if tokens]
+
+
+def _file_stamp(filepath):
+    if not filepath.exists():
+        return None
+    stat = filepath.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def overlay_path(filepath):
+    """Overlay CSV for a data file, or None when the file is outside DATA_DIR"""
+    try:
+        return OVERLAY_DIR / filepath.relative_to(DATA_DIR)
+    except ValueError:
+        return None
+
+
+class GuidelineIndex:
+    """
+    BM25 index of one CSV plus its overlay, kept in memory between searches.
+    Overlay edits are applied as add/update/remove on the changed rows only;
+    the shipped rows are refit only when the shipped CSV itself changes.
+    """
+
+    def __init__(self, filepath, search_cols):
+        self.filepath = filepath
+        self.search_cols = search_cols
+        self.stamp = _file_stamp(filepath)
+        self.base = _load_csv(filepath)
+        self.key_col = next(iter(self.base[0]), None) if self.base else None
+        self.base_ids = {}
+        for idx, row in enumerate(self.base):
+            self.base_ids.setdefault(row.get(self.key_col), idx)
+        self.rows = list(self.base)
+        self.bm25 = BM25()
+        self.bm25.fit([self._document(row) for row in self.base])
+        self.overlay = {}           # overlay key -> row, or None for a deletion
+        self.overlay_ids = {}       # overlay key -> document index of added rows
+        self.overlay_stamp = None
+        self.edits = []             # document indices changed by overlay edits, in order (replayed by StackIndex)
+        self.refresh_overlay()
+
+    def _document(self, row):
+        return " ".join(str(row.get(col, "")) for col in self.search_cols)
+
+    def _read_overlay(self):
+        path = overlay_path(self.filepath)
+        entries = {}
+        if path is None or not path.exists():
+            return entries
+        for line, row in enumerate(_load_csv(path), start=2):
+            action = (row.pop(OVERLAY_ACTION_COL, "") or "").strip().lower()
+            key = row.get(self.key_col) or f"#{line}"
+            entries[key] = None if action == "delete" else row
+        return entries
+
+    def refresh_overlay(self):
+        """Apply overlay changes since the last call; returns the number of documents touched"""
+        path = overlay_path(self.filepath)
+        stamp = _file_stamp(path) if path else None
+        if stamp == self.overlay_stamp:
+            return 0
+        self.overlay_stamp = stamp
+
+        entries = self._read_overlay()
+        touched = 0
+        for key in list(self.overlay) + [key for key in entries if key not in self.overlay]:
+            old, new = self.overlay.get(key, False), entries.get(key, False)
+            if old == new:
+                continue
+            if new is False:
+                # Entry dropped from the overlay: restore the shipped row, if any
+                new = self.base[self.base_ids[key]] if key in self.base_ids else None
+            self._set(key, new)
+            touched += 1
+        self.overlay = entries
+        return touched
+
+    def _set(self, key, row):
+        idx = self.base_ids.get(key, self.overlay_ids.get(key))
+        if idx is None:
+            if row is None:
+                return
+            idx = self.overlay_ids[key] = self.bm25.add(self._document(row))
+            self.rows.append(row)
+        elif row is None:
+            self.bm25.remove(idx)
+        elif self.rows[idx] is None:
+            self.bm25.add(self._document(row), idx)
+        else:
+            self.bm25.update(idx, self._document(row))
+        self.rows[idx] = row
+        self.edits.append(idx)
+
+
+_indexes = {}
+
+
+def get_index(filepath, search_cols):
+    """Cached GuidelineIndex for a CSV, refit if the shipped file changed, overlay applied"""
+    key = (filepath, tuple(search_cols))
+    index = _indexes.get(key)
+    if index is None or index.stamp != _file_stamp(filepath):
+        index = _indexes[key] = GuidelineIndex(filepath, search_cols)
+    else:
+        index.refresh_overlay()
+    return index
+
+
+class StackIndex:
+    """
+    One BM25 index over every stack CSV (they share _STACK_COLS). Each document carries a
+    bitmap of the stacks it belongs to (identical rows are stored once), and per-stack
+    N / avgdl / document frequencies are derived from the bitmaps, so any subset of stacks
+    is ranked in a single pass over the postings with the same scores as search_stack.
+
+    Overlay edits are replayed from each GuidelineIndex's edit log as add/update/remove on
+    the affected documents and their stack bits; only a refit stack CSV is re-linked whole.
+    """
+
+    def __init__(self, sources):
+        self.bits = {stack: 1 << i for i, stack in enumerate(AVAILABLE_STACKS)}
+        self.bm25 = BM25()
+        self.rows = []
+        self.stack_bits = []
+        self.seen = {}              # row key -> document index
+        self.free = set()           # document slots no stack uses any more, reused by new documents
+        self.sources = {}           # stack -> GuidelineIndex (shipped rows + overlay)
+        self.members = {}           # stack -> document index of each of its rows (None for removed rows)
+        self.applied = {}           # stack -> number of its GuidelineIndex edits already replayed
+        self.n = {}
+        self.total_length = {}
+        self.sync(sources)
+
+    @staticmethod
+    def _key(row):
+        return tuple(str(row.get(col, "")) for col in _STACK_COLS["search_cols"] + _STACK_COLS["output_cols"])
+
+    def _link(self, stack, row, slot=None):
+        """Add a stack's row; a new document takes slot (the row's previous document) or the lowest free slot"""
+        key = self._key(row)
+        idx = self.seen.get(key)
+        if idx is None:
+            if slot not in self.free:
+                slot = min(self.free) if self.free else None
+            self.free.discard(slot)
+            document = " ".join(str(row.get(col, "")) for col in _STACK_COLS["search_cols"])
+            idx = self.seen[key] = self.bm25.add(document, slot)
+            if idx == len(self.rows):
+                self.rows.append(row)
+                self.stack_bits.append(0)
+            else:
+                self.rows[idx] = row
+        self.stack_bits[idx] |= self.bits[stack]
+        self.n[stack] += 1
+        self.total_length[stack] += self.bm25.doc_lengths[idx]
+        return idx
+
+    def _unlink(self, stack, idx):
+        """Drop a stack's row; returns True when no stack uses the document any more (slot freed)"""
+        self.stack_bits[idx] &= ~self.bits[stack]
+        self.n[stack] -= 1
+        self.total_length[stack] -= self.bm25.doc_lengths[idx]
+        if self.stack_bits[idx]:
+            return False
+        del self.seen[self._key(self.rows[idx])]
+        self.bm25.remove(idx)
+        self.rows[idx] = None
+        self.free.add(idx)
+        return True
+
+    def _attach(self, stack, index):
+        self.sources[stack] = index
+        self.n[stack] = self.total_length[stack] = 0
+        self.members[stack] = [self._link(stack, row) if row is not None else None for row in index.rows]
+        self.applied[stack] = len(index.edits)
+
+    def _detach(self, stack):
+        for idx in self.members.pop(stack):
+            if idx is not None:
+                self._unlink(stack, idx)
+        for table in (self.sources, self.applied, self.n, self.total_length):
+            del table[stack]
+
+    def _replay(self, stack, index):
+        """Apply the overlay edits made to a stack's GuidelineIndex since the last call"""
+        members = self.members[stack]
+        for i in dict.fromkeys(index.edits[self.applied[stack]:]):
+            members.extend([None] * (i + 1 - len(members)))
+            old = members[i]
+            slot = old if old is not None and self._unlink(stack, old) else None
+            row = index.rows[i]
+            members[i] = self._link(stack, row, slot) if row is not None else None
+        self.applied[stack] = len(index.edits)
+
+    def sync(self, sources):
+        """Bring the index up to date with sources (stack -> current GuidelineIndex)"""
+        for stack in list(self.sources):
+            if sources.get(stack) is not self.sources[stack]:
+                self._detach(stack)
+        for stack, index in sources.items():
+            if stack in self.sources:
+                self._replay(stack, index)
+            else:
+                self._attach(stack, index)
+
+    def search(self, query, stacks, max_results, phrases=(), proximity=False):
+        """Per-stack top results: {stack: [(idx, score), ...]} for the selected stacks"""
+        stacks = [stack for stack in stacks if self.n.get(stack)]
+        mask = 0
+        for stack in stacks:
+            mask |= self.bits[stack]
+        avgdl = {stack: self.total_length[stack] / self.n[stack] for stack in stacks}
+        k1, b = self.bm25.k1, self.bm25.b
+        totals = {stack: {} for stack in stacks}
+        idf = {}
+        groups = {}
+
+        def members(bits):
+            """Selected stacks in a bitmap (memoized; most documents belong to one stack)"""
+            if bits not in groups:
+                groups[bits] = [stack for stack in stacks if bits & self.bits[stack]]
+            return groups[bits]
+
+        for token in self.bm25.tokenize(query):
+            postings = self.bm25.postings.get(token)
+            if not postings:
+                continue
+            if token not in idf:
+                df = dict.fromkeys(stacks, 0)
+                for idx in postings:
+                    for stack in members(self.stack_bits[idx] & mask):
+                        df[stack] += 1
+                idf[token] = {stack: log((self.n[stack] - df[stack] + 0.5) / (df[stack] + 0.5) + 1) for stack in stacks}
+            for idx, tf in postings.items():
+                numerator = tf * (k1 + 1)
+                for stack in members(self.stack_bits[idx] & mask):
+                    denominator = tf + k1 * (1 - b + b * self.bm25.doc_lengths[idx] / avgdl[stack])
+                    scores = totals[stack]
+                    scores[idx] = scores.get(idx, 0) + idf[token][stack] * numerator / denominator
+
+        if phrases or proximity:
+            allowed = None
+            for phrase in phrases:
+                matches = self.bm25.phrase_matches(phrase)
+                allowed = matches if allowed is None else allowed & matches
+            query_tokens = self.bm25.tokenize(query)
+            for stack in stacks:
+                scores = totals[stack]
+                for idx in list(scores):
+                    if allowed is not None and idx not in allowed:
+                        del scores[idx]
+                    elif proximity:
+                        scores[idx] += self.bm25.proximity_boost(idx, query_tokens)
+
+        return {stack: heapq.nsmallest(max_results, totals[stack].items(), key=lambda x: (-x[1], x[0]))
+                for stack in stacks}
+
+
+_stack_index = None
+
+
+def get_stack_index():
+    """Cached StackIndex, kept in step with the stack CSVs and their overlays"""
+    global _stack_index
+    sources = {}
+    for stack, config in STACK_CONFIG.items():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            sources[stack] = get_index(filepath, _STACK_COLS["search_cols"])
+    if _stack_index is None:
+        _stack_index = StackIndex(sources)
+    else:
+        _stack_index.sync(sources)
+    return _stack_index
+
+
+def _correct_query(bm25, query, has_results):
+    """
+    Typo correction against the shared lexicon (lexicon.py): while the query has results, only
+    words no domain or stack knows are corrected (a word missing from one CSV is not a typo);
+    a query without any result may correct every word the searched index does not know
+    """
+    from lexicon import get_lexicon
+    lexicon = get_lexicon()
+    return bm25.correct_query(query, lexicon if has_results else None, lexicon)
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results, source=None, backend=None,
+                proximity=False, fuzzy=False):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
+    backend = backend or SEARCH_BACKEND
+    phrases = parse_query(query)
+    # Overlays, quoted phrases, proximity and typo correction are handled by the in-memory index only
+    overlay = overlay_path(filepath)
+    if (overlay is not None and overlay.exists()) or phrases or proximity or fuzzy:
+        backend = "bm25"
+    if backend == "sqlite" and source is not None:
+        from sqlite_backend import search_source
+        results = search_source(source, query, max_results, output_cols)
+        # None: FTS5 unavailable, fall back to the in-memory index
+        if results is not None:
+            return results
+    if backend == "disk" and source is not None:
+        from disk_index import search_source
+        return search_source(source, filepath, search_cols, output_cols, query, max_results)
+
+    # BM25 top results with score > 0, over the cached index (shipped rows + overlay)
+    index = get_index(filepath, search_cols)
+    ranked = index.bm25.search(query, max_results, phrases, proximity)
+    if fuzzy:
+        corrected = _correct_query(index.bm25, query, bool(ranked))
+        if corrected != query:
+            ranked = index.bm25.search(corrected, max_results, phrases, proximity)
     results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    for idx, _ in ranked:
+        row = index.rows[idx]
+        results.append({col: row.get(col, "") for col in output_cols if col in row})
 
     return results
 
@@ -213,18 +831,24 @@ def detect_domain(query):
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
+def search(query, domain=None, max_results=MAX_RESULTS, backend=None, proximity=False, fuzzy=False):
+    """
+    Main search function with auto-domain detection.
+    Quoted phrases ('"dark mode" dashboard') must match; proximity=True boosts rows where
+    the query terms appear close together; fuzzy=True adds corrections of misspelled query words.
+    """
     if domain is None:
         domain = detect_domain(query)
 
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+    source = domain if domain in CSV_CONFIG else "style"
+    config = CSV_CONFIG[source]
     filepath = DATA_DIR / config["file"]
 
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results,
+                          source, backend, proximity, fuzzy)
 
     return {
         "domain": domain,
@@ -235,7 +859,7 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
+def search_stack(query, stack, max_results=MAX_RESULTS, backend=None, proximity=False, fuzzy=False):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
@@ -245,7 +869,8 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results,
+                          f"stack:{stack}", backend, proximity, fuzzy)
 
     return {
         "domain": "stack",
@@ -255,3 +880,40 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def search_stacks(query, stacks=None, max_results=MAX_RESULTS, backend=None, proximity=False, fuzzy=False):
+    """Search several stacks (default: all) in one pass; returns {stack: search_stack-style result}"""
+    stacks = list(stacks or AVAILABLE_STACKS)
+    unknown = [stack for stack in stacks if stack not in STACK_CONFIG]
+    if unknown:
+        return {"error": f"Unknown stack: {', '.join(unknown)}. Available: {', '.join(AVAILABLE_STACKS)}"}
+
+    # The combined index is in-memory; other backends search stack by stack
+    if (backend or SEARCH_BACKEND) != "bm25":
+        return {stack: search_stack(query, stack, max_results, backend, proximity, fuzzy) for stack in stacks}
+
+    index = get_stack_index()
+    phrases = parse_query(query)
+    ranked = index.search(query, stacks, max_results, phrases, proximity)
+    if fuzzy:
+        # Results still report the query as typed, like search_stack
+        corrected = _correct_query(index.bm25, query, any(ranked.values()))
+        if corrected != query:
+            ranked = index.search(corrected, stacks, max_results, phrases, proximity)
+    output = {}
+    for stack in stacks:
+        if stack not in index.sources:
+            output[stack] = {"error": f"Stack file not found: {DATA_DIR / STACK_CONFIG[stack]['file']}", "stack": stack}
+            continue
+        results = [{col: index.rows[idx].get(col, "") for col in _STACK_COLS["output_cols"] if col in index.rows[idx]}
+                   for idx, _ in ranked.get(stack, [])]
+        output[stack] = {
+            "domain": "stack",
+            "stack": stack,
+            "query": query,
+            "file": STACK_CONFIG[stack]["file"],
+            "count": len(results),
+            "results": results
+        }
+    return output
@@ -19,6 +19,7 @@ import os
 from datetime import datetime
 from pathlib import Path
 from core import search, DATA_DIR
+from contrast import format_contrast, get_contrast_audit, rank_palettes
 
 
 # ============ CONFIGURATION ============
@@ -184,6 +185,9 @@ class DesignSystemGenerator:
         landing_results = self._extract_results(search_results.get("landing", {}))
 
         best_style = self._select_best_match(style_results, reasoning.get("style_priority", []))
+        # Palettes passing the WCAG contrast checks first; the audit is stored in data/index/
+        color_results = rank_palettes(color_results)
+        contrast_audit = get_contrast_audit()
         best_color = color_results[0] if color_results else {}
         best_typography = typography_results[0] if typography_results else {}
         best_landing = landing_results[0] if landing_results else {}
@@ -219,7 +223,8 @@ class DesignSystemGenerator:
                 "cta": best_color.get("CTA (Hex)", "#F97316"),
                 "background": best_color.get("Background (Hex)", "#F8FAFC"),
                 "text": best_color.get("Text (Hex)", "#1E293B"),
-                "notes": best_color.get("Notes", "")
+                "notes": best_color.get("Notes", ""),
+                "contrast": format_contrast(contrast_audit.lookup(best_color))
             },
             "typography": {
                 "heading": best_typography.get("Heading Font", "Inter"),
@@ -314,6 +319,9 @@ def format_ascii_box(design_system: dict) -> str:
     if colors.get("notes"):
         for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
             lines.append(line.ljust(BOX_WIDTH) + "|")
+    if colors.get("contrast"):
+        for line in wrap_text(f"Contrast: {colors.get('contrast', '')}", "|     ", BOX_WIDTH):
+            lines.append(line.ljust(BOX_WIDTH) + "|")
     lines.append("|" + " " * BOX_WIDTH + "|")
 
     # Typography section
@@ -412,6 +420,8 @@ def format_markdown(design_system: dict) -> str:
     lines.append(f"| Text | {colors.get('text', '')} |")
     if colors.get("notes"):
         lines.append(f"\n*Notes: {colors.get('notes', '')}*")
+    if colors.get("contrast"):
+        lines.append(f"\n*Contrast: {colors.get('contrast', '')}*")
     lines.append("")
 
     # Typography section
@@ -586,6 +596,9 @@ def format_master_md(design_system: dict) -> str:
     if colors.get("notes"):
         lines.append(f"**Color Notes:** {colors.get('notes', '')}")
         lines.append("")
+    if colors.get("contrast"):
+        lines.append(f"**Contrast (WCAG):** {colors.get('contrast', '')}")
+        lines.append("")
     
     # Typography
     lines.append("### Typography")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Disk Index - external-memory BM25 index for very large CSVs
+
+Builds an on-disk inverted index SPIMI-style: CSV rows are read one at a time,
+postings accumulate in memory until a block limit, each block is written as a
+term-sorted run file, and the runs are k-way merged into one postings file.
+Memory during the build is bounded by the block size, not the CSV size.
+
+Index layout (one directory per source):
+    meta.json      N, avgdl, columns, source fingerprint
+    lexicon.tsv    term, document frequency, byte offset and length in postings.txt
+    postings.txt   one line per term: "doc tf doc tf ..." (doc ids ascending)
+    lengths.bin    document lengths (array 'I')
+    offsets.bin    byte offset of each row in rows.jsonl (array 'Q')
+    rows.jsonl     output columns of each row, fetched only for the top results
+
+Scores use the same formula as the BM25 class, so results match the in-memory search.
+
+Usage:
+    python disk_index.py --build                       # every CSV_CONFIG / STACK_CONFIG source
+    python disk_index.py --csv big.csv --search-cols "Category,Issue" --out /tmp/big-index
+    python disk_index.py --query "focus ring" --out /tmp/big-index
+    python disk_index.py --parity [-n 3]               # compare top-k with the in-memory BM25 class
+    UIPRO_SEARCH_BACKEND=disk python search.py "focus ring" --domain web
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import re
+import shutil
+import sys
+from array import array
+from collections import Counter, defaultdict
+from math import log
+from pathlib import Path
+
+from core import BM25, DATA_DIR, iter_sources, _load_csv, _search_csv
+
+# ============ CONFIGURATION ============
+INDEX_DIR = DATA_DIR / "index"
+# Postings held in memory before a sorted run is flushed to disk
+BLOCK_POSTINGS = 500_000
+
+_tokenizer = BM25()
+
+
+def _fingerprint(filepath: Path, search_cols: list, output_cols: list) -> list:
+    stat = filepath.stat()
+    return [stat.st_size, stat.st_mtime_ns, search_cols, output_cols]
+
+
+def _stream_rows(filepath: Path):
+    """
+    Yield the header, then CSV rows one at a time (opened like _load_csv so cell text matches).
+    csv.field_size_limit is process-wide: it is raised for very large cells only while the
+    rows are read, and restored once the generator is exhausted or closed.
+    """
+    limit = csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            yield reader.fieldnames or []
+            yield from reader
+    finally:
+        csv.field_size_limit(limit)
+
+
+# ============ BUILD ============
+def _write_run(block: dict, run_path: Path):
+    with open(run_path, "w", encoding="utf-8") as f:
+        for term in sorted(block):
+            f.write(term + "\t" + " ".join(block[term]) + "\n")
+
+
+def _read_run(run_path: Path, run_index: int):
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f:
+            term, postings = line.rstrip("\n").split("\t", 1)
+            yield term, run_index, postings
+
+
+def build_index(filepath: Path, search_cols: list, output_cols: list, index_dir: Path,
+                block_postings: int = BLOCK_POSTINGS) -> dict:
+    """Stream a CSV into an on-disk index; returns the stored metadata"""
+    index_dir = Path(index_dir)
+    tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    runs_dir = tmp_dir / "runs"
+    runs_dir.mkdir(parents=True)
+
+    rows = _stream_rows(filepath)
+    fieldnames = next(rows)
+    columns = [col for col in output_cols if col in fieldnames]
+
+    lengths = array("I")
+    offsets = array("Q")
+    block = defaultdict(list)
+    block_size = 0
+    run_paths = []
+    total_length = 0
+
+    with open(tmp_dir / "rows.jsonl", "wb") as rows_file:
+        for doc_id, row in enumerate(rows):
+            offsets.append(rows_file.tell())
+            rows_file.write(json.dumps({col: row.get(col, "") for col in columns},
+                                       ensure_ascii=False).encode("utf-8") + b"\n")
+
+            tokens = _tokenizer.tokenize(" ".join(str(row.get(col, "")) for col in search_cols))
+            lengths.append(len(tokens))
+            total_length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                block[term].append(f"{doc_id} {tf}")
+                block_size += 1
+
+            if block_size >= block_postings:
+                run_paths.append(runs_dir / f"run-{len(run_paths):05d}.txt")
+                _write_run(block, run_paths[-1])
+                block = defaultdict(list)
+                block_size = 0
+
+    if block:
+        run_paths.append(runs_dir / f"run-{len(run_paths):05d}.txt")
+        _write_run(block, run_paths[-1])
+
+    # k-way merge: runs hold increasing doc ids, so postings of a term concatenate in run order
+    with open(tmp_dir / "postings.txt", "wb") as postings_file, \
+            open(tmp_dir / "lexicon.tsv", "w", encoding="utf-8") as lexicon_file:
+        merged = heapq.merge(*(_read_run(path, i) for i, path in enumerate(run_paths)))
+        current, parts = None, []
+
+        def flush_term():
+            data = (" ".join(parts) + "\n").encode("utf-8")
+            df = sum(part.count(" ") + 1 for part in parts) // 2
+            lexicon_file.write(f"{current}\t{df}\t{postings_file.tell()}\t{len(data)}\n")
+            postings_file.write(data)
+
+        for term, _, postings in merged:
+            if term != current and current is not None:
+                flush_term()
+                parts = []
+            current = term
+            parts.append(postings)
+        if current is not None:
+            flush_term()
+
+    with open(tmp_dir / "lengths.bin", "wb") as f:
+        lengths.tofile(f)
+    with open(tmp_dir / "offsets.bin", "wb") as f:
+        offsets.tofile(f)
+    shutil.rmtree(runs_dir)
+
+    meta = {
+        "n": len(lengths),
+        "avgdl": total_length / len(lengths) if lengths else 0,
+        "columns": columns,
+        "runs": len(run_paths),
+        "fingerprint": _fingerprint(filepath, search_cols, output_cols),
+    }
+    with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    if index_dir.exists():
+        shutil.rmtree(index_dir)
+    os.replace(tmp_dir, index_dir)
+    return meta
+
+
+# ============ QUERY ============
+class DiskIndex:
+    """Query an on-disk index; only the lexicon and document lengths are held in memory"""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / "meta.json", "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.lexicon = {}
+        with open(self.index_dir / "lexicon.tsv", "r", encoding="utf-8") as f:
+            for line in f:
+                term, df, offset, length = line.rstrip("\n").split("\t")
+                self.lexicon[term] = (int(df), int(offset), int(length))
+        self.lengths = array("I")
+        with open(self.index_dir / "lengths.bin", "rb") as f:
+            self.lengths.frombytes(f.read())
+
+    def postings(self, term: str) -> list:
+        """[(doc_id, tf), ...] for a term, read from disk"""
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return []
+        with open(self.index_dir / "postings.txt", "rb") as f:
+            f.seek(entry[1])
+            numbers = f.read(entry[2]).split()
+        return list(zip(map(int, numbers[0::2]), map(int, numbers[1::2])))
+
+    def score(self, query: str) -> dict:
+        """doc_id -> BM25 score, with the BM25 class formula and token order"""
+        k1, b = _tokenizer.k1, _tokenizer.b
+        n, avgdl = self.meta["n"], self.meta["avgdl"]
+        scores = defaultdict(float)
+        cache = {}
+        for token in _tokenizer.tokenize(query):
+            if token not in self.lexicon:
+                continue
+            if token not in cache:
+                cache[token] = self.postings(token)
+            df = self.lexicon[token][0]
+            idf = log((n - df + 0.5) / (df + 0.5) + 1)
+            for doc_id, tf in cache[token]:
+                numerator = tf * (k1 + 1)
+                denominator = tf + k1 * (1 - b + b * self.lengths[doc_id] / avgdl)
+                scores[doc_id] += idf * numerator / denominator
+        return scores
+
+    def rows(self, doc_ids: list) -> list:
+        """Fetch stored output columns for the given documents"""
+        results = []
+        with open(self.index_dir / "offsets.bin", "rb") as offsets, \
+                open(self.index_dir / "rows.jsonl", "rb") as rows:
+            for doc_id in doc_ids:
+                offsets.seek(doc_id * 8)
+                position = array("Q")
+                position.frombytes(offsets.read(8))
+                rows.seek(position[0])
+                results.append(json.loads(rows.readline()))
+        return results
+
+    def search(self, query: str, max_results: int) -> list:
+        scores = self.score(query)
+        top = heapq.nsmallest(max_results, ((-score, doc_id) for doc_id, score in scores.items() if score > 0))
+        return self.rows([doc_id for _, doc_id in top])
+
+
+def _index_dir(source: str) -> Path:
+    return INDEX_DIR / re.sub(r"\W", "_", source)
+
+
+_open_indexes = {}
+
+
+def open_index(source: str, filepath: Path, search_cols: list, output_cols: list) -> DiskIndex:
+    """Open the index for a source, building or rebuilding it when the CSV changed"""
+    index_dir = _index_dir(source)
+    fingerprint = _fingerprint(filepath, search_cols, output_cols)
+    cached = _open_indexes.get(source)
+    if cached is not None and cached.meta["fingerprint"] == fingerprint:
+        return cached
+
+    meta_file = index_dir / "meta.json"
+    stale = True
+    if meta_file.exists():
+        with open(meta_file, "r", encoding="utf-8") as f:
+            stale = json.load(f).get("fingerprint") != fingerprint
+    if stale:
+        build_index(filepath, search_cols, output_cols, index_dir)
+    _open_indexes[source] = DiskIndex(index_dir)
+    return _open_indexes[source]
+
+
+def search_source(source: str, filepath: Path, search_cols: list, output_cols: list, query: str, max_results: int):
+    """Entry point used by core._search_csv for backend="disk" """
+    return open_index(source, filepath, search_cols, output_cols).search(query, max_results)
+
+
+# ============ PARITY ============
+def check_parity(max_results: int = 3) -> dict:
+    """Compare top-k results with the in-memory BM25 class on queries taken from each source's rows"""
+    total = identical = 0
+    mismatches = []
+    for source, filepath, search_cols, output_cols in iter_sources():
+        if not filepath.exists():
+            continue
+        for row in _load_csv(filepath)[:20]:
+            query = " ".join(str(row.get(col, "")).split(",")[0] for col in search_cols[:2]).strip()
+            if not query:
+                continue
+            expected = _search_csv(filepath, search_cols, output_cols, query, max_results, backend="bm25")
+            actual = search_source(source, filepath, search_cols, output_cols, query, max_results)
+            total += 1
+            if expected == actual:
+                identical += 1
+            else:
+                mismatches.append((source, query))
+    return {"queries": total, "identical": identical, "mismatches": mismatches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="External-memory BM25 index for UI Pro Max CSVs")
+    parser.add_argument("--build", action="store_true", help="Build indexes for all configured sources")
+    parser.add_argument("--csv", type=Path, help="Index an arbitrary CSV instead")
+    parser.add_argument("--search-cols", default="", help="Comma-separated search columns for --csv")
+    parser.add_argument("--output-cols", default="", help="Comma-separated output columns for --csv (default: all)")
+    parser.add_argument("--out", type=Path, help="Index directory for --csv / --query")
+    parser.add_argument("--block", type=int, default=BLOCK_POSTINGS, help="Postings per in-memory block")
+    parser.add_argument("--query", "-q", help="Query an index directory")
+    parser.add_argument("--max-results", "-n", type=int, default=3)
+    parser.add_argument("--parity", action="store_true", help="Compare top-k with the in-memory BM25 class")
+    args = parser.parse_args()
+
+    if args.build:
+        for source, filepath, search_cols, output_cols in iter_sources():
+            if filepath.exists():
+                meta = build_index(filepath, search_cols, output_cols, _index_dir(source), args.block)
+                print(f"{source}: {meta['n']} rows, {meta['runs']} run(s)")
+    elif args.csv:
+        if not args.out or not args.search_cols:
+            parser.error("--csv needs --search-cols and --out")
+        with open(args.csv, "r", encoding="utf-8", newline="") as f:
+            fieldnames = next(csv.reader(f))
+        output_cols = [c.strip() for c in args.output_cols.split(",") if c.strip()] or fieldnames
+        search_cols = [c.strip() for c in args.search_cols.split(",") if c.strip()]
+        meta = build_index(args.csv, search_cols, output_cols, args.out, args.block)
+        print(f"Indexed {meta['n']} rows into {args.out} ({meta['runs']} run(s))")
+    if args.query:
+        if not args.out:
+            parser.error("--query needs --out")
+        print(json.dumps(DiskIndex(args.out).search(args.query, args.max_results), indent=2, ensure_ascii=False))
+    if args.parity:
+        report = check_parity(args.max_results)
+        print(f"queries: {report['queries']} | identical top-{args.max_results}: {report['identical']}")
+        for source, query in report["mismatches"][:5]:
+            print(f"  differs: [{source}] {query}")
+    if not (args.build or args.csv or args.query or args.parity):
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
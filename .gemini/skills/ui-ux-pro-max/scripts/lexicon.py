@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Lexicon - shared vocabulary and typo index for fuzzy search
+
+The words of every CSV_CONFIG / STACK_CONFIG source (shipped rows and overlay rows)
+and their SymSpell deletion variants are stored once in a SQLite file next to the
+disk index (data/index/lexicon.db). It is rebuilt when a CSV or overlay changes, so a
+fuzzy search never fits the other sources nor builds a deletion index in-process:
+"is this word known anywhere" and "which words are one or two edits away" are each
+a single indexed lookup. Plain SQLite tables, FTS5 is not needed.
+
+Words of overlay-deleted rows stay in the lexicon; it only decides which tokens are
+left uncorrected, and suggestions are checked against the searched index.
+
+Usage:
+    python lexicon.py --build                # (re)build the lexicon
+    python lexicon.py --suggest glasmorphism
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+import core
+from core import BM25, DATA_DIR, OVERLAY_ACTION_COL, _load_csv, iter_sources, overlay_path
+
+# ============ CONFIGURATION ============
+# disk_index.INDEX_DIR, not imported: its imports would double the cost of the first fuzzy search
+LEXICON_FILE = DATA_DIR / "index" / "lexicon.db"
+
+_tokenizer = BM25()
+_local = threading.local()
+_watched = None
+
+
+def _watched_paths() -> list:
+    """Every source CSV and overlay path as a string (pathlib would dominate the per-query check)"""
+    global _watched
+    if _watched is None or _watched[0] != core.OVERLAY_DIR:
+        paths = []
+        for _, filepath, _, _ in iter_sources():
+            overlay = overlay_path(filepath)
+            paths += [str(filepath), str(overlay) if overlay else None]
+        _watched = (core.OVERLAY_DIR, paths)
+    return _watched[1]
+
+
+def _fingerprint() -> list:
+    """[size, mtime] of every source CSV and its overlay, None for a missing file"""
+    result = []
+    for path in _watched_paths():
+        try:
+            stat = os.stat(path)
+            result.append([stat.st_size, stat.st_mtime_ns])
+        except (OSError, TypeError):
+            result.append(None)
+    return result
+
+
+def _source_words(filepath, search_cols) -> set:
+    words = set()
+    overlay = overlay_path(filepath)
+    rows = _load_csv(filepath) if filepath.exists() else []
+    if overlay is not None and overlay.exists():
+        rows += [row for row in _load_csv(overlay)
+                 if (row.get(OVERLAY_ACTION_COL) or "").strip().lower() != "delete"]
+    for row in rows:
+        for col in search_cols:
+            words.update(_tokenizer.tokenize(row.get(col, "")))
+    return words
+
+
+# ============ BUILD ============
+def build_lexicon(path=LEXICON_FILE):
+    """Write a fresh lexicon (to a temp file, then swapped in)"""
+    fingerprint = _fingerprint()
+    words = set()
+    for _, filepath, search_cols, _ in iter_sources():
+        words |= _source_words(filepath, search_cols)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE words (id INTEGER PRIMARY KEY, word TEXT UNIQUE)")
+    conn.execute("CREATE TABLE deletes (variant TEXT, word_id INTEGER, PRIMARY KEY (variant, word_id)) WITHOUT ROWID")
+    conn.executemany("INSERT INTO words VALUES (?, ?)", enumerate(sorted(words)))
+    conn.executemany("INSERT INTO deletes VALUES (?, ?)", (
+        (variant, word_id) for word_id, word in enumerate(sorted(words))
+        for variant in BM25._variants(word, BM25._max_distance(word))))
+    conn.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (json.dumps(fingerprint),))
+    conn.commit()
+    conn.close()
+    tmp_path.replace(path)
+    return len(words)
+
+
+# ============ LOOKUP ============
+class Lexicon:
+    """Read side of the lexicon: `word in lexicon` and candidates(word) for BM25.correct_query"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __contains__(self, word):
+        return self.conn.execute("SELECT 1 FROM words WHERE word = ?", (word,)).fetchone() is not None
+
+    def candidates(self, word):
+        """Words sharing a deletion variant with word, within its edit distance limit"""
+        variants = json.dumps(sorted(BM25._variants(word, BM25._max_distance(word))))
+        rows = self.conn.execute(
+            "SELECT DISTINCT w.word FROM deletes d JOIN words w ON w.id = d.word_id "
+            "WHERE d.variant IN (SELECT value FROM json_each(?))", (variants,)).fetchall()
+        return {row[0] for row in rows}
+
+
+def get_lexicon(path=LEXICON_FILE):
+    """
+    Per-thread Lexicon over an up-to-date lexicon file, rebuilt when a source changed;
+    None when it cannot be written (callers fall back to the searched index's own vocabulary)
+    """
+    fingerprint = _fingerprint()
+    cached = getattr(_local, "lexicon", None)
+    if cached is not None and cached[0] == (path, fingerprint):
+        return cached[1]
+
+    try:
+        stale = True
+        if path.exists():
+            conn = sqlite3.connect(path)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+                stale = row is None or json.loads(row[0]) != fingerprint
+            except sqlite3.Error:
+                pass
+            conn.close()
+        if stale:
+            build_lexicon(path)
+        lexicon = Lexicon(sqlite3.connect(path))
+    except (OSError, sqlite3.Error):
+        return None
+    _local.lexicon = ((path, fingerprint), lexicon)
+    return lexicon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared vocabulary and typo index for fuzzy search")
+    parser.add_argument("--build", action="store_true", help="(Re)build the lexicon")
+    parser.add_argument("--suggest", help="Show the lexicon words within edit distance of a word")
+    args = parser.parse_args()
+
+    if args.build:
+        print(f"{build_lexicon()} words -> {LEXICON_FILE}")
+    if args.suggest:
+        lexicon = get_lexicon()
+        word = args.suggest.lower()
+        print(f"{word}: {'known' if word in lexicon else 'unknown'}")
+        print(", ".join(sorted(lexicon.candidates(word))))
+    if not args.build and not args.suggest:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
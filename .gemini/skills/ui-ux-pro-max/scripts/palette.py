@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Palette - nearest-palette lookup by color
+
+Every colors.csv row carries role colors (Primary, Secondary, CTA, Background, Text,
+Border). They are converted once to OKLab, a perceptual space where Euclidean
+distance tracks visible difference, and stored in a 3-d k-d tree. A query of one
+or more hex colors ranks palettes by the sum, over the query colors, of the distance
+to the palette's closest role color. Each query color streams palettes from the tree
+in distance order, and the streams stop as soon as no unseen palette can beat
+the k-th best (threshold algorithm), so lookups stay sub-linear as the table grows.
+
+Usage:
+    python palette.py "#2563EB #F97316"          # nearest palettes to a brand blue + orange
+    python palette.py --benchmark 50000          # lookup latency on a synthetic table
+    python search.py "#2563EB #F97316" --nearest
+"""
+
+import argparse
+import heapq
+import json
+import random
+import re
+import time
+from functools import lru_cache
+from itertools import count
+
+from core import CSV_CONFIG, DATA_DIR, MAX_RESULTS, get_index
+
+# ============ CONFIGURATION ============
+HEX_PATTERN = re.compile(r"#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})")
+# Colors inside free text must carry the "#" so words like "facade" are not read as hex
+QUERY_HEX_PATTERN = re.compile(r"#([0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b")
+LEAF_SIZE = 16
+
+
+# ============ COLOR SPACE ============
+def parse_hex(value):
+    """(r, g, b) in 0..1 for "#RRGGBB" / "#RGB", or None"""
+    match = HEX_PATTERN.fullmatch(str(value).strip())
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return tuple(int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def srgb_to_linear(channel):
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def rgb_to_oklab(rgb):
+    """sRGB (0..1) to OKLab (L, a, b)"""
+    r, g, b = (srgb_to_linear(c) for c in rgb)
+    l_ = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m_ = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s_ = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+@lru_cache(maxsize=None)
+def hex_to_oklab(value):
+    rgb = parse_hex(value)
+    return rgb_to_oklab(rgb) if rgb else None
+
+
+def _distance(p, q):
+    return ((p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2) ** 0.5
+
+
+# ============ K-D TREE ============
+class KDNode:
+    __slots__ = ("lo", "hi", "left", "right", "points")
+
+    def __init__(self, lo, hi, left=None, right=None, points=None):
+        self.lo, self.hi = lo, hi
+        self.left, self.right = left, right
+        self.points = points            # point indices, leaves only
+
+
+class KDTree:
+    """Static 3-d k-d tree with best-first (incremental) nearest-neighbour iteration"""
+
+    def __init__(self, points):
+        self.points = points
+        self.root = self._build(list(range(len(points))), 0) if points else None
+
+    def _build(self, indices, depth):
+        if len(indices) <= LEAF_SIZE:
+            columns = list(zip(*(self.points[i] for i in indices)))
+            return KDNode(tuple(map(min, columns)), tuple(map(max, columns)), points=indices)
+        # Cycle the split axis, median split; boxes are merged bottom-up from the children
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        left, right = self._build(indices[:mid], depth + 1), self._build(indices[mid:], depth + 1)
+        return KDNode(tuple(map(min, left.lo, right.lo)), tuple(map(max, left.hi, right.hi)), left, right)
+
+    @staticmethod
+    def _box_distance(node, q):
+        total = 0.0
+        for axis in range(3):
+            if q[axis] < node.lo[axis]:
+                total += (node.lo[axis] - q[axis]) ** 2
+            elif q[axis] > node.hi[axis]:
+                total += (q[axis] - node.hi[axis]) ** 2
+        return total ** 0.5
+
+    def nearest(self, q):
+        """Yield (distance, point index) in nondecreasing distance order"""
+        if self.root is None:
+            return
+        tie = count()
+        heap = [(self._box_distance(self.root, q), next(tie), self.root, None)]
+        while heap:
+            distance, _, node, point = heapq.heappop(heap)
+            if node is None:
+                yield distance, point
+            elif node.points is not None:
+                for i in node.points:
+                    heapq.heappush(heap, (_distance(self.points[i], q), next(tie), None, i))
+            else:
+                for child in (node.left, node.right):
+                    heapq.heappush(heap, (self._box_distance(child, q), next(tie), child, None))
+
+
+# ============ PALETTE INDEX ============
+class PaletteIndex:
+    """Role colors of every palette row in OKLab, indexed by a k-d tree"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.roles = []                 # per palette: [(role, hex, lab), ...]
+        points, self.owner = [], []
+        for idx, row in enumerate(rows):
+            colors = []
+            if row is not None:
+                for col, value in row.items():
+                    if col and col.endswith("(Hex)"):
+                        lab = hex_to_oklab(value)
+                        if lab is not None:
+                            colors.append((col[:-len("(Hex)")].strip(), value, lab))
+                            points.append(lab)
+                            self.owner.append(idx)
+            self.roles.append(colors)
+        self.tree = KDTree(points)
+
+    def _score(self, idx, query):
+        """Sum of per-query-color distances to the closest role color, with the matched roles"""
+        total, matches = 0.0, []
+        for lab in query:
+            distance, role, value = min((_distance(lab, c), r, v) for r, v, c in self.roles[idx])
+            total += distance
+            matches.append((role, value, distance))
+        return total, matches
+
+    def nearest(self, hex_colors, k=MAX_RESULTS):
+        """Top k palettes as [(row index, score, matches)], ties broken by row order"""
+        query = [lab for lab in (hex_to_oklab(c) for c in hex_colors) if lab is not None]
+        if not query or k <= 0:
+            return []
+
+        streams = [self.tree.nearest(lab) for lab in query]
+        frontier = [0.0] * len(query)
+        scored = {}
+        best = []                       # max-heap (negated) of the k lowest scores so far
+        while streams:
+            active = []
+            for i, stream in enumerate(streams):
+                step = next(stream, None)
+                if step is None:
+                    continue
+                active.append(stream)
+                frontier[i] = step[0]
+                palette = self.owner[step[1]]
+                if palette not in scored:
+                    scored[palette] = self._score(palette, query)
+                    if len(best) < k:
+                        heapq.heappush(best, -scored[palette][0])
+                    elif scored[palette][0] < -best[0]:
+                        heapq.heapreplace(best, -scored[palette][0])
+            if len(active) < len(streams):
+                # A stream ran out: every palette has been seen
+                break
+            # An unseen palette is at least frontier[i] away from query color i
+            if len(best) == k and -best[0] < sum(frontier):
+                break
+
+        ranked = heapq.nsmallest(k, scored.items(), key=lambda item: (item[1][0], item[0]))
+        return [(idx, score, matches) for idx, (score, matches) in ranked]
+
+
+_palette_index = None
+
+
+def get_palette_index():
+    """PaletteIndex over colors.csv (overlay rows included), rebuilt when the rows change"""
+    global _palette_index
+    config = CSV_CONFIG["color"]
+    index = get_index(DATA_DIR / config["file"], config["search_cols"])
+    version = (id(index), index.overlay_stamp)
+    if _palette_index is None or _palette_index[0] != version:
+        _palette_index = (version, PaletteIndex(index.rows))
+    return _palette_index[1]
+
+
+def search_palettes(query, max_results=MAX_RESULTS):
+    """Nearest palettes to the hex colors in query; same result shape as core.search"""
+    config = CSV_CONFIG["color"]
+    hex_colors = ["#" + m for m in QUERY_HEX_PATTERN.findall(query)]
+    if not hex_colors:
+        return {"error": f"No hex colors in query: {query}", "domain": "color"}
+
+    index = get_palette_index()
+    results = []
+    for idx, score, matches in index.nearest(hex_colors, max_results):
+        row = index.rows[idx]
+        result = {col: row.get(col, "") for col in config["output_cols"] if col in row}
+        result["Color Match"] = ", ".join(
+            f"{query_hex.upper()} ~ {role} {value} (dE {distance:.3f})"
+            for query_hex, (role, value, distance) in zip(hex_colors, matches))
+        results.append(result)
+
+    return {
+        "domain": "color",
+        "query": query,
+        "file": config["file"],
+        "count": len(results),
+        "results": results
+    }
+
+
+# ============ BENCHMARK ============
+def benchmark(rows, queries=200, k=MAX_RESULTS):
+    """Lookup latency of the k-d tree vs a linear scan over synthetic palettes"""
+    rng = random.Random(11)
+    roles = ["Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)"]
+    table = [{role: "#%06X" % rng.randrange(1 << 24) for role in roles} for _ in range(rows)]
+    start = time.perf_counter()
+    index = PaletteIndex(table)
+    build = time.perf_counter() - start
+
+    samples = [["#%06X" % rng.randrange(1 << 24) for _ in range(rng.randint(1, 3))] for _ in range(queries)]
+    start = time.perf_counter()
+    fast = [[(i, s) for i, s, _ in index.nearest(colors, k)] for colors in samples]
+    tree_ms = (time.perf_counter() - start) / queries * 1000
+
+    start = time.perf_counter()
+    slow = []
+    for colors in samples:
+        query = [hex_to_oklab(c) for c in colors]
+        scored = [(i, index._score(i, query)[0]) for i in range(len(table))]
+        slow.append(heapq.nsmallest(k, scored, key=lambda x: (x[1], x[0])))
+    scan_ms = (time.perf_counter() - start) / queries * 1000
+
+    print(f"{rows} palettes: build {build:.2f}s | k-d tree {tree_ms:.3f} ms | linear scan {scan_ms:.2f} ms "
+          f"| identical {sum(a == b for a, b in zip(fast, slow))}/{queries}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nearest palettes by color")
+    parser.add_argument("query", nargs="?", help='Hex colors, e.g. "#2563EB #F97316"')
+    parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS)
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="Benchmark on a synthetic table of ROWS palettes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    elif args.query:
+        result = search_palettes(args.query, args.max_results)
+        if args.json or "error" in result:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            for row in result["results"]:
+                print(f"{row.get('Product Type', '')}: {row['Color Match']}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
-Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3] [--backend sqlite]
+       python search.py "<query>" --stack react,nextjs,shadcn     # per-stack results in one pass ("all" for every stack)
+       python search.py '"dark mode" dashboard' --proximity        # quoted phrases must match; boost nearby terms
+       python search.py "#2563EB #F97316" --nearest                # palettes closest to these colors (OKLab)
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
 
@@ -15,7 +18,7 @@ Persistence (Master + Overrides pattern):
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, SEARCH_BACKENDS, search, search_stack, search_stacks
 from design_system import generate_design_system, persist_design_system
 
 
@@ -45,13 +48,28 @@ def format_output(result):
     return "\n".join(output)
 
 
+def parse_stacks(value):
+    """Comma-separated stack names, or "all" """
+    if value == "all":
+        return list(AVAILABLE_STACKS)
+    stacks = [s.strip() for s in value.split(",") if s.strip()]
+    unknown = [s for s in stacks if s not in AVAILABLE_STACKS]
+    if unknown or not stacks:
+        raise argparse.ArgumentTypeError(f"unknown stack: {', '.join(unknown) or value} (choose from {', '.join(AVAILABLE_STACKS)}, or all)")
+    return stacks
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
     parser.add_argument("query", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
-    parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--stack", "-s", type=parse_stacks, help="Stack-specific search, comma-separated for several stacks or \"all\" (html-tailwind, react, nextjs, ...)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--proximity", action="store_true", help="Boost results where query terms appear close together")
+    parser.add_argument("--nearest", action="store_true", help="Treat the query as hex colors and return the nearest palettes")
+    parser.add_argument("--fuzzy", action="store_true", help="Also search corrections of misspelled query words")
+    parser.add_argument("--backend", "-b", choices=SEARCH_BACKENDS, default=None, help="Search backend (default: bm25, or $UIPRO_SEARCH_BACKEND)")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -88,17 +106,36 @@ if __name__ == "__main__":
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
+    # Nearest palettes by color
+    elif args.nearest:
+        from palette import search_palettes
+        result = search_palettes(args.query, args.max_results)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
     # Stack search
-    elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+    elif args.stack and len(args.stack) == 1:
+        result = search_stack(args.query, args.stack[0], args.max_results, args.backend, args.proximity, args.fuzzy)
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
+    # Multi-stack search (one pass over the combined stack index)
+    elif args.stack:
+        result = search_stacks(args.query, args.stack, args.max_results, args.backend, args.proximity, args.fuzzy)
+        if args.json:
+            import json
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        elif "error" in result:
+            print(format_output(result))
+        else:
+            print("\n".join(format_output(stack_result) for stack_result in result.values()))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = search(args.query, args.domain, args.max_results, args.backend, args.proximity, args.fuzzy)
         if args.json:
             import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max SQLite Backend - FTS5 storage and search for the guideline CSVs
+
+Loads every CSV_CONFIG / STACK_CONFIG source into one SQLite database:
+one table of rows per source (all CSV columns) plus an FTS5 index over the
+search columns. The database is rebuilt automatically when any CSV changes.
+
+The default ranking="exact" scores with the same formula as the BM25 class
+(k1=1.5, smoothed IDF) from the FTS5 term statistics, as a single SQL query,
+so UIPRO_SEARCH_BACKEND=sqlite returns the same results as the in-memory index.
+ranking="bm25" uses FTS5's built-in bm25() (k1=1.2, unsmoothed IDF): faster on
+large tables, but the order of close scores can differ from the in-memory index.
+
+Usage:
+    python sqlite_backend.py --build             # (re)build the database
+    python sqlite_backend.py --parity [-n 3]     # compare top-k with the in-memory BM25 class
+    UIPRO_SEARCH_BACKEND=sqlite python search.py "glassmorphism dark" --domain style
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from math import log
+
+from core import BM25, DATA_DIR, iter_sources, _load_csv, _search_csv
+
+# ============ CONFIGURATION ============
+DB_FILE = DATA_DIR / "guidelines.db"
+# Same token boundaries as BM25.tokenize (\w plus underscore), no accent folding
+FTS_TOKENIZER = "unicode61 remove_diacritics 0 tokenchars '_'"
+RANKINGS = ["exact", "bm25"]
+DEFAULT_RANKING = "exact"
+
+_tokenizer = BM25()
+_local = threading.local()
+
+
+def fts5_available() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _table(source: str) -> str:
+    """Table name prefix for a source ("stack:react-native" -> "stack_react_native")"""
+    return re.sub(r"\W", "_", source)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _fts_text(text: str) -> str:
+    """Index exactly the tokens BM25.tokenize keeps (lowercase, length > 2)"""
+    return " ".join(_tokenizer.tokenize(text))
+
+
+def _fingerprint() -> dict:
+    """Size and mtime of every source CSV, stored in the database to detect stale builds"""
+    result = {}
+    for source, filepath, _, _ in iter_sources():
+        if filepath.exists():
+            stat = filepath.stat()
+            result[source] = [stat.st_size, stat.st_mtime_ns]
+    return result
+
+
+# ============ BUILD ============
+def build_database(db_path: Path = DB_FILE) -> Path:
+    """Load all sources into a fresh database (written to a temp file, then swapped in)"""
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE sources (source TEXT PRIMARY KEY, columns TEXT, n INTEGER, avgdl REAL)")
+
+    for source, filepath, search_cols, _ in iter_sources():
+        if not filepath.exists():
+            continue
+        with open(filepath, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            columns = reader.fieldnames or []
+            rows = list(reader)
+
+        docs = [_fts_text(" ".join(str(row.get(col, "")) for col in search_cols)) for row in rows]
+        lengths = [len(doc.split()) for doc in docs]
+
+        table = _table(source)
+        conn.execute(f"CREATE TABLE {table}_rows (id INTEGER PRIMARY KEY, doc_length INTEGER, "
+                     + ", ".join(f"{_quote(col)} TEXT" for col in columns) + ")")
+        conn.execute(f"CREATE VIRTUAL TABLE {table}_fts USING fts5(doc, tokenize=\"{FTS_TOKENIZER}\")")
+        conn.execute(f"CREATE VIRTUAL TABLE {table}_terms USING fts5vocab({table}_fts, 'instance')")
+        placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+        conn.executemany(f"INSERT INTO {table}_rows VALUES ({placeholders})", (
+            [idx, lengths[idx]] + [row.get(col, "") for col in columns] for idx, row in enumerate(rows)))
+        conn.executemany(f"INSERT INTO {table}_fts (rowid, doc) VALUES (?, ?)", enumerate(docs))
+        conn.execute("INSERT INTO sources VALUES (?, ?, ?, ?)", (
+            source, json.dumps(columns), len(rows), sum(lengths) / len(rows) if rows else 0))
+
+    conn.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (json.dumps(_fingerprint()),))
+    conn.commit()
+    conn.close()
+    tmp_path.replace(db_path)
+    return db_path
+
+
+def _connect(db_path: Path = DB_FILE):
+    """Per-thread connection to an up-to-date database; None when FTS5 is unavailable"""
+    cached = getattr(_local, "conn", None)
+    if cached is not None and cached[0] == db_path:
+        return cached[1]
+    if not fts5_available():
+        return None
+
+    stale = True
+    if db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            stale = row is None or json.loads(row[0]) != _fingerprint()
+        except sqlite3.Error:
+            pass
+        conn.close()
+    if stale:
+        build_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.create_function("ln", 1, log, deterministic=True)
+    _local.conn = (db_path, conn)
+    return conn
+
+
+# ============ SEARCH ============
+def match_expression(query: str) -> str:
+    """
+    OR of the query tokens, quoted so FTS5 treats them as plain terms;
+    repeated tokens are kept so bm25() weights them like BM25.score does
+    """
+    tokens = _tokenizer.tokenize(query)
+    return " OR ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def search_source(source: str, query: str, max_results: int, output_cols: list,
+                  db_path: Path = DB_FILE, ranking: str = DEFAULT_RANKING):
+    """
+    Top results for one source as a single FTS5 query ranked by the BM25 class
+    formula (or by FTS5's bm25() with ranking="bm25");
+    returns None when FTS5 is unavailable so callers can fall back
+    """
+    conn = _connect(db_path)
+    if conn is None:
+        return None
+    row = conn.execute("SELECT columns, n, avgdl FROM sources WHERE source = ?", (source,)).fetchone()
+    tokens = _tokenizer.tokenize(query)
+    if row is None or not tokens or not row[1]:
+        return []
+
+    columns = [col for col in output_cols if col in json.loads(row[0])]
+    table = _table(source)
+    projection = ", ".join(f"r.{_quote(col)}" for col in columns) or "r.id"
+    if ranking == "exact":
+        rows = conn.execute(_EXACT_SQL.format(table=table, projection=projection, k1=_tokenizer.k1, b=_tokenizer.b),
+                            {"n": row[1], "avgdl": row[2], "tokens": json.dumps(tokens), "limit": max_results}
+                            ).fetchall()
+    else:
+        rows = conn.execute(
+            f"SELECT {projection} FROM {table}_fts JOIN {table}_rows r ON r.id = {table}_fts.rowid "
+            f"WHERE {table}_fts MATCH ? ORDER BY bm25({table}_fts), r.id LIMIT ?",
+            (match_expression(query), max_results),
+        ).fetchall()
+    return [dict(zip(columns, values[:len(columns)])) for values in rows]
+
+
+# BM25 class formula over the FTS5 instance vocabulary: :tokens is the JSON list of query
+# tokens (repeated tokens count once per occurrence, as in BM25.score)
+_EXACT_SQL = """
+WITH stats(n, avgdl) AS (SELECT :n, :avgdl),
+     q AS (SELECT value AS term, COUNT(*) AS qf FROM json_each(:tokens) GROUP BY value),
+     tf AS (SELECT t.doc, t.term, COUNT(*) AS tf FROM {table}_terms t
+            WHERE t.term IN (SELECT term FROM q) GROUP BY t.doc, t.term),
+     df AS (SELECT term, COUNT(*) AS df FROM tf GROUP BY term)
+SELECT {projection}, SUM(
+         q.qf * ln((stats.n - df.df + 0.5) / (df.df + 0.5) + 1)
+         * tf.tf * ({k1} + 1)
+         / (tf.tf + {k1} * (1 - {b} + {b} * r.doc_length / stats.avgdl))) AS score
+FROM tf JOIN df ON df.term = tf.term JOIN q ON q.term = tf.term JOIN {table}_rows r ON r.id = tf.doc, stats
+GROUP BY tf.doc ORDER BY score DESC, r.id LIMIT :limit
+"""
+
+
+# ============ PARITY ============
+def _sample_queries(filepath: Path, search_cols: list, limit: int = 20) -> list:
+    """Queries taken from the source's own rows: the first search column plus a keyword"""
+    queries = []
+    for row in _load_csv(filepath)[:limit]:
+        words = [str(row.get(col, "")).split(",")[0] for col in search_cols[:2]]
+        query = " ".join(word for word in words if word).strip()
+        if query:
+            queries.append(query)
+    return queries
+
+
+def check_parity(max_results: int = 3, db_path: Path = DB_FILE, ranking: str = DEFAULT_RANKING) -> dict:
+    """
+    Compare top-k results of the SQLite backend with the in-memory BM25 class.
+    bm25() uses k1=1.2 and an unsmoothed IDF, so exact order may differ on close
+    scores; ranking="exact" should match exactly. The report counts identical
+    lists and the overlap of the result sets.
+    """
+    total = identical = overlap = expected_count = 0
+    mismatches = []
+    for source, filepath, search_cols, output_cols in iter_sources():
+        if not filepath.exists():
+            continue
+        for query in _sample_queries(filepath, search_cols):
+            expected = _search_csv(filepath, search_cols, output_cols, query, max_results, backend="bm25")
+            actual = search_source(source, query, max_results, output_cols, db_path, ranking) or []
+            total += 1
+            expected_keys = [json.dumps(r, sort_keys=True) for r in expected]
+            actual_keys = [json.dumps(r, sort_keys=True) for r in actual]
+            if expected_keys == actual_keys:
+                identical += 1
+            else:
+                mismatches.append((source, query))
+            overlap += len(set(expected_keys) & set(actual_keys))
+            expected_count += len(expected_keys)
+    return {
+        "queries": total,
+        "identical": identical,
+        "overlap": round(overlap / expected_count, 4) if expected_count else None,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite FTS5 backend for UI Pro Max search")
+    parser.add_argument("--build", action="store_true", help="Rebuild the database")
+    parser.add_argument("--parity", action="store_true", help="Compare top-k with the in-memory BM25 class")
+    parser.add_argument("--max-results", "-n", type=int, default=3)
+    parser.add_argument("--db", type=Path, default=DB_FILE)
+    args = parser.parse_args()
+
+    if not fts5_available():
+        raise SystemExit("SQLite FTS5 is not available in this Python build")
+    if args.build:
+        print(f"Built {build_database(args.db)}")
+    if args.parity:
+        for ranking in RANKINGS:
+            report = check_parity(args.max_results, args.db, ranking)
+            print(f"[{ranking}] queries: {report['queries']} | identical top-{args.max_results}: "
+                  f"{report['identical']} | result overlap: {report['overlap']:.1%}")
+            for source, query in report["mismatches"][:5]:
+                print(f"  differs: [{source}] {query}")
+    if not args.build and not args.parity:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""BM25.top_k (MaxScore) must return exactly the head of exhaustive scoring, also after edits"""
+
+import random
+from math import log
+
+import pytest
+
+from core import BM25
+
+VOCAB = ["glass", "dark", "mode", "minimal", "brutal", "neon", "soft", "shadow", "grid", "card",
+         "motion", "serif", "mono", "pastel", "retro", "flat", "depth", "blur", "gradient", "bold"]
+
+
+def random_document(rng):
+    # Skewed word choice: a few common terms with long posting lists, many rare ones
+    return " ".join(VOCAB[min(int(rng.expovariate(0.25)), len(VOCAB) - 1)] for _ in range(rng.randint(1, 12)))
+
+
+def random_query(rng):
+    return " ".join(rng.choice(VOCAB + ["absent"]) for _ in range(rng.randint(1, 6)))
+
+
+def exhaustive(bm25, query, k):
+    return [(idx, score) for idx, score in bm25.score(query) if score > 0][:k]
+
+
+def reference_scores(documents, query, k1=1.5, b=0.75):
+    """Scores from scratch over the live documents ({index: text}), without the index structures"""
+    tokenizer = BM25()
+    docs = {idx: tokenizer.tokenize(text) for idx, text in documents.items()}
+    n = len(docs)
+    avgdl = sum(map(len, docs.values())) / n
+    scores = {}
+    for idx, tokens in docs.items():
+        total = 0
+        for token in tokenizer.tokenize(query):
+            tf = tokens.count(token)
+            if tf:
+                df = sum(token in other for other in docs.values())
+                idf = log((n - df + 0.5) / (df + 0.5) + 1)
+                total += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avgdl))
+        scores[idx] = total
+    return scores
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_k_matches_exhaustive(seed):
+    rng = random.Random(seed)
+    bm25 = BM25()
+    bm25.fit([random_document(rng) for _ in range(300)])
+    for _ in range(100):
+        query, k = random_query(rng), rng.randint(1, 10)
+        assert bm25.top_k(query, k) == exhaustive(bm25, query, k), (query, k)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_top_k_after_add_remove_update(seed):
+    rng = random.Random(100 + seed)
+    bm25 = BM25()
+    documents = dict(enumerate(random_document(rng) for _ in range(150)))
+    bm25.fit([documents[idx] for idx in range(150)])
+
+    for step in range(200):
+        op = rng.random()
+        if op < 0.35 or len(documents) < 10:
+            text = random_document(rng)
+            removed = [idx for idx, doc in enumerate(bm25.corpus) if doc is None]
+            idx = bm25.add(text, rng.choice(removed) if removed and rng.random() < 0.5 else None)
+            documents[idx] = text
+        elif op < 0.65:
+            idx = rng.choice(sorted(documents))
+            bm25.remove(idx)
+            del documents[idx]
+        else:
+            idx = rng.choice(sorted(documents))
+            documents[idx] = random_document(rng)
+            bm25.update(idx, documents[idx])
+
+        query, k = random_query(rng), rng.randint(1, 10)
+        assert bm25.top_k(query, k) == exhaustive(bm25, query, k), (step, query, k)
+        if step % 20 == 0:
+            expected = reference_scores(documents, query)
+            assert dict(bm25.score(query)) == pytest.approx(expected), (step, query)
@@ -0,0 +1,85 @@
+"""Contrast ratios match WCAG reference values, both engines agree, the audit is stored on disk"""
+
+import random
+
+import pytest
+
+import contrast
+from contrast import CONTRAST_PAIRS, ContrastAudit, _audit_numpy, _audit_python, pair_name, role_col
+
+# (foreground, background, ratio): reference values quoted with WCAG 2.x tooling
+KNOWN_RATIOS = [
+    ("#000000", "#FFFFFF", 21.0),
+    ("#FFFFFF", "#FFFFFF", 1.0),
+    ("#767676", "#FFFFFF", 4.54),      # lightest grey passing AA body text on white
+    ("#777777", "#FFFFFF", 4.48),
+    ("#0000FF", "#FFFFFF", 8.59),
+    ("#FF0000", "#FFFFFF", 4.0),
+    ("#FFFFFF", "#1E293B", 14.63),
+]
+ROLES = sorted({role for pair in CONTRAST_PAIRS for role in pair[:2]})
+
+
+def colors_for(pairs):
+    """Every role gets the background except the foregrounds under test"""
+    colors = {role: [bg for _, bg, _ in pairs] for role in ROLES}
+    for fg, _, _ in CONTRAST_PAIRS:
+        colors[fg] = [fg_hex for fg_hex, _, _ in pairs]
+    return colors
+
+
+def test_python_audit_matches_wcag_ratios():
+    ratios = _audit_python(colors_for(KNOWN_RATIOS))
+    for fg, bg, _ in CONTRAST_PAIRS:
+        assert ratios[pair_name(fg, bg)] == pytest.approx([ratio for _, _, ratio in KNOWN_RATIOS], abs=0.01)
+
+
+def test_invalid_colors_have_no_ratio():
+    colors = {role: ["#FFFFFF", "not a color", ""] for role in ROLES}
+    ratios = _audit_python(colors)
+    assert ratios[pair_name("Text", "Background")] == [pytest.approx(1.0), None, None]
+
+
+def test_numpy_audit_matches_python():
+    pytest.importorskip("numpy")
+    rng = random.Random(4)
+    colors = {role: ["#%06X" % rng.randrange(1 << 24) for _ in range(500)] + ["", "bad"] for role in ROLES}
+    python, vectorized = _audit_python(colors), _audit_numpy(colors)
+    for name, values in python.items():
+        assert vectorized[name] == pytest.approx(values, abs=1e-9, nan_ok=False)
+
+
+def test_audit_is_loaded_from_disk_in_a_new_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(contrast, "AUDIT_FILE", tmp_path / "contrast.json")
+    monkeypatch.setattr(contrast, "_contrast_audit", None)
+    first = contrast.get_contrast_audit()
+    assert (tmp_path / "contrast.json").exists()
+
+    # A new process starts without the in-memory audit and must not recompute it
+    monkeypatch.setattr(contrast, "_contrast_audit", None)
+    monkeypatch.setattr(contrast, "_audit_python", None)
+    monkeypatch.setattr(contrast, "_audit_numpy", None)
+    second = contrast.get_contrast_audit()
+    assert second is not first
+    assert second.ratios == first.ratios
+
+
+def test_stale_audit_file_is_recomputed(tmp_path, monkeypatch):
+    audit_file = tmp_path / "contrast.json"
+    audit_file.write_text('{"fingerprint": "old", "ratios": {}}', encoding="utf-8")
+    monkeypatch.setattr(contrast, "AUDIT_FILE", audit_file)
+    monkeypatch.setattr(contrast, "_contrast_audit", None)
+
+    audit = contrast.get_contrast_audit()
+
+    rows = [row for row in audit.rows if row is not None]
+    assert audit.ratios == ContrastAudit(audit.rows).ratios
+    assert len(rows) > 0 and contrast.rank_palettes(rows)
+    assert "old" not in audit_file.read_text(encoding="utf-8")
+
+
+def test_report_uses_role_columns():
+    row = {role_col(role): "#FFFFFF" for role in ROLES}
+    row[role_col("Text")] = "#000000"
+    report = ContrastAudit([row]).lookup(row)
+    assert report[pair_name("Text", "Background")] == {"ratio": 21.0, "minimum": 4.5, "pass": True}
@@ -0,0 +1,66 @@
+"""The on-disk index, built with several runs and a k-way merge, must rank like the in-memory BM25 class"""
+
+import csv
+import random
+
+import pytest
+
+import disk_index
+from core import BM25, _load_csv, _search_csv, iter_sources
+from disk_index import _index_dir, build_index, search_source
+
+SOURCES = ["style", "ux", "stack:react"]
+
+
+@pytest.fixture
+def indexes(tmp_path, monkeypatch):
+    """Small indexes in tmp_path, built from many tiny runs"""
+    monkeypatch.setattr(disk_index, "INDEX_DIR", tmp_path)
+    monkeypatch.setattr(disk_index, "_open_indexes", {})
+    sources = {source: (filepath, search_cols, output_cols)
+               for source, filepath, search_cols, output_cols in iter_sources() if source in SOURCES}
+    for source, (filepath, search_cols, output_cols) in sources.items():
+        meta = build_index(filepath, search_cols, output_cols, _index_dir(source), block_postings=200)
+        assert meta["runs"] > 3
+    return sources
+
+
+def queries(filepath, search_cols, count, seed):
+    rows = _load_csv(filepath)
+    tokenizer = BM25()
+    vocabulary = sorted({token for row in rows for col in search_cols for token in tokenizer.tokenize(row.get(col, ""))})
+    rng = random.Random(seed)
+    result = [" ".join(str(row.get(col, "")).split(",")[0] for col in search_cols[:2]) for row in rows[:20]]
+    result += [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 5))) for _ in range(count)]
+    return result + ["absentword"]
+
+
+def test_disk_index_matches_in_memory_bm25(indexes):
+    for source, (filepath, search_cols, output_cols) in indexes.items():
+        for query in queries(filepath, search_cols, 60, seed=len(source)):
+            expected = _search_csv(filepath, search_cols, output_cols, query, 5, backend="bm25")
+            assert search_source(source, filepath, search_cols, output_cols, query, 5) == expected, (source, query)
+
+
+def test_built_index_is_reused(indexes):
+    source = "ux"
+    filepath, search_cols, output_cols = indexes[source]
+    meta_file = _index_dir(source) / "meta.json"
+    stamp = meta_file.stat().st_mtime_ns
+
+    search_source(source, filepath, search_cols, output_cols, "focus ring", 3)
+
+    assert meta_file.stat().st_mtime_ns == stamp
+
+
+def test_field_size_limit_is_restored(tmp_path):
+    # Start from the default limit; the cell below is larger than it
+    previous = csv.field_size_limit(131072)
+    path = tmp_path / "big.csv"
+    path.write_text("Name,Text\nbig," + "word " * 40000 + "\n", encoding="utf-8")
+    try:
+        meta = build_index(path, ["Text"], ["Name"], tmp_path / "index")
+        assert meta["n"] == 1
+        assert csv.field_size_limit() == 131072
+    finally:
+        csv.field_size_limit(previous)
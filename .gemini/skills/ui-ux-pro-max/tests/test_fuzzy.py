@@ -0,0 +1,75 @@
+"""Typo correction is opt-in, keeps the typed words and leaves words any index knows alone"""
+
+import pytest
+
+import lexicon
+from core import BM25, SEARCH_BACKENDS, search, search_stacks
+
+
+def index(*documents):
+    bm25 = BM25()
+    bm25.fit(list(documents))
+    return bm25
+
+
+def test_corrections_are_added_after_the_typed_words():
+    bm25 = index("glassmorphism card", "brutalism grid")
+    assert bm25.correct_query("glasmorphism card") == "glasmorphism card glassmorphism"
+
+
+def test_known_and_short_words_are_not_corrected():
+    bm25 = index("glassmorphism card", "brutalism grid")
+    assert bm25.correct_query("card grid") == "card grid"
+    assert bm25.correct_query("crd") == "crd"
+
+
+def test_words_known_to_another_vocabulary_are_not_corrected():
+    bm25 = index("glassmorphism card", "brutalism grid")
+    assert bm25.correct_query("glasmorphism", {"glasmorphism"}) == "glasmorphism"
+
+
+def test_fuzzy_is_off_by_default():
+    assert search("glasmorphism", "style")["count"] == 0
+    assert search("glasmorphism", "style", fuzzy=True)["count"] > 0
+
+
+@pytest.mark.parametrize("backend", SEARCH_BACKENDS)
+def test_fuzzy_works_with_every_backend(backend):
+    # The disk and SQLite indexes cannot correct words; fuzzy searches use the in-memory index
+    assert search("glasmorphism", "style", backend=backend, fuzzy=True)["count"] > 0
+
+
+def test_query_with_hits_keeps_words_known_elsewhere():
+    # "dashboard" is indexed by several domains; a hit-producing query never has it rewritten
+    assert "dashboard" in lexicon.get_lexicon()
+    plain = search("fintech dashboard", "style")
+    assert search("fintech dashboard", "style", fuzzy=True)["results"] == plain["results"]
+
+
+def test_stack_results_report_the_typed_query():
+    results = search_stacks("usestate hok", fuzzy=True)
+    assert all(result["query"] == "usestate hok" for result in results.values())
+
+
+def test_lexicon_matches_the_in_memory_deletion_index(tmp_path):
+    assert lexicon.build_lexicon(tmp_path / "lexicon.db") > 0
+    shared = lexicon.get_lexicon(tmp_path / "lexicon.db")
+    bm25 = index("glassmorphism card", "brutalism grid", "neumorphism soft shadow")
+
+    for word in ("glasmorphism", "brutalsim", "neumorphsm", "shadwo", "cadr"):
+        # Lexicon candidates are filtered by the searched index, as its own deletion index would be
+        assert bm25.suggest(word, shared.candidates(word)) == bm25.suggest(word)
+    assert "glassmorphism" in shared and "glasmorphism" not in shared
+
+
+def test_lexicon_is_rebuilt_when_an_overlay_changes(tmp_path, monkeypatch):
+    import core
+
+    monkeypatch.setattr(core, "OVERLAY_DIR", tmp_path / "overlay")
+    path = tmp_path / "lexicon.db"
+    assert "zorblaxian" not in lexicon.get_lexicon(path)
+
+    overlay = core.overlay_path(core.DATA_DIR / core.CSV_CONFIG["style"]["file"])
+    overlay.parent.mkdir(parents=True)
+    overlay.write_text("Style Category,Keywords\nZorblaxian,zorblaxian glow\n", encoding="utf-8")
+    assert "zorblaxian" in lexicon.get_lexicon(path)
@@ -0,0 +1,86 @@
+"""Quoted phrases and proximity boosting, evaluated on the positional postings"""
+
+import pytest
+
+from core import BM25, PROXIMITY_WEIGHT, PROXIMITY_WINDOW, parse_query, search
+
+
+def index(*documents):
+    bm25 = BM25()
+    bm25.fit(list(documents))
+    return bm25
+
+
+def phrase_search(bm25, query, k=10):
+    return [idx for idx, _ in bm25.search(query, k, parse_query(query))]
+
+
+def test_parse_query_extracts_quoted_phrases():
+    assert parse_query('dashboard "dark mode" "server component"') == [["dark", "mode"], ["server", "component"]]
+    assert parse_query('"a" plain') == []
+
+
+def test_phrase_must_match_consecutively_and_in_order():
+    bm25 = index("dark mode toggle", "mode dark switch", "dark theme mode", "light mode")
+
+    assert bm25.phrase_matches(["dark", "mode"]) == {0}
+    assert bm25.phrase_matches(["mode", "dark"]) == {1}
+    assert phrase_search(bm25, '"dark mode"') == [0]
+    assert phrase_search(bm25, '"mode dark"') == [1]
+    assert phrase_search(bm25, '"dark absent"') == []
+
+
+def test_every_phrase_must_match():
+    bm25 = index("dark mode server component", "dark mode client component", "server component only")
+
+    assert phrase_search(bm25, '"dark mode" "server component"') == [0]
+    # Unquoted words rank within the phrase matches
+    assert phrase_search(bm25, '"dark mode" client') == [1, 0]
+
+
+def test_phrase_index_follows_edits():
+    bm25 = index("dark mode toggle", "light theme")
+    assert bm25.phrase_matches(["dark", "mode"]) == {0}
+
+    bm25.update(1, "true dark mode")
+    bm25.remove(0)
+    assert bm25.phrase_matches(["dark", "mode"]) == {1}
+    assert bm25.add("dark mode again") == 2
+    assert bm25.phrase_matches(["dark", "mode"]) == {1, 2}
+
+
+def test_proximity_ranks_closer_terms_first():
+    # Same length and term frequencies: plain BM25 ties and the lower index wins
+    bm25 = index("alpha filler filler filler beta", "alpha beta filler filler filler")
+
+    assert [idx for idx, _ in bm25.search("alpha beta", 2)] == [0, 1]
+    assert [idx for idx, _ in bm25.search("alpha beta", 2, proximity=True)] == [1, 0]
+
+
+def test_proximity_boost_pairs_terms_adjacent_in_the_query():
+    bm25 = index("alpha beta gamma", "alpha gamma", "alpha filler filler beta")
+
+    assert bm25.proximity_boost(0, ["alpha", "beta", "gamma"]) == pytest.approx(2 * PROXIMITY_WEIGHT)
+    # beta is missing: (alpha, gamma) are not adjacent in the query and add nothing
+    assert bm25.proximity_boost(1, ["alpha", "beta", "gamma"]) == 0
+    assert bm25.proximity_boost(1, ["alpha", "gamma"]) == pytest.approx(PROXIMITY_WEIGHT)
+    # Repeated query terms count once
+    assert bm25.proximity_boost(2, ["alpha", "alpha", "beta"]) == pytest.approx(PROXIMITY_WEIGHT / 9)
+
+
+def test_proximity_window():
+    inside = " ".join(["alpha"] + ["filler"] * (PROXIMITY_WINDOW - 1) + ["beta"])
+    outside = " ".join(["alpha"] + ["filler"] * PROXIMITY_WINDOW + ["beta"])
+    bm25 = index(inside, outside)
+
+    assert bm25.proximity_boost(0, ["alpha", "beta"]) == pytest.approx(PROXIMITY_WEIGHT / PROXIMITY_WINDOW ** 2)
+    assert bm25.proximity_boost(1, ["alpha", "beta"]) == 0
+
+
+def test_search_with_phrase_on_shipped_data():
+    tokenizer = BM25()
+    result = search('"dark mode"', "style", max_results=5)
+    assert result["count"] > 0
+    for row in result["results"]:
+        tokens = tokenizer.tokenize(" ".join(row.values()))
+        assert any(tokens[i:i + 2] == ["dark", "mode"] for i in range(len(tokens) - 1))
@@ -0,0 +1,35 @@
+"""The SQLite backend must return the same top-k as the in-memory BM25 index"""
+
+import random
+
+import pytest
+
+from core import BM25, _load_csv, _search_csv, iter_sources
+from sqlite_backend import build_database, check_parity, fts5_available, search_source
+
+pytestmark = pytest.mark.skipif(not fts5_available(), reason="SQLite FTS5 is not available")
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    return build_database(tmp_path_factory.mktemp("sqlite") / "guidelines.db")
+
+
+def test_parity_on_sample_queries(db_path):
+    report = check_parity(3, db_path)
+    assert report["queries"] > 0
+    assert report["mismatches"] == []
+
+
+def test_parity_on_random_queries(db_path):
+    rng = random.Random(41)
+    tokenizer = BM25()
+    for source, filepath, search_cols, output_cols in iter_sources():
+        if not filepath.exists():
+            continue
+        vocab = sorted({token for row in _load_csv(filepath) for col in search_cols
+                        for token in tokenizer.tokenize(str(row.get(col, "")))})
+        for _ in range(30):
+            query = " ".join(rng.choices(vocab, k=rng.randint(1, 6)))
+            expected = _search_csv(filepath, search_cols, output_cols, query, 3, backend="bm25", fuzzy=False)
+            assert search_source(source, query, 3, output_cols, db_path) == expected, (source, query)
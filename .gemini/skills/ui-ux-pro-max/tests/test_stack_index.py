@@ -0,0 +1,86 @@
+"""search_stacks (one combined index) must match search_stack for every stack, also after overlay edits"""
+
+import random
+
+import pytest
+
+import core
+from core import (AVAILABLE_STACKS, BM25, DATA_DIR, STACK_CONFIG, StackIndex, _load_csv, get_index, get_stack_index,
+                  search_stack, search_stacks)
+
+
+def stack_queries(count, seed):
+    """Random queries over the words of every stack, plus a few absent ones"""
+    rng = random.Random(seed)
+    tokenizer = BM25()
+    words = set()
+    for config in STACK_CONFIG.values():
+        for row in _load_csv(DATA_DIR / config["file"]):
+            words.update(tokenizer.tokenize(" ".join(row.get(col, "") for col in core._STACK_COLS["search_cols"])))
+    vocabulary = sorted(words) + ["absentword"]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))) for _ in range(count)]
+
+
+def assert_parity(queries, max_results=5):
+    """Same rows as search_stack, and the same scores as each stack's own BM25 index"""
+    for query in queries:
+        combined = search_stacks(query, max_results=max_results, backend="bm25")
+        scores = get_stack_index().search(query, AVAILABLE_STACKS, max_results)
+        for stack in AVAILABLE_STACKS:
+            expected = search_stack(query, stack, max_results, backend="bm25")
+            assert combined[stack]["results"] == expected["results"], (stack, query)
+            own = get_index(DATA_DIR / STACK_CONFIG[stack]["file"], core._STACK_COLS["search_cols"]).bm25
+            assert [score for _, score in scores[stack]] == pytest.approx(
+                [score for _, score in own.top_k(query, max_results)]), (stack, query)
+
+
+def test_search_stacks_matches_search_stack():
+    assert_parity(stack_queries(150, seed=1))
+
+
+@pytest.fixture
+def overlay_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "OVERLAY_DIR", tmp_path)
+    (tmp_path / "stacks").mkdir()
+    yield tmp_path
+    # The next lookup drops the overlay again (the monkeypatch is undone first)
+
+
+def write_overlay(overlay_dir, stack, rows):
+    path = overlay_dir / "stacks" / f"{stack}.csv"
+    header = ["No", "Category", "Guideline", "Description", "Do", "Don't", "_action"]
+    lines = [",".join(header)] + [",".join(row.get(col, "") for col in header) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_overlay_edits_are_applied_in_place(overlay_dir, monkeypatch):
+    index = get_stack_index()
+    built = []
+    monkeypatch.setattr(StackIndex, "_attach", lambda *args: built.append(args))
+    before = len(index.bm25.corpus)
+
+    react = {"No": "1", "Category": "State", "Guideline": "Zorblax state hook", "Description": "zorblax useState"}
+    added = {"No": "999", "Category": "Zorblax", "Guideline": "Quuxify renders", "Description": "quuxify everything"}
+    write_overlay(overlay_dir, "react", [react, added, {"No": "2", "_action": "delete"}])
+    assert get_stack_index() is index
+    assert_parity(["zorblax state", "quuxify renders", "lift state ancestor", "usestate hook"])
+    # One updated document reuses its slot, one is added; nothing else is re-tokenized
+    assert len(index.bm25.corpus) == before + 1
+    assert search_stacks("quuxify", ["react"])["react"]["count"] == 1
+
+    write_overlay(overlay_dir, "svelte", [{"No": "999", "Category": "Zorblax", "Guideline": "Quuxify renders",
+                                          "Description": "quuxify everything"}])
+    write_overlay(overlay_dir, "react", [react])
+    assert get_stack_index() is index
+    assert_parity(["zorblax state", "quuxify renders", "lift state ancestor", "usestate hook"])
+    assert search_stacks("quuxify", ["react"])["react"]["count"] == 0
+    assert search_stacks("quuxify", ["svelte"])["svelte"]["count"] == 1
+    assert built == []
+
+    # Dropping the overlays restores the shipped rows
+    (overlay_dir / "stacks" / "react.csv").unlink()
+    (overlay_dir / "stacks" / "svelte.csv").unlink()
+    get_stack_index()
+    assert len(index.bm25.corpus) == before + 1
+    assert_parity(stack_queries(40, seed=2))
+    assert search_stacks("zorblax quuxify")["react"]["count"] == 0
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 站点数据构建脚本
+将 skills.json 拆分为前端按需加载的数据文件：
+  - skills-index.<hash>.json   列表页清单（仅 id / 名称 / 描述 / 分类 / 来源）
+  - skills/<id>.<hash>.json    单个技能的详情分片（含 body / body_zh）
+  - search-index.<hash>.json   预构建的倒排索引，列表页搜索无需扫描全文（与 BM25 索引同一分词）
+  - skills-bm25.<hash>.json    中英双语 BM25 索引（中日韩文字按二元组切分，见 skills_search.py）
+  - manifest.json              固定文件名的指针清单，指向上述带哈希的文件
+
+带哈希的文件内容不变则文件名不变，浏览器可长期缓存，每次只需重新验证 manifest.json。
+每个数据文件同时输出 .gz 和 .br 预压缩版本，供支持预压缩静态资源的服务器/CDN 直接使用
+（.br 需要安装 brotli，未安装时跳过）。
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from skills_search import INDEX_NAME as BM25_INDEX_NAME, build_index as build_bm25_index, tokenize
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATA_DIR = Path(__file__).parent.parent / "public" / "data"
+INPUT_FILE = DATA_DIR / "skills.json"
+
+MANIFEST_FILE = DATA_DIR / "manifest.json"
+SHARD_DIR = DATA_DIR / "skills"
+
+# 逻辑名称 -> 输出文件名前缀
+LIST_NAME = "skills-index"
+SEARCH_INDEX_NAME = "search-index"
+
+HASH_LENGTH = 10
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+# 列表页需要的字段（SkillCard 只用到这些）
+LIST_FIELDS = ["id", "name", "name_zh", "description", "description_zh", "category", "category_zh", "source"]
+
+# 参与搜索的字段，与列表页原先的过滤逻辑保持一致
+SEARCH_FIELDS = ["name", "name_zh", "description", "description_zh"]
+
+
+def dedupe_skills(skills: list) -> list:
+    """按 id 去重，保留第一个出现的（与前端原有行为一致）"""
+    seen = set()
+    unique = []
+    for skill in skills:
+        skill_id = skill.get("id")
+        if skill_id in seen:
+            continue
+        seen.add(skill_id)
+        unique.append(skill)
+    return unique
+
+
+def build_list_manifest(skills: list) -> list:
+    """列表页清单：去掉正文等大字段"""
+    return [{k: skill[k] for k in LIST_FIELDS if skill.get(k)} for skill in skills]
+
+
+def build_search_index(skills: list) -> dict:
+    """
+    构建倒排索引，分词与 BM25 索引相同（skills_search.tokenize，中日韩文字为二元组）
+    tokens[i] 为排序后的词表，postings[i] 为包含该词的技能在列表清单中的下标
+    前端 searchSkills 对查询按同样规则切分后逐词做子串匹配
+    """
+    postings = {}
+    for doc_id, skill in enumerate(skills):
+        for field in SEARCH_FIELDS:
+            for token in tokenize(skill.get(field, "")):
+                doc_ids = postings.setdefault(token, [])
+                if not doc_ids or doc_ids[-1] != doc_id:
+                    doc_ids.append(doc_id)
+
+    tokens = sorted(postings)
+    return {
+        "fields": SEARCH_FIELDS,
+        "tokens": tokens,
+        "postings": [postings[t] for t in tokens],
+    }
+
+
+def encode_json(data) -> bytes:
+    """紧凑序列化，去掉缩进和多余空白"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def write_hashed(directory: Path, stem: str, data) -> Path:
+    """
+    以内容哈希命名写出 JSON，并写出预压缩版本
+    返回未压缩文件的路径
+    """
+    payload = encode_json(data)
+    path = directory / f"{stem}.{content_hash(payload)}.json"
+    path.write_bytes(payload)
+    # mtime 固定为 0，保证相同内容生成的 .gz 字节一致
+    with open(path.with_name(path.name + ".gz"), "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+            gz.write(payload)
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(payload, quality=11))
+    return path
+
+
+def remove_stale(directory: Path, pattern: str, keep: set):
+    """删除本次构建未生成的旧哈希文件（含其压缩版本）"""
+    for path in directory.glob(pattern):
+        base = path
+        for suffix in COMPRESSED_SUFFIXES:
+            if path.name.endswith(suffix):
+                base = path.with_name(path.name[:-len(suffix)])
+        if base not in keep:
+            path.unlink()
+
+
+def build(skills: list) -> dict:
+    """写出全部站点数据文件，返回各文件大小统计"""
+    skills = dedupe_skills(skills)
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+
+    # 先写分片，列表清单中记录每个技能对应的分片文件名
+    shard_paths = set()
+    shard_bytes = 0
+    entries = build_list_manifest(skills)
+    for skill, entry in zip(skills, entries):
+        path = write_hashed(SHARD_DIR, skill["id"], skill)
+        shard_paths.add(path)
+        shard_bytes += path.stat().st_size
+        entry["shard"] = path.relative_to(DATA_DIR).as_posix()
+
+    list_path = write_hashed(DATA_DIR, LIST_NAME, entries)
+    search_path = write_hashed(DATA_DIR, SEARCH_INDEX_NAME, build_search_index(skills))
+    bm25_path = write_hashed(DATA_DIR, BM25_INDEX_NAME, build_bm25_index(skills))
+
+    # 指针清单：固定文件名、体积很小，客户端每次只需重新验证它
+    with open(MANIFEST_FILE, "wb") as f:
+        f.write(encode_json({
+            "files": {
+                LIST_NAME: list_path.name,
+                SEARCH_INDEX_NAME: search_path.name,
+                BM25_INDEX_NAME: bm25_path.name,
+            },
+        }))
+
+    remove_stale(DATA_DIR, f"{LIST_NAME}.*", {list_path})
+    remove_stale(DATA_DIR, f"{SEARCH_INDEX_NAME}.*", {search_path})
+    remove_stale(DATA_DIR, f"{BM25_INDEX_NAME}.*", {bm25_path})
+    remove_stale(SHARD_DIR, "*", shard_paths)
+
+    return {
+        "skills": len(skills),
+        "list_file": list_path,
+        "search_index_file": search_path,
+        "list_bytes": list_path.stat().st_size,
+        "search_index_bytes": search_path.stat().st_size,
+        "bm25_index_file": bm25_path,
+        "bm25_index_bytes": bm25_path.stat().st_size,
+        "shard_bytes": shard_bytes,
+    }
+
+
+def compressed_size(path: Path, suffix: str) -> str:
+    compressed = path.with_name(path.name + suffix)
+    return f"{compressed.stat().st_size / 1024:.1f} KB" if compressed.exists() else "-"
+
+
+def main():
+    print("Oh My Skills - 构建站点数据\n")
+
+    if not INPUT_FILE.exists():
+        print(f"❌ 找不到输入文件: {INPUT_FILE}")
+        return
+
+    with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        skills = json.load(f)
+
+    stats = build(skills)
+    full_bytes = INPUT_FILE.stat().st_size
+    first_paint = stats["list_bytes"] + stats["search_index_bytes"]
+
+    print(f"✅ 完成！共 {stats['skills']} 个技能")
+    for label, path, size in (
+        ("列表清单", stats["list_file"], stats["list_bytes"]),
+        ("搜索索引", stats["search_index_file"], stats["search_index_bytes"]),
+        ("双语索引", stats["bm25_index_file"], stats["bm25_index_bytes"]),
+    ):
+        print(f"   {label}: {path.name} ({size / 1024:.1f} KB, "
+              f"gzip {compressed_size(path, '.gz')}, brotli {compressed_size(path, '.br')})")
+    print(f"   详情分片: {SHARD_DIR.name}/ ({stats['shard_bytes'] / 1024:.1f} KB)")
+    print(f"   指针清单: {MANIFEST_FILE.name} ({MANIFEST_FILE.stat().st_size} B)")
+    if brotli is None:
+        print("   ⚠️ 未安装 brotli，跳过 .br 预压缩 (pip install brotli)")
+    print(f"   列表页首屏 {first_paint / 1024:.1f} KB，原 skills.json {full_bytes / 1024:.1f} KB "
+          f"({first_paint / full_bytes:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 多端点健康度调度
+  - EndpointHealth: 每个端点的延迟 EWMA、错误率 EWMA 和熔断器（连续失败后熔断，冷却后半开试探）
+  - EndpointPool: 按健康度排序选择端点，跳过熔断中的端点；
+    可选对冲请求：首选端点超过 hedge_after 秒未返回时，同时向次优端点发出请求，取先成功的结果
+
+用法（本地桩服务演示：一个拒绝连接、一个总是 503、一个很慢、一个正常）：
+    python3 scripts/endpoint_pool.py --demo --segments 40
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class EndpointHealth:
+    """
+    单个端点的健康状态（线程安全）
+    连续失败 failure_threshold 次后熔断 cooldown 秒；冷却结束进入半开状态，
+    成功一次即恢复，失败则再次熔断且冷却时间加倍（不超过 max_cooldown）
+    """
+
+    def __init__(self, endpoint: str, failure_threshold: int = 3, cooldown: float = 10.0,
+                 max_cooldown: float = 300.0, alpha: float = 0.3):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.alpha = alpha
+        self.latency = None       # 成功请求的延迟 EWMA（秒），None 表示尚无数据
+        self.error_rate = 0.0     # 失败率 EWMA
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.consecutive_failures < self.failure_threshold:
+            return CLOSED
+        return OPEN if time.monotonic() < self.opened_until else HALF_OPEN
+
+    def available(self) -> bool:
+        return self.state != OPEN
+
+    def score(self) -> float:
+        """越小越好：延迟按错误率加权；没有数据的端点得 0 分，优先试探"""
+        latency = self.latency or 0.0
+        return latency * (1 + 4 * self.error_rate) + self.error_rate
+
+    def record_success(self, latency: float):
+        with self.lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+            self.latency = latency if self.latency is None else (
+                self.alpha * latency + (1 - self.alpha) * self.latency)
+            self.error_rate *= 1 - self.alpha
+
+    def record_failure(self):
+        with self.lock:
+            half_open = self.state == HALF_OPEN
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+            if half_open:
+                # 半开试探失败：重新熔断，冷却加倍
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_until = time.monotonic() + self.cooldown
+
+    def snapshot(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "state": self.state,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+class EndpointPool:
+    """
+    按健康度调度一组端点
+    call(fn) 依次尝试健康度最好的端点，fn(endpoint) 返回结果，抛异常或返回空值视为失败；
+    hedge_after 不为 None 时启用对冲请求，从首选请求真正开始执行时计时：
+    并发调用超过 workers 时请求会在线程池里排队，排队时间不触发对冲
+    """
+
+    def __init__(self, endpoints: list, hedge_after: float = None, workers: int = 8, **health_options):
+        self.health = {endpoint: EndpointHealth(endpoint, **health_options) for endpoint in endpoints}
+        self.hedge_after = hedge_after
+        self.hedges = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers) if hedge_after is not None else None
+
+    def ranked(self) -> list:
+        """可用端点按分数从好到差排序（熔断中的端点不参与）"""
+        candidates = [h for h in self.health.values() if h.available()]
+        return [h.endpoint for h in sorted(candidates, key=lambda h: h.score())]
+
+    def _attempt(self, fn, endpoint: str) -> tuple:
+        health = self.health[endpoint]
+        start = time.monotonic()
+        try:
+            result = fn(endpoint)
+        except Exception as e:
+            health.record_failure()
+            return False, e
+        if not result:
+            health.record_failure()
+            return False, None
+        health.record_success(time.monotonic() - start)
+        return True, result
+
+    def call(self, fn):
+        """返回第一个成功的结果；所有可用端点都失败时返回 None"""
+        ranked = self.ranked()
+        i = 0
+        while i < len(ranked):
+            if self.executor is None or i + 1 >= len(ranked):
+                ok, result = self._attempt(fn, ranked[i])
+                if ok:
+                    return result
+                i += 1
+                continue
+
+            ok, result, used = self._hedged(fn, ranked[i], ranked[i + 1])
+            if ok:
+                return result
+            i += used
+        return None
+
+    def _hedged(self, fn, primary: str, backup: str) -> tuple:
+        """首选端点超时未返回时向次优端点发出对冲请求；返回 (成功, 结果, 用掉的端点数)"""
+        started = threading.Event()
+
+        def attempt_primary():
+            started.set()
+            return self._attempt(fn, primary)
+
+        futures = {self.executor.submit(attempt_primary)}
+        started.wait()
+        done, _ = wait(futures, timeout=self.hedge_after)
+        if not done:
+            self.hedges += 1
+            futures.add(self.executor.submit(self._attempt, fn, backup))
+        pending = futures
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ok, result = future.result()
+                if ok:
+                    # 另一个请求仍在进行，结果由其自行记入健康度
+                    return True, result, len(futures)
+        return False, None, len(futures)
+
+    def snapshot(self) -> list:
+        return [h.snapshot() for h in self.health.values()]
+
+
+def demo(segments: int, hedge_after: float):
+    from translate_pool import RetryableError
+    from translate_stub_server import post_translate, start_stub_server
+
+    servers = []
+    endpoints = ["http://127.0.0.1:9/translate"]  # 拒绝连接
+    for latency, error_rate in ((0.05, 1.0), (0.6, 0.0), (0.05, 0.0)):
+        server, endpoint = start_stub_server(latency=latency, error_rate=error_rate)
+        servers.append(server)
+        endpoints.append(endpoint)
+    texts = [f"Segment {i} of the health demo." for i in range(segments)]
+
+    # 原方式：每个片段都按固定顺序轮询端点
+    start = time.monotonic()
+    for text in texts:
+        for endpoint in endpoints:
+            try:
+                if post_translate(endpoint, text, timeout=2):
+                    break
+            except (RetryableError, OSError):
+                continue
+    fixed = time.monotonic() - start
+
+    pool = EndpointPool(endpoints, hedge_after=hedge_after)
+    start = time.monotonic()
+    for text in texts:
+        pool.call(lambda endpoint: post_translate(endpoint, text, timeout=2))
+    scheduled = time.monotonic() - start
+
+    for server in servers:
+        server.shutdown()
+    print(f"片段数: {segments}，端点: 拒绝连接 / 总是 503 / 慢 (0.6s) / 正常 (0.05s)")
+    print(f"   固定顺序轮询: {fixed:.2f}s")
+    print(f"   健康度调度{'+对冲' if hedge_after is not None else ''}: {scheduled:.2f}s，对冲次数: {pool.hedges}")
+    for item in pool.snapshot():
+        print(f"   {item}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多端点健康度调度")
+    parser.add_argument("--demo", action="store_true", help="用本地桩服务对比固定顺序与健康度调度")
+    parser.add_argument("--segments", type=int, default=40)
+    parser.add_argument("--hedge-after", type=float, default=0.2, help="对冲请求的等待阈值（秒），负数关闭")
+    args = parser.parse_args()
+
+    if args.demo:
+        demo(args.segments, args.hedge_after if args.hedge_after >= 0 else None)
+        return
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 预编译术语表引擎
+把短语映射一次性编译成 Aho-Corasick 自动机，单次扫描找出全部候选匹配，
+再按原有“长短语优先、逐个 str.replace”的语义裁决，一次拼出结果。
+
+原实现每翻译一行都要重新排序短语表，并对每个短语做三次整行 replace；
+这里的结果与原实现逐字一致（可用 --verify 在 skills_raw.json 上校验）。
+
+用法：
+    python3 scripts/glossary.py --verify
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from pathlib import Path
+
+
+def _common_affix(a: str, b: str) -> tuple:
+    """a、b 的公共前缀、后缀长度（替换前后保持不变的字符，如 " using " -> " 使用 " 两侧的空格）"""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+class Glossary:
+    """
+    编译后的短语表
+
+    translations: {英文短语: 中文}
+    min_length:   只替换长度大于 min_length - 1 的短语（原实现为 len > 3）
+    word_boundary: 为 True 时只接受前后都不是字母数字的匹配，避免替换单词的一部分
+    """
+
+    def __init__(self, translations: dict, min_length: int = 4, word_boundary: bool = False):
+        self.word_boundary = word_boundary
+
+        # 替换顺序：短语按长度降序（同长度保持原顺序），每个短语依次尝试原样、小写、首字母大写
+        phrases = sorted(translations.items(), key=lambda x: len(x[0]), reverse=True)
+        self.passes = []
+        patterns = {}
+        for en, zh in phrases:
+            if len(en) < min_length:
+                continue
+            for variant in (en, en.lower(), en.capitalize()):
+                prefix, suffix = _common_affix(variant, zh)
+                pattern_id = patterns.setdefault(variant, len(patterns))
+                self.passes.append((pattern_id, len(variant), zh[prefix:len(zh) - suffix], prefix, suffix))
+
+        self.patterns = list(patterns)
+        self._build_automaton()
+
+    # ---------- Aho-Corasick ----------
+    def _build_automaton(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state].append(pattern_id)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def find_all(self, text: str) -> dict:
+        """扫描一次，返回 {pattern_id: [起始位置, ...]}（含重叠匹配，位置升序）"""
+        goto, fail, output = self.goto, self.fail, self.output
+        hits = {}
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in output[state]:
+                hits.setdefault(pattern_id, []).append(i + 1 - len(self.patterns[pattern_id]))
+        return hits
+
+    def _at_boundary(self, text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not before.isalnum() and not after.isalnum()
+
+    # ---------- 翻译 ----------
+    def translate(self, text: str) -> str:
+        """翻译一段文本（可含多行，短语不跨行）"""
+        if not text:
+            return ""
+        hits = self.find_all(text)
+        if not hits:
+            return text
+
+        # 已被替换的字符（不含替换前后不变的两侧字符），后续匹配不得与之重叠
+        replaced = bytearray(len(text))
+        accepted = []
+        for pattern_id, length, core, prefix, suffix in self.passes:
+            starts = hits.get(pattern_id)
+            if not starts:
+                continue
+            # 模拟 str.replace：从左到右、同一轮内互不重叠
+            scan_from = 0
+            for start in starts:
+                end = start + length
+                if start < scan_from or any(replaced[start:end]):
+                    continue
+                if self.word_boundary and not self._at_boundary(text, start, end):
+                    continue
+                core_start, core_end = start + prefix, end - suffix
+                replaced[core_start:core_end] = b"\x01" * (core_end - core_start)
+                accepted.append((core_start, core_end, core))
+                scan_from = end
+
+        if not accepted:
+            return text
+        accepted.sort()
+        parts = []
+        pos = 0
+        for core_start, core_end, core in accepted:
+            parts.append(text[pos:core_start])
+            parts.append(core)
+            pos = core_end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def translate_lines(self, lines: list) -> list:
+        """批量翻译多行：合并成一次扫描，再拆回各行"""
+        if not lines:
+            return []
+        return self.translate("\n".join(lines)).split("\n")
+
+
+def legacy_translate(text: str, translations: dict) -> str:
+    """原 translate_text_smart 的替换逻辑，作为 --verify 的参照"""
+    if not text:
+        return ""
+    result = text
+    for en, zh in sorted(translations.items(), key=lambda x: len(x[0]), reverse=True):
+        if len(en) > 3:
+            result = result.replace(en, zh)
+            result = result.replace(en.lower(), zh)
+            result = result.replace(en.capitalize(), zh)
+    return result
+
+
+def verify(input_file: Path) -> bool:
+    """在技能数据上逐行对比编译版与原实现的输出和耗时"""
+    from translate_skills import PHRASE_TRANSLATIONS
+
+    with open(input_file, "r", encoding="utf-8") as f:
+        skills = json.load(f)
+    lines = []
+    for skill in skills:
+        lines.append(skill.get("description", ""))
+        lines.extend(skill.get("body", "").split("\n"))
+
+    start = time.perf_counter()
+    expected = [legacy_translate(line, PHRASE_TRANSLATIONS) for line in lines]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    glossary = Glossary(PHRASE_TRANSLATIONS)
+    actual = [glossary.translate(line) for line in lines]
+    compiled_time = time.perf_counter() - start
+
+    mismatches = [(e, a) for e, a in zip(expected, actual) if e != a]
+    print(f"行数: {len(lines)}，不一致: {len(mismatches)}")
+    print(f"   原实现: {legacy_time:.3f}s，编译版: {compiled_time:.3f}s")
+    for e, a in mismatches[:5]:
+        print(f"   期望: {e!r}\n   实际: {a!r}")
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="预编译术语表引擎")
+    parser.add_argument("--verify", action="store_true", help="在 skills_raw.json 上与原实现逐行对比")
+    parser.add_argument("--input", type=Path,
+                        default=Path(__file__).parent.parent / "public" / "data" / "skills_raw.json")
+    args = parser.parse_args()
+
+    if args.verify:
+        raise SystemExit(0 if verify(args.input) else 1)
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - Markdown 分段器
+各翻译脚本共用：逐行扫描一次，把正文切成带类型的片段，翻译后一次 join 拼回。
+
+片段类型：
+  code       围栏代码块（```...```），原样保留
+  raw        空行、分隔线等纯符号行，原样保留
+  header     标题，prefix 为 "## " 等标记
+  list       列表项，prefix 为 "- " / "1. " 等标记
+  paragraph  普通文本行
+
+header / list / paragraph 的 text 中，行内代码已替换为 __INLINE_CODE_n__ 占位符
+（编号在片段内从 0 开始），原文保存在 codes 中，渲染时只在本片段内还原。
+
+translate_segments 还可以把连续的段落行合并为一个翻译单元，减少请求次数，
+译文再按行拆回原有结构。
+"""
+
+import re
+from collections import namedtuple
+
+Segment = namedtuple("Segment", ["kind", "prefix", "text", "suffix", "codes"])
+
+TRANSLATABLE_KINDS = ("header", "list", "paragraph")
+
+FENCE = "```"
+RAW_LINE_PATTERN = re.compile(r'^[-=*_#\s]*$')
+HEADER_PATTERN = re.compile(r'^(\s*#+\s+)(.*?)(\s*)$')
+LIST_PATTERN = re.compile(r'^(\s*(?:[-*]|\d+\.)\s+)(.*?)(\s*)$')
+PARAGRAPH_PATTERN = re.compile(r'^(\s*)(.*?)(\s*)$')
+INLINE_CODE_PATTERN = re.compile(r'`[^`\n]+`')
+PLACEHOLDER_PATTERN = re.compile(r'__INLINE_CODE_(\d+)__')
+
+
+def _protect_inline_code(text: str) -> tuple:
+    codes = []
+
+    def save(match):
+        codes.append(match.group(0))
+        return f"__INLINE_CODE_{len(codes) - 1}__"
+
+    return INLINE_CODE_PATTERN.sub(save, text), tuple(codes)
+
+
+def _line_segment(line: str) -> Segment:
+    if RAW_LINE_PATTERN.match(line):
+        return Segment("raw", "", line, "", ())
+    for kind, pattern in (("header", HEADER_PATTERN), ("list", LIST_PATTERN), ("paragraph", PARAGRAPH_PATTERN)):
+        match = pattern.match(line)
+        if match:
+            text, codes = _protect_inline_code(match.group(2))
+            return Segment(kind, match.group(1), text, match.group(3), codes)
+
+
+def segment_markdown(body: str) -> list:
+    """把 Markdown 正文切分为片段列表；"\n".join(render(s) for s in 片段) 可还原原文"""
+    if not body:
+        return []
+    segments = []
+    code_lines = []
+    in_fence = False
+    for line in body.split("\n"):
+        # 与原先的 ```[\s\S]*?``` 一样按出现顺序两两配对；
+        # 含 ``` 的行以及围栏内部的行都归入代码块
+        fences = line.count(FENCE)
+        if in_fence or fences:
+            code_lines.append(line)
+            in_fence = in_fence != (fences % 2 == 1)
+            continue
+        if code_lines:
+            segments.append(Segment("code", "", "\n".join(code_lines), "", ()))
+            code_lines = []
+        segments.append(_line_segment(line))
+
+    # 未闭合的围栏一直延续到正文结尾
+    if code_lines:
+        segments.append(Segment("code", "", "\n".join(code_lines), "", ()))
+    return segments
+
+
+def is_translatable(segment: Segment) -> bool:
+    return segment.kind in TRANSLATABLE_KINDS and bool(segment.text)
+
+
+def translatable_texts(segments: list) -> list:
+    """按顺序取出需要翻译的文本"""
+    return [s.text for s in segments if is_translatable(s)]
+
+
+def restore_inline_code(text: str, codes: tuple) -> str:
+    """还原本片段内的行内代码占位符"""
+    if not codes:
+        return text
+    return PLACEHOLDER_PATTERN.sub(
+        lambda m: codes[int(m.group(1))] if int(m.group(1)) < len(codes) else m.group(0), text)
+
+
+def render(segment: Segment, translated: str = None) -> str:
+    """渲染单个片段；translated 为 text 的译文（None 表示用原文）"""
+    text = segment.text if translated is None else translated
+    return segment.prefix + restore_inline_code(text, segment.codes) + segment.suffix
+
+
+def reassemble(segments: list, translations: list) -> str:
+    """translations 与 translatable_texts(segments) 一一对应，拼回完整正文"""
+    it = iter(translations)
+    return "\n".join(render(s, next(it)) if is_translatable(s) else render(s) for s in segments)
+
+
+# ==========================================
+# 段落合并
+# ==========================================
+# 表格行、引用行不参与合并，避免翻译服务改动其中的符号
+UNMERGEABLE_PREFIXES = ("|", ">")
+
+
+def _mergeable(segment: Segment) -> bool:
+    return segment.kind == "paragraph" and not segment.text.startswith(UNMERGEABLE_PREFIXES)
+
+
+def translation_units(segments: list, merge_paragraphs: bool = True) -> list:
+    """
+    把可翻译片段分组为翻译单元，返回片段下标列表的列表
+    merge_paragraphs 为 True 时，连续的段落行合并为一个单元（一次翻译）；
+    标题、列表项等其余片段各自成为一个单元
+    """
+    units = []
+    current = []
+    for idx, segment in enumerate(segments):
+        if merge_paragraphs and is_translatable(segment) and _mergeable(segment):
+            current.append(idx)
+            continue
+        if current:
+            units.append(current)
+            current = []
+        if is_translatable(segment):
+            units.append([idx])
+    if current:
+        units.append(current)
+    return units
+
+
+def _code_offsets(segments: list, unit: list) -> list:
+    offsets = []
+    total = 0
+    for idx in unit:
+        offsets.append(total)
+        total += len(segments[idx].codes)
+    return offsets
+
+
+def unit_text(segments: list, unit: list) -> str:
+    """单元的待翻译文本：各行用换行连接，行内代码占位符在单元内统一编号"""
+    if len(unit) == 1:
+        return segments[unit[0]].text
+    lines = []
+    for idx, offset in zip(unit, _code_offsets(segments, unit)):
+        lines.append(PLACEHOLDER_PATTERN.sub(
+            lambda m: f"__INLINE_CODE_{int(m.group(1)) + offset}__", segments[idx].text))
+    return "\n".join(lines)
+
+
+def split_unit(segments: list, unit: list, translated: str):
+    """
+    把单元译文拆回各行（占位符恢复为行内编号）
+    行数对不上或占位符跑到了别的行时返回 None，由调用方逐行重译
+    """
+    if len(unit) == 1:
+        return [translated]
+    lines = translated.split("\n")
+    if len(lines) != len(unit):
+        return None
+    parts = []
+    for idx, offset, line in zip(unit, _code_offsets(segments, unit), lines):
+        count = len(segments[idx].codes)
+        numbers = [int(n) for n in PLACEHOLDER_PATTERN.findall(line)]
+        if any(not offset <= n < offset + count for n in numbers):
+            return None
+        parts.append(PLACEHOLDER_PATTERN.sub(
+            lambda m: f"__INLINE_CODE_{int(m.group(1)) - offset}__", line).strip())
+    return parts
+
+
+def translate_segments(segments: list, translate_many, merge_paragraphs: bool = True) -> str:
+    """
+    按翻译单元翻译并拼回正文
+    translate_many(texts) 返回与 texts 一一对应的译文；
+    合并段落的译文无法对齐回原有行结构时，该单元退回逐行翻译
+    """
+    units = translation_units(segments, merge_paragraphs)
+    translated = translate_many([unit_text(segments, unit) for unit in units])
+
+    per_segment = {}
+    retry = []
+    for unit, text in zip(units, translated):
+        parts = split_unit(segments, unit, text)
+        if parts is None:
+            retry.extend(unit)
+        else:
+            per_segment.update(zip(unit, parts))
+    if retry:
+        per_segment.update(zip(retry, translate_many([segments[idx].text for idx in retry])))
+
+    return "\n".join(
+        render(segment, per_segment[idx]) if idx in per_segment else render(segment)
+        for idx, segment in enumerate(segments)
+    )
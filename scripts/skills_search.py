@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 中英双语技能检索
+分词时英文按单词切分，中日韩文字按相邻两字切成二元组（单字片段保留单字），
+中文标题、描述不再整句成为一个词，中英混合查询也能命中。
+在此分词上对技能清单建 BM25 索引；build_site_data.py 会把索引写成
+skills-bm25.<hash>.json 并登记到 manifest.json。
+
+用法：
+    python3 scripts/skills_search.py "设计 react"            # 读取已生成的索引文件检索
+    python3 scripts/skills_search.py "算法艺术" --body -n 5   # 临时建索引，正文也参与检索
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+from math import log
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "public" / "data"
+INPUT_FILE = DATA_DIR / "skills.json"
+MANIFEST_FILE = DATA_DIR / "manifest.json"
+INDEX_NAME = "skills-bm25"
+
+# 参与检索的字段：列表页搜索字段加上分类
+INDEX_FIELDS = ["name", "name_zh", "description", "description_zh", "category", "category_zh"]
+BODY_FIELDS = ["body", "body_zh"]
+
+K1 = 1.5
+B = 0.75
+
+# 中日韩统一表意文字（含扩展 A、兼容区）、日文假名、韩文音节
+CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+TOKEN_PATTERN = re.compile(rf"[{CJK_CHARS}]+|(?:(?![{CJK_CHARS}])\w)+")
+CJK_RUN = re.compile(rf"[{CJK_CHARS}]+")
+
+
+def tokenize(text: str) -> list:
+    """小写化；英文等按单词切分，连续的中日韩文字切成相邻二元组"""
+    tokens = []
+    for run in TOKEN_PATTERN.findall(str(text or "").lower()):
+        if CJK_RUN.fullmatch(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_index(skills: list, fields: list = INDEX_FIELDS) -> dict:
+    """
+    BM25 倒排索引，文档顺序与传入的技能列表一致
+    postings[i] 为词 tokens[i] 的 [文档下标, 词频, 文档下标, 词频, ...]
+    """
+    postings = {}
+    lengths = []
+    for doc_id, skill in enumerate(skills):
+        tokens = tokenize(" ".join(str(skill.get(field) or "") for field in fields))
+        lengths.append(len(tokens))
+        for token, tf in Counter(tokens).items():
+            postings.setdefault(token, []).extend((doc_id, tf))
+
+    tokens = sorted(postings)
+    return {
+        "fields": fields,
+        "k1": K1,
+        "b": B,
+        "ids": [skill.get("id") for skill in skills],
+        "lengths": lengths,
+        "avgdl": sum(lengths) / len(lengths) if lengths else 0,
+        "tokens": tokens,
+        "postings": [postings[t] for t in tokens],
+    }
+
+
+class SkillSearcher:
+    """在索引上做 BM25 检索"""
+
+    def __init__(self, index: dict):
+        self.index = index
+        self.lookup = {token: i for i, token in enumerate(index["tokens"])}
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """返回 [(技能 id, 得分), ...]，按得分降序，同分按清单顺序"""
+        index = self.index
+        k1, b, avgdl = index["k1"], index["b"], index["avgdl"]
+        n = len(index["ids"])
+        scores = {}
+        for token in tokenize(query):
+            i = self.lookup.get(token)
+            if i is None:
+                continue
+            postings = index["postings"][i]
+            df = len(postings) // 2
+            idf = log((n - df + 0.5) / (df + 0.5) + 1)
+            for doc_id, tf in zip(postings[0::2], postings[1::2]):
+                denominator = tf + k1 * (1 - b + b * index["lengths"][doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0) + idf * tf * (k1 + 1) / denominator
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        return [(index["ids"][doc_id], score) for doc_id, score in ranked]
+
+
+def load_index(manifest_path: Path = MANIFEST_FILE):
+    """读取 build_site_data.py 生成的索引文件；尚未生成时返回 None"""
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        filename = json.load(f).get("files", {}).get(INDEX_NAME)
+    if not filename or not (manifest_path.parent / filename).exists():
+        return None
+    with open(manifest_path.parent / filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="中英双语技能检索")
+    parser.add_argument("query", help="检索词，可中英混合")
+    parser.add_argument("-n", "--limit", type=int, default=10)
+    parser.add_argument("--input", type=Path, default=INPUT_FILE)
+    parser.add_argument("--body", action="store_true", help="临时建索引，正文也参与检索")
+    args = parser.parse_args()
+
+    # 与 build_site_data.py 一致：按 id 去重保留第一个，文档顺序与列表清单相同
+    skills = {}
+    with open(args.input, "r", encoding="utf-8") as f:
+        for skill in json.load(f):
+            skills.setdefault(skill["id"], skill)
+
+    index = None if args.body else load_index()
+    if index is None:
+        fields = INDEX_FIELDS + BODY_FIELDS if args.body else INDEX_FIELDS
+        index = build_index(list(skills.values()), fields)
+
+    results = SkillSearcher(index).search(args.query, args.limit)
+    if not results:
+        print("没有匹配的技能")
+    for skill_id, score in results:
+        skill = skills.get(skill_id, {})
+        print(f"{score:6.2f}  {skill_id}  {skill.get('name_zh') or skill.get('name', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 批量翻译工具
+把多个待翻译片段用编号分隔符拼成一次请求（不超过接口字符上限），
+翻译后再按分隔符拆回，并校验片段数量；数量对不上时二分重试，直到单个片段。
+"""
+
+import re
+
+from translate_pool import run_pool
+
+# Google 免费接口限制约 5000 字符（URL 长度），单次请求最多发送 REQUEST_CHARS 字符
+REQUEST_CHARS = 4000
+# 打包上限不超过单次请求上限，打包后的请求不会被截断
+MAX_CHARS = REQUEST_CHARS
+
+# 分隔符独占一行，形如 [#3#]；翻译服务通常原样保留这类符号
+DELIMITER_TEMPLATE = "\n[#{}#]\n"
+# 拆分时容忍翻译服务在符号之间插入空格或换行
+DELIMITER_PATTERN = re.compile(r"\s*\[\s*#\s*(\d+)\s*#\s*\]\s*")
+
+
+def pack_segments(segments: list, max_chars: int = MAX_CHARS) -> list:
+    """
+    按字符上限把片段分组，返回下标分组列表
+    单个超长片段独占一组（由调用方决定截断策略）
+    """
+    groups = []
+    current = []
+    current_len = 0
+    for idx, text in enumerate(segments):
+        cost = len(text) + len(DELIMITER_TEMPLATE.format(len(current)))
+        if current and current_len + cost > max_chars:
+            groups.append(current)
+            current = []
+            current_len = 0
+        current.append(idx)
+        current_len += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def join_segments(segments: list) -> str:
+    """用编号分隔符拼接片段（第一个片段前也加分隔符，便于校验顺序）"""
+    return "".join(DELIMITER_TEMPLATE.format(i) + text for i, text in enumerate(segments)).strip()
+
+
+def is_packed(text: str) -> bool:
+    """是否为 join_segments 拼成的打包请求"""
+    return DELIMITER_PATTERN.search(text) is not None
+
+
+def split_segments(text: str, expected: int):
+    """
+    按分隔符拆回片段
+    编号必须是 0..expected-1 依次出现，否则返回 None
+    """
+    parts = DELIMITER_PATTERN.split(text)
+    # split 结果：[前缀, 编号0, 内容0, 编号1, 内容1, ...]
+    if parts[0].strip():
+        return None
+    numbers = parts[1::2]
+    contents = parts[2::2]
+    if len(contents) != expected:
+        return None
+    if [int(n) for n in numbers] != list(range(expected)):
+        return None
+    return [c.strip() for c in contents]
+
+
+def translate_batch(segments: list, translate_fn, max_chars: int = MAX_CHARS, workers: int = 1) -> list:
+    """
+    批量翻译片段，返回与输入一一对应的译文列表
+
+    translate_fn(text) 返回译文，失败时返回 None；
+    某个片段最终翻译失败时，对应位置保留原文；
+    workers > 1 时多个请求并发发出（translate_fn 需线程安全）
+    """
+    results = list(segments)
+    groups = pack_segments(segments, max_chars)
+    run_pool(groups, lambda group: _translate_group(segments, group, translate_fn, results), workers)
+    return results
+
+
+def _translate_group(segments: list, group: list, translate_fn, results: list):
+    if len(group) == 1:
+        translated = translate_fn(segments[group[0]])
+        if translated is not None:
+            results[group[0]] = translated
+        return
+
+    payload = join_segments([segments[i] for i in group])
+    translated = translate_fn(payload)
+    parts = split_segments(translated, len(group)) if translated is not None else None
+    if parts is not None:
+        for i, part in zip(group, parts):
+            results[i] = part
+        return
+
+    # 分隔符被破坏或请求失败：对半拆分后重试
+    mid = len(group) // 2
+    _translate_group(segments, group[:mid], translate_fn, results)
+    _translate_group(segments, group[mid:], translate_fn, results)
+
+
+class FakeTranslator:
+    """
+    测试用的假翻译后端，接口与 deep_translator.GoogleTranslator 一致
+    默认把每行文本包成 〔...〕，并记录每次请求的内容
+    """
+
+    def __init__(self, transform=None, max_chars: int = MAX_CHARS, fail_on=None):
+        self.transform = transform or (lambda line: f"〔{line}〕" if line.strip() else line)
+        self.max_chars = max_chars
+        self.fail_on = fail_on
+        self.requests = []
+
+    def translate(self, text: str) -> str:
+        self.requests.append(text)
+        if len(text) > self.max_chars:
+            raise ValueError(f"text length {len(text)} exceeds {self.max_chars}")
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("fake translator failure")
+        lines = []
+        for line in text.split("\n"):
+            # 分隔符行原样保留
+            if DELIMITER_PATTERN.fullmatch(line):
+                lines.append(line)
+            else:
+                lines.append(self.transform(line))
+        return "\n".join(lines)
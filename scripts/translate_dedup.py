@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 跨技能去重预翻译
+很多技能共用相同的标题、列表项和描述。翻译前先扫描全部待翻译技能，
+收集所有翻译单元（名称、描述、正文的标题 / 列表项 / 段落），按归一化文本去重，
+每个唯一片段只整体翻译一次，再在逐技能阶段直接取用。
+
+用法（只统计去重率，不翻译）：
+    python3 scripts/translate_dedup.py --stats
+"""
+
+import argparse
+import json
+import threading
+from pathlib import Path
+
+from markdown_segments import segment_markdown, translation_units, unit_text
+from translation_store import normalize_text
+
+INPUT_FILE = Path(__file__).parent.parent / "public" / "data" / "skills_raw.json"
+CHUNK_SIZE = 200    # 预翻译每批提交的唯一片段数，便于显示进度、中断时少丢结果
+
+
+def skill_texts(skill: dict, merge_paragraphs: bool = True) -> list:
+    """单个技能需要翻译的全部文本，与逐技能翻译时发出的单元一致"""
+    texts = [skill.get("name", ""), skill.get("description", "")]
+    if skill.get("body"):
+        segments = segment_markdown(skill["body"])
+        texts.extend(unit_text(segments, unit) for unit in translation_units(segments, merge_paragraphs))
+    return [text for text in texts if text and text.strip()]
+
+
+def dedup_stats(skills: list, merge_paragraphs: bool = True) -> dict:
+    total = 0
+    unique = set()
+    for skill in skills:
+        texts = skill_texts(skill, merge_paragraphs)
+        total += len(texts)
+        unique.update(normalize_text(text) for text in texts)
+    return {
+        "segments": total,
+        "unique": len(unique),
+        "ratio": round(total / len(unique), 3) if unique else None,
+    }
+
+
+class PrefetchedTranslator:
+    """
+    先把全部技能的唯一片段整体翻译一次，之后按归一化文本查表；
+    表中没有的文本（例如段落拆回失败后的逐行重译）再交给底层翻译器
+    """
+
+    def __init__(self, translator):
+        self.translator = translator
+        self.table = {}
+        self.lock = threading.Lock()
+
+    def prefetch(self, skills: list, merge_paragraphs: bool = True, chunk_size: int = CHUNK_SIZE) -> dict:
+        keys = {}
+        total = 0
+        for skill in skills:
+            for text in skill_texts(skill, merge_paragraphs):
+                total += 1
+                keys.setdefault(normalize_text(text), text)
+
+        pending = [text for key, text in keys.items() if key not in self.table]
+        print(f"去重预翻译: {total} 个片段 → {len(keys)} 个唯一片段，需翻译 {len(pending)} 个")
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            failed = set()
+            translated = self.translator.translate_many(chunk, failed)
+            with self.lock:
+                for text, result in zip(chunk, translated):
+                    # 翻译失败的片段不记入表中，逐技能阶段再试
+                    if text not in failed:
+                        self.table[normalize_text(text)] = result
+            print(f"   预翻译进度: {min(start + chunk_size, len(pending))}/{len(pending)}")
+
+        return {
+            "segments": total,
+            "unique": len(keys),
+            "ratio": round(total / len(keys), 3) if keys else None,
+        }
+
+    def translate_many(self, texts: list, failed: set = None) -> list:
+        results = [self.table.get(normalize_text(text)) if text and text.strip() else text for text in texts]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            for i, result in zip(missing, self.translator.translate_many([texts[i] for i in missing], failed)):
+                results[i] = result
+        return results
+
+    def translate(self, text: str, failed: set = None) -> str:
+        return self.translate_many([text], failed)[0]
+
+    def flush(self):
+        self.translator.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨技能去重预翻译")
+    parser.add_argument("--stats", action="store_true", help="只统计去重率")
+    parser.add_argument("--input", type=Path, default=INPUT_FILE)
+    parser.add_argument("--no-merge", action="store_true", help="按逐行翻译单元统计")
+    args = parser.parse_args()
+
+    if args.stats:
+        with open(args.input, "r", encoding="utf-8") as f:
+            skills = json.load(f)
+        stats = dedup_stats(skills, not args.no_merge)
+        print(f"片段: {stats['segments']}，唯一片段: {stats['unique']}，去重比: {stats['ratio']}x")
+        return
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
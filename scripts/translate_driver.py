@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 统一翻译驱动
+按提供方回退链翻译技能数据：先查共享缓存，未命中的依次交给各提供方，
+进度逐字段写入进度日志，中断后重新运行即可继续。
+翻译前先对全部待翻译技能做去重预翻译（见 translate_dedup.py），重复片段只翻译一次。
+
+用法：
+    python3 scripts/translate_driver.py                          # deeplx → google → 本地词典
+    python3 scripts/translate_driver.py --provider google,dict
+    python3 scripts/translate_driver.py --provider dict          # 完全离线
+    # 无网络压测整条流水线（进程内桩服务，结果写到临时文件）
+    python3 scripts/translate_driver.py --provider stub --output /tmp/skills.json --restart
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from markdown_segments import segment_markdown, translate_segments
+from translate_dedup import PrefetchedTranslator
+from translate_metrics import METRICS
+from translate_pool import run_pool, write_json_array
+from translate_providers import PROVIDERS, build_chain
+from translate_skills import CATEGORY_TRANSLATIONS
+from translation_journal import TranslationJournal, add_job_arguments, load_previous_output, parse_only
+from translation_store import TranslationCache
+
+INPUT_FILE = Path(__file__).parent.parent / "public" / "data" / "skills_raw.json"
+OUTPUT_FILE = Path(__file__).parent.parent / "public" / "data" / "skills.json"
+REPORT_FILE = Path(__file__).parent / "translation_report.json"
+DEFAULT_PROVIDERS = "deeplx,google,dict"
+TRANSLATED_FIELDS = ("name_zh", "description_zh", "category_zh", "body_zh")
+
+SKILL_WORKERS = 4       # 同时处理的技能数
+SAVE_EVERY = 5          # 每处理完多少个技能刷新一次缓存
+
+
+def journal_path(chain_name: str) -> Path:
+    return Path(__file__).parent / f"translation_journal_{chain_name}.jsonl"
+
+
+def translate_skill(skill: dict, chain, journal: TranslationJournal, merge_paragraphs: bool = True):
+    """
+    翻译单个技能；每个字段完成后写入进度日志，重启时跳过已完成的字段
+    有片段最终翻译失败的字段不写入日志，技能保持待处理，重新运行时只重试这些字段
+    """
+    complete = True
+
+    def field(name: str, translate):
+        nonlocal complete
+
+        def checked():
+            failed = set()
+            value = translate(failed)
+            return None if failed else value
+
+        if journal.field(skill, name, checked) is None:
+            complete = False
+
+    field("name_zh", lambda failed: chain.translate(skill.get("name", ""), failed))
+
+    if skill.get("description"):
+        field("description_zh", lambda failed: chain.translate(skill["description"], failed))
+
+    if "category" in skill:
+        cat = skill["category"].lower()
+        journal.record(skill, "category_zh", CATEGORY_TRANSLATIONS.get(cat, skill["category"]))
+
+    if skill.get("body"):
+        field("body_zh", lambda failed: translate_segments(
+            segment_markdown(skill["body"]), lambda texts: chain.translate_many(texts, failed), merge_paragraphs))
+
+    if complete:
+        journal.complete(skill)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="按提供方回退链翻译技能数据")
+    parser.add_argument("--provider", default=DEFAULT_PROVIDERS,
+                        help=f"提供方回退链，逗号分隔（可选: {', '.join(PROVIDERS)}）")
+    parser.add_argument("--input", type=Path, default=INPUT_FILE)
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    parser.add_argument("--workers", type=int, default=SKILL_WORKERS, help="同时处理的技能数")
+    parser.add_argument("--no-merge", action="store_true", help="不合并连续段落行，逐行翻译")
+    parser.add_argument("--no-dedup", action="store_true", help="跳过跨技能去重预翻译")
+    parser.add_argument("--report", type=Path, default=REPORT_FILE, help="JSON 运行报告输出路径")
+    parser.add_argument("--prometheus", type=Path, help="同时输出 Prometheus 文本格式指标")
+    add_job_arguments(parser, None)
+    args = parser.parse_args(argv)
+
+    print("🌍 Oh My Skills - 翻译技能数据")
+    print("========================================")
+
+    if not args.input.exists():
+        print(f"❌ 找不到输入文件: {args.input}")
+        return
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        skills = json.load(f)
+
+    chain = build_chain(args.provider, TranslationCache())
+    journal = TranslationJournal(args.journal or journal_path(chain.name), restart=args.restart)
+    pending = journal.pending(skills, parse_only(args.only))
+    total = len(pending)
+    print(f"提供方: {chain.name}，待翻译 {total} 个技能（共 {len(skills)} 个）")
+
+    done = 0
+    start = time.monotonic()
+    translator = chain
+
+    def on_done(i: int, _):
+        nonlocal done
+        done += 1
+        print(f"[{done}/{total}] 完成: {skills[pending[i]].get('name')}")
+        if done % SAVE_EVERY == 0:
+            chain.flush()
+
+    try:
+        if pending and not args.no_dedup:
+            translator = PrefetchedTranslator(chain)
+            METRICS.set("dedup", translator.prefetch([skills[i] for i in pending], not args.no_merge))
+        run_pool([skills[i] for i in pending],
+                 lambda skill: translate_skill(skill, translator, journal, not args.no_merge),
+                 args.workers, on_done)
+    except KeyboardInterrupt:
+        print("\n⚠️ 用户中断，进度已记录，重新运行即可继续...")
+
+    # 已翻译的字段来自进度日志，其余技能保持上次输出或原文
+    # 先写临时文件再替换：写到一半中断时上次的输出保持完整，下次运行仍能读取
+    output = journal.merge_output(skills, TRANSLATED_FIELDS, load_previous_output(args.output))
+    write_json_array(args.output, output)
+    chain.flush()
+
+    METRICS.set("chain", chain.name)
+    METRICS.set("skills", {"total": len(skills), "pending": total, "done": done})
+    METRICS.set("workers", args.workers)
+    METRICS.write(args.report, args.prometheus)
+
+    print(f"\n✅ 完成 {done}/{total} 个技能，用时 {time.monotonic() - start:.1f}s")
+    print(f"   保存至: {args.output}")
+    print(METRICS.summary())
+    print(f"   运行报告: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
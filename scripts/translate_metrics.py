@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 翻译运行指标
+按提供方统计请求数、发送字符数、失败与重试次数、请求延迟直方图，
+以及限速等待 / 退避睡眠与实际请求耗时（按线程累计）；另统计缓存命中率。
+
+运行结束后输出 JSON 报告，也可输出 Prometheus 文本格式：
+    python3 scripts/translate_driver.py --report scripts/translation_report.json --prometheus /tmp/translate.prom
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# 请求延迟直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 超出最大上界的溢出桶标签；JSON 不支持 Infinity，分位数落在该桶时也返回此标签
+OVERFLOW_BUCKET = "+Inf"
+SLEEP_KINDS = ("throttle", "backoff")
+
+
+class ProviderStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.chars_sent = 0
+        self.retries = 0
+        self.work_seconds = 0.0
+        self.sleep_seconds = dict.fromkeys(SLEEP_KINDS, 0.0)
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    def observe_latency(self, seconds: float):
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_buckets[i] += 1
+                return
+        self.latency_buckets[-1] += 1
+
+    def quantile(self, q: float):
+        """按直方图估算分位数（取所在桶的上界，溢出桶为 "+Inf"）"""
+        total = sum(self.latency_buckets)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(self.latency_buckets):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else OVERFLOW_BUCKET
+        return OVERFLOW_BUCKET
+
+    def to_dict(self) -> dict:
+        count = sum(self.latency_buckets)
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "chars_sent": self.chars_sent,
+            "retries": self.retries,
+            "work_seconds": round(self.work_seconds, 3),
+            "sleep_seconds": {kind: round(value, 3) for kind, value in self.sleep_seconds.items()},
+            "latency": {
+                "count": count,
+                "mean": round(self.latency_sum / count, 4) if count else None,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + [OVERFLOW_BUCKET], self.latency_buckets)),
+            },
+        }
+
+
+class Metrics:
+    """线程安全的运行指标收集器"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.start_clock = time.monotonic()
+            self.providers = {}
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.extra = {}
+
+    def _stats(self, provider: str) -> ProviderStats:
+        if provider not in self.providers:
+            self.providers[provider] = ProviderStats()
+        return self.providers[provider]
+
+    @contextmanager
+    def request(self, provider: str, chars: int):
+        """包住一次请求：记录次数、字符数、耗时；抛出异常记为失败"""
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self._finish(provider, chars, time.monotonic() - start, failed=True)
+            raise
+        self._finish(provider, chars, time.monotonic() - start, failed=False)
+
+    def _finish(self, provider: str, chars: int, seconds: float, failed: bool):
+        with self.lock:
+            stats = self._stats(provider)
+            stats.requests += 1
+            stats.chars_sent += chars
+            stats.work_seconds += seconds
+            stats.observe_latency(seconds)
+            if failed:
+                stats.failures += 1
+
+    def sleep(self, provider: str, seconds: float, kind: str = "throttle"):
+        if not seconds:
+            return
+        with self.lock:
+            self._stats(provider).sleep_seconds[kind] += seconds
+
+    def retry(self, provider: str):
+        with self.lock:
+            self._stats(provider).retries += 1
+
+    def cache(self, hits: int, misses: int):
+        with self.lock:
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    def set(self, key: str, value):
+        """附加到报告中的其他信息"""
+        with self.lock:
+            self.extra[key] = value
+
+    def report(self) -> dict:
+        with self.lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "duration_seconds": round(time.monotonic() - self.start_clock, 3),
+                "providers": {name: stats.to_dict() for name, stats in self.providers.items()},
+                "cache": {
+                    "hits": self.cache_hits,
+                    "misses": self.cache_misses,
+                    "hit_ratio": round(self.cache_hits / lookups, 4) if lookups else None,
+                },
+                **self.extra,
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus 文本格式"""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        with self.lock:
+            providers = list(self.providers.items())
+            metric("translate_requests_total", "counter", "Translation requests sent.",
+                   [({"provider": p, "outcome": "ok"}, s.requests - s.failures) for p, s in providers]
+                   + [({"provider": p, "outcome": "error"}, s.failures) for p, s in providers])
+            metric("translate_chars_sent_total", "counter", "Characters sent to translation providers.",
+                   [({"provider": p}, s.chars_sent) for p, s in providers])
+            metric("translate_retries_total", "counter", "Retried translation requests.",
+                   [({"provider": p}, s.retries) for p, s in providers])
+            metric("translate_work_seconds_total", "counter", "Time spent waiting on translation requests.",
+                   [({"provider": p}, round(s.work_seconds, 6)) for p, s in providers])
+            metric("translate_sleep_seconds_total", "counter", "Time spent sleeping for rate limits and backoff.",
+                   [({"provider": p, "kind": kind}, round(s.sleep_seconds[kind], 6))
+                    for p, s in providers for kind in SLEEP_KINDS])
+            metric("translate_cache_lookups_total", "counter", "Translation cache lookups.",
+                   [({"result": "hit"}, self.cache_hits), ({"result": "miss"}, self.cache_misses)])
+
+            lines.append("# HELP translate_request_duration_seconds Translation request latency.")
+            lines.append("# TYPE translate_request_duration_seconds histogram")
+            for p, s in providers:
+                cumulative = 0
+                for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + [OVERFLOW_BUCKET], s.latency_buckets):
+                    cumulative += count
+                    lines.append(f'translate_request_duration_seconds_bucket{{provider="{p}",le="{bound}"}} {cumulative}')
+                lines.append(f'translate_request_duration_seconds_sum{{provider="{p}"}} {round(s.latency_sum, 6)}')
+                lines.append(f'translate_request_duration_seconds_count{{provider="{p}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_path: Path = None, prometheus_path: Path = None):
+        if report_path:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        if prometheus_path:
+            Path(prometheus_path).write_text(self.prometheus(), encoding="utf-8")
+
+    def summary(self) -> str:
+        """一行一个提供方的简要统计，供脚本结束时打印"""
+        report = self.report()
+        lines = []
+        for name, stats in report["providers"].items():
+            lines.append(
+                f"   {name}: {stats['requests']} 次请求 ({stats['failures']} 失败, {stats['retries']} 重试), "
+                f"{stats['chars_sent']} 字符, 请求 {stats['work_seconds']}s / "
+                f"等待 {sum(stats['sleep_seconds'].values()):.3f}s, p95 ≤ {stats['latency']['p95']}s")
+        dedup = report.get("dedup")
+        if dedup and dedup["ratio"]:
+            lines.append(f"   去重: {dedup['segments']} 个片段 → {dedup['unique']} 个唯一片段 ({dedup['ratio']}x)")
+        cache = report["cache"]
+        if cache["hit_ratio"] is not None:
+            lines.append(f"   缓存命中率: {cache['hit_ratio']:.1%} ({cache['hits']}/{cache['hits'] + cache['misses']})")
+        return "\n".join(lines)
+
+
+# 进程内共用的指标收集器
+METRICS = Metrics()
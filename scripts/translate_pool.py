@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 并发翻译工具
+  - TokenBucket: 每个接口一个令牌桶限速，遇到 429/5xx 自动降速（AIMD），成功后逐步恢复
+  - RateLimiter: 按接口名管理令牌桶，供多个线程共享
+  - call_with_backoff: 带指数退避的调用封装，替代固定的 time.sleep
+  - run_pool: 线程池并发执行，按完成顺序回调、按输入顺序返回结果
+  - process_map: 多进程执行 CPU 密集的离线步骤，按输入顺序逐个产出结果
+  - write_json_array: 边产出边写出 JSON 数组（写完后原子替换目标文件），与 json.dump(indent=2) 的输出逐字节一致
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# 可重试的 HTTP 状态码
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """接口限流或暂时不可用，可稍后重试"""
+
+    def __init__(self, message: str, status: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value) -> float:
+    """解析 Retry-After 头（只支持秒数形式）"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶
+    rate 为每秒补充的令牌数，capacity 为突发上限；
+    penalize() 将速率减半并暂停发放，reward() 逐步恢复到初始速率
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """取一个令牌，必要时阻塞等待；返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, retry_after: float = None):
+        """被限流：速率减半，并在 retry_after 秒内暂停发放令牌"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def reward(self):
+        """请求成功：速率线性恢复"""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class RateLimiter:
+    """按接口名管理令牌桶"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self.lock:
+            if endpoint not in self.buckets:
+                self.buckets[endpoint] = TokenBucket(self.rate, self.capacity)
+            return self.buckets[endpoint]
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """指数退避 + 全抖动"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_with_backoff(bucket: TokenBucket, fn, max_retries: int = 3, on_sleep=None):
+    """
+    限速调用 fn()
+    fn 抛出 RetryableError 时降速并退避重试；其他异常直接抛出
+    on_sleep(seconds, kind) 在每次限速等待 (throttle) 和退避睡眠 (backoff) 后回调，用于统计
+    """
+    for attempt in range(max_retries):
+        waited = bucket.acquire()
+        if on_sleep:
+            on_sleep(waited, "throttle")
+        try:
+            result = fn()
+        except RetryableError as e:
+            bucket.penalize(e.retry_after)
+            if attempt == max_retries - 1:
+                raise
+            delay = e.retry_after or backoff_delay(attempt)
+            time.sleep(delay)
+            if on_sleep:
+                on_sleep(delay, "backoff")
+            continue
+        bucket.reward()
+        return result
+
+
+def run_pool(items: list, fn, workers: int, on_result=None) -> list:
+    """
+    用线程池并发执行 fn(item)，结果按输入顺序返回
+    on_result(index, result) 在主线程中按完成顺序回调，可用于打印进度或定期保存
+    workers <= 1 时顺序执行
+    """
+    results = [None] * len(items)
+    if workers <= 1:
+        for i, item in enumerate(items):
+            results[i] = fn(item)
+            if on_result:
+                on_result(i, results[i])
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fn, item): i for i, item in enumerate(items)}
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                if on_result:
+                    on_result(i, results[i])
+        except BaseException:
+            # Ctrl-C 等：取消尚未开始的任务，已在执行的任务自然结束
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+
+def process_map(items: list, fn, workers: int = None, chunksize: int = None):
+    """
+    多进程执行 fn(item)，按输入顺序逐个产出结果（生成器）
+    fn 须为模块级函数；支持 fork 时子进程直接继承父进程已构建的全局数据
+    （如编译好的术语表），写时复制，无需重复构建或序列化；
+    workers 为 None 时使用全部 CPU，<= 1 时在当前进程内顺序执行
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    chunksize = chunksize or max(1, len(items) // (workers * 4))
+    with context.Pool(workers) as pool:
+        yield from pool.imap(fn, items, chunksize)
+
+
+def write_json_array(path, items, indent: int = 2) -> int:
+    """
+    把可迭代对象逐项写成 JSON 数组（不在内存中攒整个列表），返回写出的条数
+    先写到同目录的临时文件，全部写完再替换目标文件；中断或出错时原文件保持不变
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    count = 0
+    pad = " " * indent
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in items:
+                f.write("[\n" if count == 0 else ",\n")
+                text = json.dumps(item, ensure_ascii=False, indent=indent)
+                f.write("\n".join(pad + line for line in text.split("\n")))
+                count += 1
+            f.write("\n]" if count else "[]")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
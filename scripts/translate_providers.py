@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 翻译提供方插件
+每个提供方声明自己的打包上限、并发数和限速，只需实现 request()；
+ProviderChain 把多个提供方串成回退链，统一处理缓存、打包、限速与重试。
+
+内置提供方：
+  google  Google 翻译 (deep-translator)，按字符上限打包请求
+  deeplx  DeepLX 接口，多个端点按健康度调度（熔断、保持连接、可选对冲请求）
+  dict    本地词典引擎 (translate_skills.py 的短语表)，无需联网
+  stub    进程内启动的 DeepLX 桩服务，用于无网络压测整条流水线
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from endpoint_pool import EndpointPool
+from translate_batch import MAX_CHARS, REQUEST_CHARS, is_packed, translate_batch
+from translate_metrics import METRICS
+from translate_pool import (RETRYABLE_STATUS, RateLimiter, RetryableError, backoff_delay, call_with_backoff,
+                            parse_retry_after, run_pool)
+from translation_store import TranslationCache
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+try:
+    from deep_translator import GoogleTranslator
+except ImportError:
+    GoogleTranslator = None
+
+LANG_PAIR = "en-zh"
+SCRIPTS_DIR = Path(__file__).parent
+
+
+class Provider:
+    """
+    提供方基类
+    batch_chars > 0 时多个片段用分隔符打包成一次请求，0 表示逐条请求
+    rate_limit 为每个端点每秒请求上限，0 表示不限速
+    glossary 参与缓存键；postprocess 用于修正本提供方及回退读到的其他提供方译文
+    cacheable 为 False 的提供方（本地、压测用）不读写共享缓存
+    """
+
+    name = "base"
+    batch_chars = 0
+    concurrency = 1
+    rate_limit = 2.0
+    max_retries = 3
+    glossary = None
+    cacheable = True
+    legacy_cache = None
+
+    def __init__(self):
+        self.limiter = RateLimiter(self.rate_limit) if self.rate_limit else None
+
+    def available(self) -> bool:
+        return True
+
+    def endpoints(self) -> list:
+        return [self.name]
+
+    def request(self, text: str, endpoint: str):
+        """发出一次请求，返回译文；暂时性失败抛出 RetryableError，其他失败返回 None"""
+        raise NotImplementedError
+
+    def postprocess(self, text: str) -> str:
+        return text
+
+    def _request(self, text: str, endpoint: str):
+        """带指标统计的 request()"""
+        with METRICS.request(self.name, len(text)):
+            return self.request(text, endpoint)
+
+    def _on_sleep(self, seconds: float, kind: str):
+        METRICS.sleep(self.name, seconds, kind)
+        if kind == "backoff":
+            METRICS.retry(self.name)
+
+    def translate(self, text: str):
+        """依次尝试各端点（限速 + 退避重试），全部失败返回 None"""
+        for endpoint in self.endpoints():
+            try:
+                if self.limiter is None:
+                    result = self._request(text, endpoint)
+                else:
+                    result = call_with_backoff(self.limiter.bucket(endpoint),
+                                               lambda: self._request(text, endpoint), self.max_retries,
+                                               self._on_sleep)
+            except Exception as e:
+                print(f"    ⚠️ {self.name} 端点 {endpoint} 失败: {e}")
+                continue
+            if result:
+                return result
+        return None
+
+    def translate_many(self, texts: list) -> list:
+        """翻译一组文本，返回与输入一一对应的译文，失败的位置为 None"""
+        if self.batch_chars:
+            translated = translate_batch(texts, self.translate, self.batch_chars, self.concurrency)
+            # translate_batch 对失败的片段原样返回输入对象
+            results = [None if result is text else result for text, result in zip(texts, translated)]
+        else:
+            results = run_pool(texts, self.translate, self.concurrency)
+        return [None if result is None else self.postprocess(result) for result in results]
+
+
+# ==========================================
+# Google 翻译
+# ==========================================
+# 固定的专业术语映射（有些词 Google 翻译可能不准，强制覆盖）
+TERM_MAPPING = {
+    "Artifacts": "Artifacts",
+    "Claude": "Claude",
+    "React": "React",
+    "Expo": "Expo",
+    "Vercel": "Vercel",
+    "Markdown": "Markdown",
+    "p5.js": "p5.js",
+    "TypeScript": "TypeScript",
+    "JavaScript": "JavaScript",
+    "Python": "Python",
+    "MCP": "MCP",
+    "LLM": "LLM",
+    "AI": "AI",
+    "Agent": "智能体",
+}
+
+
+def apply_terms(translated: str) -> str:
+    """应用术语修正"""
+    for term, replacement in TERM_MAPPING.items():
+        translated = translated.replace(term, replacement)
+    return translated
+
+
+class GoogleProvider(Provider):
+    name = "google"
+    batch_chars = MAX_CHARS
+    concurrency = 2
+    rate_limit = 2.0
+    glossary = TERM_MAPPING
+    legacy_cache = SCRIPTS_DIR / "translation_cache.json"
+
+    def __init__(self):
+        super().__init__()
+        # GoogleTranslator 每次 translate() 都会改写实例上的请求参数，不能跨线程共享
+        self.local = threading.local()
+
+    @property
+    def translator(self):
+        """当前线程专用的 GoogleTranslator"""
+        translator = getattr(self.local, "translator", None)
+        if translator is None:
+            translator = self.local.translator = GoogleTranslator(source="auto", target="zh-CN")
+        return translator
+
+    def available(self) -> bool:
+        return GoogleTranslator is not None
+
+    def request(self, text: str, endpoint: str):
+        try:
+            # 限制文本长度，避免超出 URL 限制 (Google 免费接口限制约 5000 字符)
+            if len(text) > REQUEST_CHARS:
+                if is_packed(text):
+                    # 打包请求截断后会丢掉后面的分隔符，直接失败，由 translate_batch 二分重试
+                    print(f"⚠️ 打包请求过长 ({len(text)} 字符)，拆分后重试...")
+                    return None
+                print(f"⚠️ 文本过长 ({len(text)} 字符)，将被截断翻译...")
+                return self.translator.translate(text[:REQUEST_CHARS]) + "..."
+            return self.translator.translate(text)
+        except Exception as e:
+            # deep-translator 不区分限流与网络错误，统一按可重试处理
+            raise RetryableError(str(e))
+
+    def postprocess(self, text: str) -> str:
+        return apply_terms(text)
+
+
+# ==========================================
+# DeepLX
+# ==========================================
+# DeepLX 接口地址列表 (可以使用公共节点，或者您自己在本地部署的 localhost:1188)
+DEEPLX_ENDPOINTS = [
+    "https://api.deeplx.org/translate",
+    "https://deeplx.vercel.app/translate",
+    # 如果您在本地运行了 DeepLX (docker run -p 1188:1188 missuo/deeplx)，请解开下面这行
+    # "http://localhost:1188/translate",
+]
+# 也可以通过环境变量覆盖（逗号分隔），例如指向本地桩服务 scripts/translate_stub_server.py
+if os.environ.get("DEEPLX_ENDPOINTS"):
+    DEEPLX_ENDPOINTS = [e.strip() for e in os.environ["DEEPLX_ENDPOINTS"].split(",") if e.strip()]
+
+
+# 首选端点超过该秒数未返回时向次优端点发出对冲请求，不设置则关闭对冲
+DEEPLX_HEDGE_AFTER = float(os.environ["DEEPLX_HEDGE_AFTER"]) if os.environ.get("DEEPLX_HEDGE_AFTER") else None
+
+
+class DeepLXProvider(Provider):
+    """
+    多端点按健康度调度（见 endpoint_pool.py）：熔断中的端点直接跳过，
+    优先选择延迟低、错误少的端点；每个端点复用一个保持连接的会话
+    """
+
+    name = "deeplx"
+    concurrency = 4
+    rate_limit = 2.0
+    timeout = 10
+    legacy_cache = SCRIPTS_DIR / "translation_cache_deeplx.json"
+
+    def __init__(self, endpoints: list = None, hedge_after: float = DEEPLX_HEDGE_AFTER):
+        super().__init__()
+        self.endpoint_list = list(endpoints or DEEPLX_ENDPOINTS)
+        self.pool = EndpointPool(self.endpoint_list, hedge_after=hedge_after, workers=self.concurrency * 2)
+        self.sessions = {}
+        if requests is not None:
+            for endpoint in self.endpoint_list:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency * 2)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[endpoint] = session
+
+    def available(self) -> bool:
+        return requests is not None and bool(self.endpoint_list)
+
+    def endpoints(self) -> list:
+        return self.pool.ranked()
+
+    def request(self, text: str, endpoint: str):
+        payload = {"text": text, "source_lang": "EN", "target_lang": "ZH"}
+        resp = self.sessions[endpoint].post(endpoint, json=payload, timeout=self.timeout)
+        if resp.status_code in RETRYABLE_STATUS:
+            raise RetryableError(f"HTTP {resp.status_code}", resp.status_code,
+                                 parse_retry_after(resp.headers.get("Retry-After")))
+        if resp.status_code == 200:
+            data = resp.json()
+            if data.get("code") == 200 and data.get("data"):
+                return data["data"]
+        return None
+
+    def _request_limited(self, text: str, endpoint: str):
+        bucket = self.limiter.bucket(endpoint)
+        self._on_sleep(bucket.acquire(), "throttle")
+        try:
+            result = self._request(text, endpoint)
+        except RetryableError as e:
+            bucket.penalize(e.retry_after)
+            raise
+        bucket.reward()
+        return result
+
+    def translate(self, text: str):
+        """每轮按健康度尝试可用端点，整轮失败后退避再试；端点全部熔断时立即放弃，交给回退链"""
+        for attempt in range(self.max_retries):
+            if not self.pool.ranked():
+                break
+            result = self.pool.call(lambda endpoint: self._request_limited(text, endpoint))
+            if result:
+                return result
+            if attempt < self.max_retries - 1:
+                delay = backoff_delay(attempt)
+                time.sleep(delay)
+                self._on_sleep(delay, "backoff")
+        return None
+
+
+class StubProvider(DeepLXProvider):
+    """进程内启动 DeepLX 桩服务（译文为 "译:" + 原文），不读写共享缓存"""
+
+    name = "stub"
+    concurrency = 8
+    rate_limit = 50.0
+    cacheable = False
+    legacy_cache = None
+
+    def __init__(self, latency: float = 0.05, error_rate: float = 0.0):
+        from translate_stub_server import start_stub_server
+
+        self.server, endpoint = start_stub_server(latency=latency, error_rate=error_rate)
+        super().__init__([endpoint])
+
+
+# ==========================================
+# 本地词典
+# ==========================================
+class DictionaryProvider(Provider):
+    """本地短语表替换，不联网、不限速，作为回退链的兜底"""
+
+    name = "dict"
+    concurrency = 1
+    rate_limit = 0
+    cacheable = False
+
+    def __init__(self):
+        super().__init__()
+        from translate_skills import PHRASE_GLOSSARY
+
+        self.glossary_engine = PHRASE_GLOSSARY
+
+    def request(self, text: str, endpoint: str):
+        return self.glossary_engine.translate(text)
+
+
+PROVIDERS = {
+    "google": GoogleProvider,
+    "deeplx": DeepLXProvider,
+    "dict": DictionaryProvider,
+    "stub": StubProvider,
+}
+
+
+# ==========================================
+# 回退链
+# ==========================================
+class ProviderChain:
+    """
+    按顺序尝试多个提供方：先查缓存，未命中的片段去重后交给第一个提供方，
+    失败的再交给下一个；全部失败的片段保留原文
+    """
+
+    def __init__(self, providers: list, cache: TranslationCache = None, lang_pair: str = LANG_PAIR):
+        self.providers = providers
+        self.cache = cache
+        self.lang_pair = lang_pair
+        self.views = {
+            p.name: cache.view(p.name, lang_pair, p.glossary, postprocess=p.postprocess)
+            for p in providers if cache is not None and p.cacheable
+        }
+
+    @property
+    def name(self) -> str:
+        return "+".join(p.name for p in self.providers)
+
+    def _cached(self, text: str):
+        for provider in self.providers:
+            view = self.views.get(provider.name)
+            if view is not None:
+                # 第一个可缓存的提供方的视图会回退读取其他提供方的译文
+                return view.get(text)
+        return None
+
+    def translate_many(self, texts: list, failed: set = None) -> list:
+        """
+        返回与 texts 一一对应的译文；全部提供方都失败的片段保留原文，
+        并在传入 failed 时加入其中，供调用方区分"译文恰好等于原文"与"翻译失败"
+        """
+        results = {}
+        pending = []
+        for text in dict.fromkeys(t for t in texts if t and t.strip()):
+            cached = self._cached(text)
+            if cached is None:
+                pending.append(text)
+            else:
+                results[text] = cached
+        if self.views:
+            METRICS.cache(len(results), len(pending))
+
+        for provider in self.providers:
+            if not pending:
+                break
+            translated = provider.translate_many(pending)
+            retry = []
+            for text, result in zip(pending, translated):
+                if result is None:
+                    retry.append(text)
+                    continue
+                results[text] = result
+                view = self.views.get(provider.name)
+                if view is not None:
+                    view[text] = result
+            if retry:
+                print(f"   ⚠️ {provider.name}: {len(retry)} 个片段翻译失败")
+            pending = retry
+
+        if pending:
+            print(f"   ❌ {len(pending)} 个片段最终翻译失败，使用原文")
+            if failed is not None:
+                failed.update(pending)
+        return [results.get(text, text) for text in texts]
+
+    def translate(self, text: str, failed: set = None) -> str:
+        return self.translate_many([text], failed)[0]
+
+    def flush(self):
+        if self.cache is not None:
+            self.cache.flush()
+
+
+def build_chain(spec: str, cache: TranslationCache = None) -> ProviderChain:
+    """
+    按 "deeplx,google,dict" 这样的列表构造回退链，跳过缺少依赖的提供方
+    链中没有可缓存的提供方时不使用 cache
+    """
+    providers = []
+    for name in (item.strip() for item in spec.split(",")):
+        if not name:
+            continue
+        if name not in PROVIDERS:
+            raise ValueError(f"未知的翻译提供方: {name}（可选: {', '.join(PROVIDERS)}）")
+        provider = PROVIDERS[name]()
+        if not provider.available():
+            print(f"⚠️ 提供方 {name} 不可用（缺少依赖或端点），已跳过")
+            continue
+        providers.append(provider)
+    if not providers:
+        raise ValueError(f"没有可用的翻译提供方: {spec}")
+
+    if not any(provider.cacheable for provider in providers):
+        # 本地词典、桩服务不读写缓存：不导入旧缓存，也不创建共享缓存文件
+        cache = None
+    if cache is not None:
+        for provider in providers:
+            if provider.cacheable and provider.legacy_cache:
+                cache.import_legacy(provider.legacy_cache, provider.name, LANG_PAIR, provider.glossary)
+        cache.import_legacy(SCRIPTS_DIR / "translation_cache_llm.json", "llm", LANG_PAIR)
+    return ProviderChain(providers, cache)
@@ -4,10 +4,16 @@ Oh My Skills - 增强版字典翻译脚本
 无需 API，基于规则和大量术语库进行本地翻译
 """
 
+import argparse
 import json
 import re
 from pathlib import Path
 
+from glossary import Glossary
+from markdown_segments import is_translatable, render, restore_inline_code, segment_markdown
+from translate_metrics import METRICS
+from translate_pool import process_map, write_json_array
+
 # ==========================================
 # 1. 技能名称映射 (精确匹配)
 # ==========================================
@@ -199,73 +205,61 @@ def translate_name(name: str) -> str:
         return NAME_TRANSLATIONS[name_lower]
     return name
 
+# 短语表只编译一次（长短语优先，与原逐个 replace 的结果一致）
+PHRASE_GLOSSARY = Glossary(PHRASE_TRANSLATIONS)
+
 def translate_text_smart(text: str) -> str:
     """智能替换文本中的词汇"""
     if not text: return ""
-    
-    result = text
-    
-    # 按照短语长度降序排列，优先替换长短语
-    sorted_phrases = sorted(PHRASE_TRANSLATIONS.items(), key=lambda x: len(x[0]), reverse=True)
-    
-    for en, zh in sorted_phrases:
-        # 使用正则进行不区分大小写的替换，但要确保单词边界（避免替换单词的一部分）
-        # 允许前后是空格、标点或字符串边界
-        pattern = re.compile(r'(^|[\s\W])' + re.escape(en) + r'($|[\s\W])', re.IGNORECASE)
-        
-        # 替换时保留原来的分隔符
-        # group(1) 是前分隔符，group(2) 是后分隔符
-        # 简单替换：result = pattern.sub(lambda m: m.group(1) + zh + m.group(2), result)
-        
-        # 由于 Python re 的限制，这样替换比较安全：
-        # 先简单替换常用词
-        if len(en) > 3: # 只替换较长的词，避免误伤
-             result = result.replace(en, zh)
-             result = result.replace(en.lower(), zh)
-             result = result.replace(en.capitalize(), zh)
-            
-    return result
+    with METRICS.request("dict", len(text)):
+        return PHRASE_GLOSSARY.translate(text)
+
+# 标题规则只编译一次
+HEADER_RULES = [(re.compile(pattern), replacement) for pattern, replacement in HEADER_TRANSLATIONS.items()]
+
+def translate_header(line: str):
+    """按标题规则翻译一行标题，没有匹配的规则返回 None"""
+    stripped = line.lstrip()
+    for pattern, replacement in HEADER_RULES:
+        if pattern.match(stripped):
+            return line[:len(line) - len(stripped)] + pattern.sub(replacement, stripped)
+    return None
 
 def translate_body(text: str) -> str:
     """翻译 Markdown 正文"""
     if not text: return ""
     
-    # 1. 保护代码块
-    code_blocks = []
-    def save_code(match):
-        code_blocks.append(match.group(0))
-        return f"__CODE_{len(code_blocks)-1}__"
-    
-    text_safe = re.sub(r'```[\s\S]*?```', save_code, text)
-    text_safe = re.sub(r'`[^`\n]+`', save_code, text_safe)
-    
-    lines = text_safe.split('\n')
+    # 分段器负责保护代码块和行内代码
+    segments = segment_markdown(text)
     translated_lines = []
+    # 需要短语替换的行先收集起来，最后一次性批量替换
+    pending = []
     
-    for line in lines:
-        line_stripped = line.strip()
+    for seg in segments:
+        if not is_translatable(seg):
+            translated_lines.append(render(seg))
+            continue
+        
+        line = seg.prefix + seg.text + seg.suffix
         
         # 翻译标题
-        is_header = False
-        for pattern, replacement in HEADER_TRANSLATIONS.items():
-            if re.match(pattern, line_stripped):
-                line = re.sub(pattern, replacement, line)
-                is_header = True
-                break
+        if seg.kind == "header":
+            header = translate_header(line)
+            if header is not None:
+                translated_lines.append(restore_inline_code(header, seg.codes))
+                continue
         
-        # 如果不是标题，也不是空行，尝试翻译内容
-        if not is_header and line_stripped and not re.match(r'^[-=*_#]+$', line_stripped):
-            line = translate_text_smart(line)
-            
+        # 不是已知标题，做短语替换
+        pending.append((len(translated_lines), seg.codes))
         translated_lines.append(line)
     
-    result = '\n'.join(translated_lines)
+    lines = [translated_lines[idx] for idx, _ in pending]
+    with METRICS.request("dict", sum(len(line) for line in lines)):
+        replaced = PHRASE_GLOSSARY.translate_lines(lines)
+    for (idx, codes), line in zip(pending, replaced):
+        translated_lines[idx] = restore_inline_code(line, codes)
     
-    # 还原代码
-    for i, code in enumerate(code_blocks):
-        result = result.replace(f"__CODE_{i}__", code)
-        
-    return result
+    return '\n'.join(translated_lines)
 
 def translate_skill(skill: dict) -> dict:
     translated = skill.copy()
@@ -290,6 +284,14 @@ def translate_skill(skill: dict) -> dict:
     return translated
 
 def main():
+    parser = argparse.ArgumentParser(description="本地词典翻译（无需联网）")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="并行进程数（0 表示使用全部 CPU，1 为单进程）")
+    parser.add_argument("--chunksize", type=int, help="每次分给子进程的技能数")
+    parser.add_argument("--report", type=Path, help="JSON 运行报告输出路径")
+    parser.add_argument("--prometheus", type=Path, help="Prometheus 文本格式指标输出路径")
+    args = parser.parse_args()
+
     print("Oh My Skills - 开始增强本地翻译 (无需联网)\n")
     if not INPUT_FILE.exists():
         return
@@ -297,13 +299,15 @@ def main():
     with open(INPUT_FILE, "r", encoding="utf-8") as f:
         skills = json.load(f)
     
-    translated_skills = [translate_skill(skill) for skill in skills]
-    
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(translated_skills, f, ensure_ascii=False, indent=2)
+    # 多进程时按输入顺序边翻译边写出；术语表在导入时已编译，子进程直接继承
+    # （运行指标只统计当前进程，多进程时子进程内的词典调用不计入）
+    translated = process_map(skills, translate_skill, args.workers or None, args.chunksize)
+    count = write_json_array(OUTPUT_FILE, translated)
     
-    print(f"✅ 完成！处理了 {len(translated_skills)} 个技能")
+    print(f"✅ 完成！处理了 {count} 个技能")
     print(f"   保存至: {OUTPUT_FILE}")
+    print(METRICS.summary())
+    METRICS.write(args.report, args.prometheus)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 本地翻译桩服务
+模拟 DeepLX 的 /translate 接口，可配置延迟和失败率（429 / 503），
+用于在无网络环境下压测并发翻译流程。
+
+用法：
+    python3 scripts/translate_stub_server.py --port 1188 --latency 0.2 --error-rate 0.05
+    DEEPLX_ENDPOINTS=http://127.0.0.1:1188/translate python3 scripts/translate_skills_deeplx.py
+
+    # 对比逐条串行（原固定延时）与并发限速两种方式的耗时
+    python3 scripts/translate_stub_server.py --bench --segments 30
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from translate_pool import RateLimiter, RetryableError, call_with_backoff, parse_retry_after, run_pool
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """DeepLX 兼容的假接口：译文为 "译:" + 原文"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        config["requests"] += 1
+
+        time.sleep(config["latency"] * random.uniform(0.5, 1.5))
+
+        if random.random() < config["error_rate"]:
+            status = random.choice([429, 503])
+            self._send(status, {"code": status, "message": "stub failure"}, {"Retry-After": "0.2"})
+            return
+
+        self._send(200, {"code": 200, "data": f"译:{payload.get('text', '')}"})
+
+    def _send(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, latency: float = 0.1, error_rate: float = 0.0, handler=StubHandler):
+    """在后台线程启动桩服务，返回 (server, endpoint_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.config = {"latency": latency, "error_rate": error_rate, "requests": 0}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/translate"
+
+
+def post_translate(endpoint: str, text: str, timeout: float = 10) -> str:
+    """用标准库请求一次 DeepLX 接口"""
+    body = json.dumps({"text": text, "source_lang": "EN", "target_lang": "ZH"}).encode("utf-8")
+    request = urllib.request.Request(endpoint, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            return json.loads(resp.read())["data"]
+    except urllib.error.HTTPError as e:
+        raise RetryableError(f"HTTP {e.code}", e.code, parse_retry_after(e.headers.get("Retry-After")))
+
+
+def bench(segments: int, latency: float, error_rate: float, workers: int, rate: float):
+    server, endpoint = start_stub_server(latency=latency, error_rate=error_rate)
+    texts = [f"Segment {i} of the benchmark corpus." for i in range(segments)]
+
+    # 原方式：逐条请求，每次请求前固定 sleep 1~2 秒
+    start = time.monotonic()
+    for text in texts:
+        time.sleep(1 + random.random())
+        try:
+            post_translate(endpoint, text)
+        except RetryableError:
+            pass
+    serial = time.monotonic() - start
+
+    # 新方式：线程池 + 令牌桶限速 + 失败退避
+    limiter = RateLimiter(rate)
+    bucket = limiter.bucket(endpoint)
+    start = time.monotonic()
+    run_pool(texts, lambda text: call_with_backoff(bucket, lambda: post_translate(endpoint, text), 5), workers)
+    pooled = time.monotonic() - start
+
+    server.shutdown()
+    print(f"片段数: {segments}，接口延迟: {latency}s，失败率: {error_rate:.0%}")
+    print(f"   串行 + 固定延时: {serial:.2f}s")
+    print(f"   并发 ({workers} 线程, {rate}/s 限速): {pooled:.2f}s")
+    print(f"   加速比: {serial / pooled:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeepLX 兼容的本地翻译桩服务")
+    parser.add_argument("--port", type=int, default=1188)
+    parser.add_argument("--latency", type=float, default=0.2, help="平均响应延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 429/503 的概率")
+    parser.add_argument("--bench", action="store_true", help="运行串行与并发的耗时对比")
+    parser.add_argument("--segments", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20.0, help="并发模式每秒请求上限")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.segments, args.latency, args.error_rate, args.workers, args.rate)
+        return
+
+    server, endpoint = start_stub_server(args.port, args.latency, args.error_rate)
+    print(f"🧪 桩服务已启动: {endpoint} (Ctrl-C 退出)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
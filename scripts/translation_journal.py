@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 翻译任务进度日志
+记录每个技能、每个字段的完成情况（追加写，每条立即刷盘），
+中断或崩溃后重新运行时跳过已完成的技能和字段，从断点继续。
+
+技能以 id + 原文内容哈希标识：原文改动后自动重新翻译，
+同 id 的重复条目只要内容相同就共用一份结果。
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from translation_store import TranslationStore, text_hash
+
+# 参与哈希的原文字段
+SOURCE_FIELDS = ("name", "description", "category", "body")
+DONE = "__done__"
+
+
+def skill_key(skill: dict) -> str:
+    source = json.dumps([skill.get(field, "") for field in SOURCE_FIELDS], ensure_ascii=False)
+    return f"{skill.get('id', '')}@{text_hash(source)}"
+
+
+class TranslationJournal:
+    """按 技能|字段 记录译文的进度日志"""
+
+    def __init__(self, path: Path, restart: bool = False):
+        path = Path(path)
+        if restart and path.exists():
+            path.unlink()
+        # 每条记录立即追加并 fsync，中断时最多丢失正在翻译的那个字段
+        self.store = TranslationStore(path, flush_every=1)
+
+    def get(self, skill: dict, field: str):
+        return self.store.get(f"{skill_key(skill)}|{field}")
+
+    def record(self, skill: dict, field: str, value):
+        self.store[f"{skill_key(skill)}|{field}"] = value
+
+    def field(self, skill: dict, field: str, translate):
+        """
+        字段已完成则直接返回记录的译文，否则调用 translate() 并记录
+        translate() 返回 None 表示翻译失败：不记录，返回 None，重新运行时再试
+        """
+        value = self.get(skill, field)
+        if value is None:
+            value = translate()
+            if value is not None:
+                self.record(skill, field, value)
+        return value
+
+    def complete(self, skill: dict):
+        self.record(skill, DONE, True)
+
+    def is_complete(self, skill: dict) -> bool:
+        return bool(self.get(skill, DONE))
+
+    def apply(self, skill: dict, fields: tuple) -> dict:
+        """把已记录的字段合并到技能副本上；一个字段都没有时返回 None"""
+        translated = None
+        for field in fields:
+            value = self.get(skill, field)
+            if value is not None:
+                translated = translated or skill.copy()
+                translated[field] = value
+        return translated
+
+    def pending(self, skills: list, only_ids: set = None) -> list:
+        """待处理技能的下标：未完成且（指定了子集时）id 在子集内"""
+        return [
+            i for i, skill in enumerate(skills)
+            if (not only_ids or skill.get("id") in only_ids) and not self.is_complete(skill)
+        ]
+
+    def merge_output(self, skills: list, fields: tuple, previous: list = None) -> list:
+        """
+        生成完整输出：日志中有记录的技能用记录的译文；
+        没有记录的沿用上次输出中同位置、同 id 的条目，再没有则保留原文
+        """
+        previous = previous or []
+        output = []
+        for i, skill in enumerate(skills):
+            translated = self.apply(skill, fields)
+            if translated is None and i < len(previous) and previous[i].get("id") == skill.get("id"):
+                translated = previous[i]
+            output.append(translated or skill)
+        return output
+
+    def flush(self):
+        self.store.flush()
+
+
+def add_job_arguments(parser: argparse.ArgumentParser, default_journal: Path):
+    """各翻译脚本共用的任务参数"""
+    parser.add_argument("--only", default="", help="只翻译指定 id 的技能（逗号分隔）")
+    parser.add_argument("--journal", type=Path, default=default_journal, help="进度日志文件")
+    parser.add_argument("--restart", action="store_true", help="丢弃进度日志，从头开始")
+
+
+def parse_only(value: str) -> set:
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+
+def load_previous_output(path: Path) -> list:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
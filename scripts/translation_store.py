@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Oh My Skills - 翻译缓存存储
+以追加写日志 (JSON Lines) 持久化翻译缓存，取代每次命中都整体重写 JSON 文件：
+  - 写入先进入内存缓冲，达到条数或时间阈值后批量追加到日志（write-behind）
+  - 每条记录只追加一行，持久化成本与缓存总大小无关
+  - 日志中过期记录过多时自动压缩：写临时文件后原子替换
+  - 进程崩溃时最多丢失未刷盘的缓冲；日志末尾写了一半的行在加载时忽略
+
+TranslationCache 在此之上提供各翻译脚本共用的缓存，键包含文本哈希、提供方、
+语言对和术语表修订号，切换提供方时可回退读取其他提供方的译文。
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+
+class TranslationStore:
+    """
+    类 dict 的翻译缓存（线程安全）
+    path 为日志文件；legacy_file 为旧版整体 JSON 缓存，日志不存在时自动导入
+    """
+
+    def __init__(self, path: Path, legacy_file: Path = None, flush_every: int = 50,
+                 flush_interval: float = 5.0, compact_ratio: float = 2.0):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_ratio = compact_ratio
+        self.entries = {}
+        self.buffer = []
+        self.log_records = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.RLock()
+
+        if self.path.exists():
+            self._load()
+        elif legacy_file is not None and Path(legacy_file).exists():
+            self._import_legacy(Path(legacy_file))
+
+        atexit.register(self.close)
+
+    # ---------- 读取 ----------
+    def _load(self):
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # 崩溃时写了一半的行
+                    continue
+                if not line.endswith(b"\n"):
+                    continue
+                self.entries[record["k"]] = record["v"]
+                self.log_records += 1
+                good_end = f.tell()
+            size = f.tell()
+        if size > good_end:
+            # 截掉末尾的残缺记录，避免后续追加与之拼在同一行
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+
+    def _import_legacy(self, legacy_file: Path):
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                self.entries.update(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return
+        self.compact()
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def __getitem__(self, key):
+        return self.entries[key]
+
+    def get(self, key, default=None):
+        return self.entries.get(key, default)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ---------- 写入 ----------
+    def __setitem__(self, key, value):
+        with self.lock:
+            if self.entries.get(key) == value:
+                return
+            self.entries[key] = value
+            self.buffer.append((key, value))
+            if (len(self.buffer) >= self.flush_every
+                    or time.monotonic() - self.last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self):
+        """把缓冲追加到日志并 fsync；过期记录过多时顺带压缩"""
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.buffer:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for key, value in self.buffer:
+                    f.write(json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.log_records += len(self.buffer)
+            self.buffer = []
+
+            if self.log_records > self.compact_ratio * max(len(self.entries), 1):
+                self.compact()
+
+    def compact(self):
+        """按当前内容重写日志：先写临时文件再原子替换，中途崩溃不影响原日志"""
+        with self.lock:
+            self.buffer = []
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, value in self.entries.items():
+                    f.write(json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.log_records = len(self.entries)
+
+    def close(self):
+        self.flush()
+
+
+# ==========================================
+# 共享翻译缓存
+# ==========================================
+SHARED_CACHE_FILE = Path(__file__).parent / "translation_cache_shared.jsonl"
+
+# 不涉及术语表的片段使用的修订号
+NO_GLOSSARY = "-"
+
+
+def normalize_text(text: str) -> str:
+    """归一化：Unicode NFC、去首尾空白、合并连续空白"""
+    return unicodedata.normalize("NFC", " ".join(str(text).split()))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()[:20]
+
+
+def glossary_revision(text: str, glossary: dict = None) -> str:
+    """
+    片段相关的术语表修订号：只对原文中出现的术语取哈希
+    术语表修改后，只有包含被改术语的片段缓存失效
+    """
+    if not glossary:
+        return NO_GLOSSARY
+    relevant = sorted((term, value) for term, value in glossary.items() if term in text)
+    if not relevant:
+        return NO_GLOSSARY
+    payload = json.dumps(relevant, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:8]
+
+
+class TranslationCache:
+    """
+    多个翻译脚本共用的缓存
+    键为 归一化文本哈希 | 提供方 | 语言对 | 术语表修订号；
+    本提供方未命中时可回退读取其他提供方对同一文本、同一语言对的译文
+    """
+
+    def __init__(self, path: Path = SHARED_CACHE_FILE, fallback: bool = True, **store_options):
+        self.store = TranslationStore(path, **store_options)
+        self.fallback = fallback
+        # 文本哈希|语言对 -> 该文本已有的全部缓存键，用于跨提供方回退
+        self.by_text = {}
+        for key in self.store.entries:
+            self._index(key)
+
+    def _index(self, key: str):
+        parts = key.split("|")
+        if len(parts) == 4:
+            self.by_text.setdefault(f"{parts[0]}|{parts[2]}", set()).add(key)
+
+    @staticmethod
+    def make_key(text: str, provider: str, lang_pair: str, glossary: dict = None) -> str:
+        return f"{text_hash(text)}|{provider}|{lang_pair}|{glossary_revision(text, glossary)}"
+
+    def get(self, text: str, provider: str, lang_pair: str, glossary: dict = None):
+        """返回 (译文, 是否来自其他提供方)；未命中返回 (None, False)"""
+        key = self.make_key(text, provider, lang_pair, glossary)
+        if key in self.store:
+            return self.store[key], False
+        if not self.fallback:
+            return None, False
+        # 回退只读其他提供方（本提供方旧修订号的译文视为过期），优先相同术语表修订号
+        revision = key.rsplit("|", 1)[1]
+        # put() 会在其他翻译线程里往这些集合加键，先在锁内拷贝
+        with self.store.lock:
+            keys = list(self.by_text.get(f"{text_hash(text)}|{lang_pair}", ()))
+        candidates = sorted(
+            (k for k in keys if k.split("|")[1] != provider),
+            key=lambda k: (k.rsplit("|", 1)[1] != revision, k),
+        )
+        for candidate in candidates:
+            return self.store[candidate], True
+        return None, False
+
+    def put(self, text: str, value: str, provider: str, lang_pair: str, glossary: dict = None):
+        key = self.make_key(text, provider, lang_pair, glossary)
+        with self.store.lock:
+            self.store[key] = value
+            self._index(key)
+
+    def import_legacy(self, legacy_file: Path, provider: str, lang_pair: str, glossary: dict = None):
+        """导入旧版 {原文: 译文} 缓存文件，每个文件只导入一次"""
+        legacy_file = Path(legacy_file)
+        marker = f"legacy:{legacy_file.name}"
+        if marker in self.store or not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        for text, value in entries.items():
+            key = self.make_key(text, provider, lang_pair, glossary)
+            if key not in self.store:
+                self.put(text, value, provider, lang_pair, glossary)
+        self.store[marker] = provider
+        self.store.flush()
+
+    def view(self, provider: str, lang_pair: str, glossary: dict = None, postprocess=None) -> "CacheView":
+        return CacheView(self, provider, lang_pair, glossary, postprocess)
+
+    def flush(self):
+        self.store.flush()
+
+
+class CacheView:
+    """
+    绑定提供方、语言对和术语表的缓存视图，用法与 {原文: 译文} 字典相同
+    postprocess 用于修正回退读到的其他提供方译文（例如应用本提供方的术语表）
+    """
+
+    def __init__(self, cache: TranslationCache, provider: str, lang_pair: str,
+                 glossary: dict = None, postprocess=None):
+        self.cache = cache
+        self.provider = provider
+        self.lang_pair = lang_pair
+        self.glossary = glossary
+        self.postprocess = postprocess
+
+    def get(self, text: str, default=None):
+        value, fallback = self.cache.get(text, self.provider, self.lang_pair, self.glossary)
+        if value is None:
+            return default
+        if fallback and self.postprocess:
+            value = self.postprocess(value)
+        return value
+
+    def __contains__(self, text) -> bool:
+        return self.get(text) is not None
+
+    def __getitem__(self, text):
+        value = self.get(text)
+        if value is None:
+            raise KeyError(text)
+        return value
+
+    def __setitem__(self, text, value):
+        self.cache.put(text, value, self.provider, self.lang_pair, self.glossary)
+
+    def flush(self):
+        self.cache.flush()
@@ -1,28 +1,44 @@
 // 技能数据加载器
-// 从 public/data/skills.json 加载真实数据
+// 数据文件由 scripts/build_site_data.py 生成，文件名带内容哈希，可长期缓存：
+//   manifest.json              指针清单（固定文件名，每次重新验证）
+//   skills-index.<hash>.json   列表页精简清单，每项带 shard 字段指向详情分片
+//   skills/<id>.<hash>.json    技能详情分片，详情页按需加载
+//   search-index.<hash>.json   预构建的倒排索引
 
+const DATA_BASE = `${import.meta.env.BASE_URL}data/`
+
+let manifestPromise = null
 let skillsCache = null
+let searchIndexCache = null
+const detailCache = new Map()
+
+async function fetchJson(path, options) {
+    const response = await fetch(`${DATA_BASE}${path}`, options)
+    if (!response.ok) {
+        throw new Error(`Failed to load ${path}`)
+    }
+    return response.json()
+}
+
+function loadManifest() {
+    if (!manifestPromise) {
+        // 指针清单总是向服务器重新验证，其余带哈希的文件直接走浏览器缓存
+        manifestPromise = fetchJson('manifest.json', { cache: 'no-cache' })
+            .catch(error => {
+                manifestPromise = null
+                throw error
+            })
+    }
+    return manifestPromise
+}
 
 export async function loadSkills() {
     if (skillsCache) return skillsCache
 
     try {
-        const response = await fetch(`${import.meta.env.BASE_URL}data/skills.json`)
-        if (!response.ok) {
-            throw new Error('Failed to load skills')
-        }
-        const data = await response.json()
-
-        // 去重：按 id 去重，保留第一个出现的
-        const seen = new Set()
-        skillsCache = data.filter(skill => {
-            if (seen.has(skill.id)) {
-                return false
-            }
-            seen.add(skill.id)
-            return true
-        })
-
+        // 清单已在构建时按 id 去重
+        const manifest = await loadManifest()
+        skillsCache = await fetchJson(manifest.files['skills-index'])
         return skillsCache
     } catch (error) {
         console.error('Error loading skills:', error)
@@ -30,6 +46,72 @@ export async function loadSkills() {
     }
 }
 
+export async function loadSkillDetail(id) {
+    if (detailCache.has(id)) return detailCache.get(id)
+
+    try {
+        const entry = getSkillById(await loadSkills(), id)
+        if (!entry) return null
+        const skill = await fetchJson(entry.shard)
+        detailCache.set(id, skill)
+        return skill
+    } catch (error) {
+        console.error('Error loading skill detail:', error)
+        return null
+    }
+}
+
+export async function loadSearchIndex() {
+    if (searchIndexCache) return searchIndexCache
+
+    try {
+        const manifest = await loadManifest()
+        searchIndexCache = await fetchJson(manifest.files['search-index'])
+        return searchIndexCache
+    } catch (error) {
+        console.error('Error loading search index:', error)
+        return null
+    }
+}
+
+// 与 scripts/skills_search.py 的 tokenize 一致：连续的中日韩文字切成相邻二元组（单字保留单字）
+const CJK_CHARS = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af'
+const TOKEN_PATTERN = new RegExp(`[${CJK_CHARS}]+|(?:(?![${CJK_CHARS}])[\\p{L}\\p{N}_])+`, 'gu')
+const CJK_RUN = new RegExp(`^[${CJK_CHARS}]+$`, 'u')
+
+function tokenize(text) {
+    const tokens = []
+    for (const run of text.toLowerCase().match(TOKEN_PATTERN) || []) {
+        if (CJK_RUN.test(run) && run.length > 1) {
+            for (let i = 0; i < run.length - 1; i++) tokens.push(run.slice(i, i + 2))
+        } else {
+            tokens.push(run)
+        }
+    }
+    return tokens
+}
+
+// 在倒排索引中查找：每个查询词需命中某个词表项（子串匹配），多个词之间取交集
+// 索引与查询同一分词，中文查询按二元组逐个匹配
+// 返回匹配的清单下标集合；查询为空时返回 null 表示不过滤
+export function searchSkills(index, query) {
+    const terms = tokenize(query)
+    if (!terms.length) return null
+
+    let result = null
+    for (const term of terms) {
+        const matched = new Set()
+        index.tokens.forEach((token, i) => {
+            if (token.includes(term)) {
+                index.postings[i].forEach(docId => matched.add(docId))
+            }
+        })
+        result = result ? new Set([...result].filter(docId => matched.has(docId))) : matched
+        if (result.size === 0) break
+    }
+    return result
+}
+
 export function getSkillById(skills, id) {
     return skills.find(s => s.id === id)
 }
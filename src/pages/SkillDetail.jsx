@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import { useParams, Link } from 'react-router-dom'
 import ReactMarkdown from 'react-markdown'
 import DownloadButton from '../components/DownloadButton'
-import { loadSkills, getSkillById, fallbackSkills } from '../data/skills'
+import { loadSkillDetail, getSkillById, fallbackSkills } from '../data/skills'
 import './SkillDetail.css'
 
 function SkillDetail() {
@@ -12,11 +12,9 @@ function SkillDetail() {
     const [showOriginalBody, setShowOriginalBody] = useState(false)
 
     useEffect(() => {
-        loadSkills()
+        loadSkillDetail(id)
             .then(data => {
-                const skills = data.length > 0 ? data : fallbackSkills
-                const found = getSkillById(skills, id)
-                setSkill(found)
+                setSkill(data || getSkillById(fallbackSkills, id))
                 setLoading(false)
             })
             .catch(() => {
@@ -1,6 +1,6 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo } from 'react'
 import SkillCard from '../components/SkillCard'
-import { loadSkills, fallbackSkills } from '../data/skills'
+import { loadSkills, loadSearchIndex, searchSkills, fallbackSkills } from '../data/skills'
 import './SkillList.css'
 
 function SkillList() {
@@ -8,6 +8,7 @@ function SkillList() {
     const [loading, setLoading] = useState(true)
     const [searchTerm, setSearchTerm] = useState('')
     const [selectedCategory, setSelectedCategory] = useState('')
+    const [searchIndex, setSearchIndex] = useState(null)
 
     useEffect(() => {
         loadSkills()
@@ -21,13 +22,29 @@ function SkillList() {
             })
     }, [])
 
+    // 用户开始搜索时再加载索引，不占用首屏
+    useEffect(() => {
+        if (searchTerm && !searchIndex) {
+            loadSearchIndex().then(setSearchIndex)
+        }
+    }, [searchTerm, searchIndex])
+
+    // 索引下标对应清单顺序；使用后备数据时索引不适用
+    const matchedIds = useMemo(() => {
+        if (!searchIndex || skills === fallbackSkills) return null
+        return searchSkills(searchIndex, searchTerm)
+    }, [searchIndex, searchTerm, skills])
+
     const categories = [...new Set(skills.map(s => s.category_zh || s.category).filter(Boolean))]
 
-    const filteredSkills = skills.filter(skill => {
-        const matchesSearch =
-            (skill.name_zh || skill.name || '').toLowerCase().includes(searchTerm.toLowerCase()) ||
-            (skill.name || '').toLowerCase().includes(searchTerm.toLowerCase()) ||
-            (skill.description_zh || skill.description || '').toLowerCase().includes(searchTerm.toLowerCase())
+    const term = searchTerm.toLowerCase()
+
+    const filteredSkills = skills.filter((skill, index) => {
+        const matchesSearch = !term || (matchedIds
+            ? matchedIds.has(index)
+            : (skill.name_zh || skill.name || '').toLowerCase().includes(term) ||
+              (skill.name || '').toLowerCase().includes(term) ||
+              (skill.description_zh || skill.description || '').toLowerCase().includes(term))
 
         const matchesCategory = !selectedCategory ||
             (skill.category_zh || skill.category) === selectedCategory
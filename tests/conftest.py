@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# scripts/ 下的脚本互相以顶层模块导入
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
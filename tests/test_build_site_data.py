@@ -0,0 +1,34 @@
+"""列表页倒排索引与 BM25 索引使用同一分词：中文按二元组切分，不再整句成为一个词"""
+
+from build_site_data import build_search_index
+from skills_search import build_index, tokenize
+
+SKILLS = [
+    {"id": "a", "name": "Design Guide", "name_zh": "设计指南", "description": "Web design", "description_zh": "全面的网页设计指南"},
+    {"id": "b", "name": "Data", "name_zh": "数据分析", "description": "Analyze data", "description_zh": "表格数据分析"},
+]
+
+
+def search(index, query):
+    """与前端 searchSkills 相同：每个查询词子串命中某个词表项，多个词取交集"""
+    result = None
+    for term in tokenize(query):
+        matched = {doc_id for token, doc_ids in zip(index["tokens"], index["postings"]) if term in token
+                   for doc_id in doc_ids}
+        result = matched if result is None else result & matched
+    return result
+
+
+def test_cjk_text_is_split_into_bigrams():
+    index = build_search_index(SKILLS)
+    assert "设计指南" not in index["tokens"]
+    assert {"设计", "计指", "指南", "design"} <= set(index["tokens"])
+    assert set(index["tokens"]) <= set(build_index(SKILLS)["tokens"])
+
+
+def test_cjk_queries_match_substrings():
+    index = build_search_index(SKILLS)
+    assert search(index, "设计指南") == {0}
+    assert search(index, "设") == {0}
+    assert search(index, "数据 analyze") == {1}
+    assert search(index, "网页分析") == set()
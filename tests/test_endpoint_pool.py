@@ -0,0 +1,104 @@
+"""用本地桩服务校验端点调度：熔断状态转换、冷却加倍、按健康度排序、对冲请求"""
+
+import time
+
+import pytest
+
+from endpoint_pool import CLOSED, HALF_OPEN, OPEN, EndpointPool
+from translate_pool import run_pool
+from translate_stub_server import post_translate, start_stub_server
+
+
+@pytest.fixture
+def stub():
+    """启动桩服务的工厂，测试结束后全部关闭"""
+    servers = []
+
+    def start(latency: float = 0.01, error_rate: float = 0.0):
+        server, endpoint = start_stub_server(latency=latency, error_rate=error_rate)
+        servers.append(server)
+        return server, endpoint
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def translate(text: str):
+    return lambda endpoint: post_translate(endpoint, text, timeout=5)
+
+
+def test_breaker_opens_half_opens_and_closes(stub):
+    server, endpoint = stub(error_rate=1.0)
+    pool = EndpointPool([endpoint], failure_threshold=3, cooldown=0.2)
+    health = pool.health[endpoint]
+
+    for _ in range(3):
+        assert health.state == CLOSED
+        assert pool.call(translate("hello")) is None
+    assert health.state == OPEN
+    assert pool.ranked() == []
+    assert pool.call(translate("hello")) is None
+    assert server.config["requests"] == 3
+
+    time.sleep(0.25)
+    assert health.state == HALF_OPEN
+    server.config["error_rate"] = 0.0
+    assert pool.call(translate("hello")) == "译:hello"
+    assert health.state == CLOSED
+    assert health.consecutive_failures == 0
+
+
+def test_failed_probe_doubles_cooldown(stub):
+    _, endpoint = stub(error_rate=1.0)
+    pool = EndpointPool([endpoint], failure_threshold=2, cooldown=0.1, max_cooldown=0.3)
+    health = pool.health[endpoint]
+
+    for _ in range(2):
+        pool.call(translate("hello"))
+    assert health.state == OPEN and health.cooldown == 0.1
+
+    for expected in (0.2, 0.3, 0.3):
+        time.sleep(health.cooldown + 0.05)
+        assert health.state == HALF_OPEN
+        pool.call(translate("hello"))
+        assert health.state == OPEN
+        assert health.cooldown == pytest.approx(expected)
+
+
+def test_ranking_prefers_fast_healthy_endpoints(stub):
+    _, slow = stub(latency=0.2)
+    _, failing = stub(error_rate=1.0)
+    _, fast = stub(latency=0.01)
+    pool = EndpointPool([slow, failing, fast], failure_threshold=5)
+
+    for endpoint in (slow, failing, fast):
+        pool._attempt(translate("rank"), endpoint)
+
+    assert pool.ranked() == [fast, slow, failing]
+    assert pool.call(translate("rank")) == "译:rank"
+    assert pool.health[fast].successes == 2
+
+
+def test_hedge_wins_against_slow_primary(stub):
+    _, slow = stub(latency=1.0)
+    _, fast = stub(latency=0.01)
+    pool = EndpointPool([slow, fast], hedge_after=0.1)
+
+    start = time.monotonic()
+    assert pool.call(translate("hedge")) == "译:hedge"
+
+    assert time.monotonic() - start < 0.45
+    assert pool.hedges == 1
+
+
+def test_queued_primaries_do_not_trigger_hedges(stub):
+    _, first = stub(latency=0.02)
+    _, second = stub(latency=0.02)
+    # 调用方比线程池多得多：排队等线程的时间不算进 hedge_after
+    pool = EndpointPool([first, second], hedge_after=0.2, workers=1)
+
+    results = run_pool([f"text {i}" for i in range(16)], lambda text: pool.call(translate(text)), 16)
+
+    assert results == [f"译:text {i}" for i in range(16)]
+    assert pool.hedges == 0
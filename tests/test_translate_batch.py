@@ -0,0 +1,85 @@
+"""用 FakeTranslator 校验批量翻译：请求不超过字符上限，译文与片段一一对应"""
+
+import random
+
+import pytest
+
+from translate_batch import MAX_CHARS, REQUEST_CHARS, FakeTranslator, join_segments, pack_segments, translate_batch
+import translate_providers
+
+
+def make_segments(count: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    words = ["skill", "design", "react", "token", "layout", "agent", "review", "deploy"]
+    return [f"{i} " + " ".join(rng.choices(words, k=rng.randint(1, 12))) for i in range(count)]
+
+
+def translate_fn(fake: FakeTranslator):
+    """与 Provider.translate 一致：失败返回 None"""
+    def translate(text):
+        try:
+            return fake.translate(text)
+        except Exception:
+            return None
+    return translate
+
+
+@pytest.mark.parametrize("max_chars", [120, 500, 4500])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_batches_respect_budget_and_order(max_chars, workers):
+    segments = make_segments(200)
+    fake = FakeTranslator(max_chars=max_chars)
+
+    results = translate_batch(segments, translate_fn(fake), max_chars=max_chars, workers=workers)
+
+    assert results == [f"〔{s}〕" for s in segments]
+    assert all(len(request) <= max_chars for request in fake.requests)
+    # 每组一次请求，没有因分隔符问题触发重试
+    assert len(fake.requests) == len(pack_segments(segments, max_chars))
+
+
+def test_groups_cover_segments_in_order():
+    segments = make_segments(300, seed=8)
+    groups = pack_segments(segments, 400)
+    assert [i for group in groups for i in group] == list(range(len(segments)))
+
+
+def test_failed_segment_keeps_source_others_translated():
+    segments = make_segments(50)
+    segments[17] = "17 broken segment"
+    fake = FakeTranslator(max_chars=600, fail_on="broken")
+
+    results = translate_batch(segments, translate_fn(fake), max_chars=600)
+
+    assert results[17] == segments[17]
+    assert results[:17] + results[18:] == [f"〔{s}〕" for s in segments[:17] + segments[18:]]
+    assert all(len(request) <= 600 for request in fake.requests)
+
+
+def google_provider(monkeypatch, fake: FakeTranslator):
+    """各线程的 GoogleTranslator 都换成同一个 FakeTranslator，不限速"""
+    monkeypatch.setattr(translate_providers, "GoogleTranslator", lambda **_: fake)
+    provider = translate_providers.GoogleProvider()
+    provider.limiter = None
+    return provider
+
+
+def test_google_batches_are_never_truncated(monkeypatch):
+    segments = make_segments(200)
+    # 假接口本身接受更长的文本，只有 GoogleProvider 的请求上限生效
+    fake = FakeTranslator(max_chars=5000)
+
+    results = google_provider(monkeypatch, fake).translate_many(segments)
+
+    assert MAX_CHARS <= REQUEST_CHARS
+    assert results == [f"〔{s}〕" for s in segments]
+    assert all(len(request) <= REQUEST_CHARS for request in fake.requests)
+    assert len(fake.requests) == len(pack_segments(segments))
+
+
+def test_google_rejects_oversized_packed_request(monkeypatch):
+    fake = FakeTranslator(max_chars=10000)
+    payload = join_segments(["word " * 500, "word " * 500])
+
+    assert google_provider(monkeypatch, fake).request(payload, "google") is None
+    assert fake.requests == []
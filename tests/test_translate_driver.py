@@ -0,0 +1,51 @@
+"""translate_driver 的输出先写临时文件再替换，写到一半出错时上次的输出保持完整"""
+
+import json
+
+import pytest
+
+from translate_driver import main
+from translation_journal import TranslationJournal
+
+SKILLS = [
+    {"id": f"skill-{i}", "name": f"Skill {i}", "description": "Create a new skill", "category": "development",
+     "body": "# Title\n\nFirst paragraph."}
+    for i in range(3)
+]
+
+
+def run(tmp_path, *extra):
+    (tmp_path / "skills_raw.json").write_text(json.dumps(SKILLS), encoding="utf-8")
+    main(["--provider", "dict", "--input", str(tmp_path / "skills_raw.json"), "--output", str(tmp_path / "skills.json"),
+          "--journal", str(tmp_path / "journal.jsonl"), "--report", str(tmp_path / "report.json"), "--no-dedup", *extra])
+
+
+def test_output_matches_json_dump(tmp_path):
+    run(tmp_path)
+
+    text = (tmp_path / "skills.json").read_text(encoding="utf-8")
+    output = json.loads(text)
+    assert text == json.dumps(output, ensure_ascii=False, indent=2)
+    assert [skill["id"] for skill in output] == [skill["id"] for skill in SKILLS]
+    assert all("name_zh" in skill for skill in output)
+    assert not (tmp_path / "skills.json.tmp").exists()
+
+
+def test_failed_write_keeps_previous_output(tmp_path, monkeypatch):
+    run(tmp_path)
+    previous = (tmp_path / "skills.json").read_bytes()
+
+    # 第二个技能无法序列化：写到一半出错
+    merge_output = TranslationJournal.merge_output
+
+    def broken_merge(self, *args):
+        output = list(merge_output(self, *args))
+        output[1] = {"id": "skill-1", "body": object()}
+        return output
+
+    monkeypatch.setattr(TranslationJournal, "merge_output", broken_merge)
+    with pytest.raises(TypeError):
+        run(tmp_path, "--restart")
+
+    assert (tmp_path / "skills.json").read_bytes() == previous
+    assert not (tmp_path / "skills.json.tmp").exists()
@@ -0,0 +1,29 @@
+"""build_chain 只在链中有可缓存的提供方时才使用（并创建）共享缓存"""
+
+import pytest
+
+from translate_providers import build_chain
+from translation_store import TranslationCache
+
+
+@pytest.mark.parametrize("spec", ["dict", "stub,dict"])
+def test_uncacheable_chain_does_not_create_cache(tmp_path, spec):
+    path = tmp_path / "shared.jsonl"
+    chain = build_chain(spec, TranslationCache(path))
+    try:
+        assert chain.cache is None
+        assert chain.translate("Create a new skill")
+        chain.flush()
+    finally:
+        for provider in chain.providers:
+            if hasattr(provider, "server"):
+                provider.server.shutdown()
+    assert not path.exists()
+
+
+def test_cacheable_chain_imports_legacy_caches(tmp_path):
+    pytest.importorskip("requests")
+    path = tmp_path / "shared.jsonl"
+    chain = build_chain("deeplx,dict", TranslationCache(path))
+    assert chain.cache is not None
+    assert path.exists()
@@ -0,0 +1,64 @@
+"""翻译失败的片段不能被进度日志记成已完成"""
+
+import pytest
+
+from translate_dedup import PrefetchedTranslator
+from translate_driver import translate_skill
+from translate_providers import Provider, ProviderChain
+from translation_journal import TranslationJournal
+
+SKILL = {
+    "id": "demo",
+    "name": "Demo",
+    "description": "A demo skill",
+    "category": "development",
+    "body": "# Title\n\nFirst paragraph.\n\n- list item",
+}
+
+
+class FlakyProvider(Provider):
+    """down 为 True 时每个请求都失败，否则给文本加前缀"""
+
+    name = "flaky"
+    rate_limit = 0
+    cacheable = False
+
+    def __init__(self):
+        super().__init__()
+        self.down = True
+
+    def request(self, text: str, endpoint: str):
+        return None if self.down else f"zh:{text}"
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_failed_fields_stay_pending_and_are_retried(tmp_path, prefetch):
+    provider = FlakyProvider()
+    chain = ProviderChain([provider])
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+
+    def run():
+        translator = chain
+        if prefetch:
+            translator = PrefetchedTranslator(chain)
+            translator.prefetch([SKILL])
+        translate_skill(SKILL, translator, journal)
+
+    run()
+    assert not journal.is_complete(SKILL)
+    assert journal.pending([SKILL]) == [0]
+    assert journal.get(SKILL, "name_zh") is None
+    assert journal.get(SKILL, "body_zh") is None
+
+    provider.down = False
+    run()
+    assert journal.is_complete(SKILL)
+    assert journal.get(SKILL, "name_zh") == "zh:Demo"
+    assert "zh:First paragraph." in journal.get(SKILL, "body_zh")
+
+
+def test_chain_reports_failed_texts():
+    chain = ProviderChain([FlakyProvider()])
+    failed = set()
+    assert chain.translate_many(["a", "b"], failed) == ["a", "b"]
+    assert failed == {"a", "b"}
@@ -0,0 +1,122 @@
+"""TranslationStore 的持久化：刷盘后重新加载、残缺末行、压缩、旧版 JSON 缓存导入"""
+
+import json
+import os
+
+from translation_store import TranslationStore
+
+
+def open_store(path, **options):
+    # 测试里只在显式 flush() 时写盘
+    options.setdefault("flush_every", 1000)
+    options.setdefault("flush_interval", 3600)
+    return TranslationStore(path, **options)
+
+
+def log_lines(path) -> list:
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_reload_after_flush(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    store = open_store(path)
+    store["hello"] = "你好"
+    store["world"] = "世界"
+    assert not path.exists()
+
+    store.flush()
+
+    reloaded = open_store(path)
+    assert dict(reloaded.entries) == {"hello": "你好", "world": "世界"}
+    assert len(log_lines(path)) == 2
+
+
+def test_unchanged_value_is_not_appended(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    store = open_store(path)
+    store["hello"] = "你好"
+    store.flush()
+    store["hello"] = "你好"
+    store["hello"] = "您好"
+    store.flush()
+
+    assert len(log_lines(path)) == 2
+    assert open_store(path)["hello"] == "您好"
+
+
+def test_torn_trailing_line_is_dropped_and_truncated(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    store = open_store(path)
+    store["hello"] = "你好"
+    store.flush()
+    complete = path.read_bytes()
+    # 崩溃时写了一半的记录
+    with open(path, "ab") as f:
+        f.write('{"k": "world", "v": "世'.encode("utf-8"))
+
+    reloaded = open_store(path)
+    assert dict(reloaded.entries) == {"hello": "你好"}
+    assert path.read_bytes() == complete
+
+    # 截断后的追加不会与残缺记录拼在同一行
+    reloaded["world"] = "世界"
+    reloaded.flush()
+    assert dict(open_store(path).entries) == {"hello": "你好", "world": "世界"}
+
+
+def test_complete_json_without_newline_is_dropped(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    path.write_text('{"k": "a", "v": "1"}\n{"k": "b", "v": "2"}', encoding="utf-8")
+
+    store = open_store(path)
+
+    assert dict(store.entries) == {"a": "1"}
+    assert path.read_text(encoding="utf-8") == '{"k": "a", "v": "1"}\n'
+
+
+def test_compaction_rewrites_log_through_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "cache.jsonl"
+    store = open_store(path, compact_ratio=2.0)
+    replaced = []
+    real_replace = os.replace
+
+    def record_replace(src, dst):
+        replaced.append((str(src), str(dst)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr("translation_store.os.replace", record_replace)
+
+    for i in range(3):
+        store["hello"] = f"你好 {i}"
+        store.flush()
+
+    # 第 3 条记录超过 2 倍有效条目数，触发压缩
+    assert replaced == [(str(tmp_path / "cache.jsonl.tmp"), str(path))]
+    assert not (tmp_path / "cache.jsonl.tmp").exists()
+    assert log_lines(path) == [json.dumps({"k": "hello", "v": "你好 2"}, ensure_ascii=False)]
+    assert store.log_records == 1
+    assert open_store(path)["hello"] == "你好 2"
+
+
+def test_legacy_json_cache_is_imported_once(tmp_path):
+    path = tmp_path / "cache.jsonl"
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text(json.dumps({"hello": "你好", "world": "世界"}, ensure_ascii=False), encoding="utf-8")
+
+    store = open_store(path, legacy_file=legacy)
+    assert dict(store.entries) == {"hello": "你好", "world": "世界"}
+    assert len(log_lines(path)) == 2
+
+    # 日志已存在时不再读取旧缓存
+    legacy.write_text(json.dumps({"other": "其他"}), encoding="utf-8")
+    assert dict(open_store(path, legacy_file=legacy).entries) == {"hello": "你好", "world": "世界"}
+
+
+def test_broken_legacy_cache_is_ignored(tmp_path):
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text("{not json", encoding="utf-8")
+
+    store = open_store(tmp_path / "cache.jsonl", legacy_file=legacy)
+
+    assert len(store) == 0
+    assert not (tmp_path / "cache.jsonl").exists()